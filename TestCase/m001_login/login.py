@@ -8,7 +8,10 @@ from library.core.TestCase import TestCase
 from library.core.common.simcardtype import CardType
 from library.core.utils.applicationcache import current_mobile, current_driver, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, AgreementPage, GuidePage, MePage, MeSetMultiLanguagePage, MessagePage, OneKeyLoginPage,
+    PermissionListPage, SettingPage, SmsLoginPage,
+)
 from pages.login import Agreement
 
 REQUIRED_MOBILES = {
@@ -10,7 +10,12 @@ from library.core.TestCase import TestCase
 from library.core.common.simcardtype import CardType
 from library.core.utils.applicationcache import current_mobile, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, ChatPhotoPage, ChatPicEditPage, ChatPicPage, ChatPicPreviewPage, ChatWindowPage, ContactsPage,
+    CreateGroupNamePage, GroupChatPage, GroupChatSetFindChatContentPage, GroupChatSetPage, GroupListPage, GuidePage,
+    MeCollectionPage, MePage, MessagePage, OneKeyLoginPage, PermissionListPage, SelectContactsPage,
+    SelectLocalContactsPage, SelectOneGroupPage,
+)
 from pages.components import BaseChatPage
 from pages.groupset.GroupChatSetPicVideo import GroupChatSetPicVideoPage
 from selenium.common.exceptions import TimeoutException
@@ -6,7 +6,11 @@ from selenium.common.exceptions import TimeoutException
 from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile, current_driver, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatWindowPage, ContactDetailsPage, ContactListSearchPage, ContactsPage, GlobalSearchContactPage,
+    GlobalSearchGroupPage, GlobalSearchMessagePage, GroupListPage, GroupListSearchPage, MessagePage, MessageSearchPage,
+    MyQRCodePage, Scan1Page, ScanPage, SearchPage,
+)
 import preconditions
 
 REQUIRED_MOBILES = {
@@ -2,7 +2,10 @@ from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile
 from preconditions.BasePreconditions import LoginPreconditions
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatLocationPage, ChatMorePage, ChatSelectFilePage, ChatSelectLocalFilePage, ContactDetailsPage, ContactsPage,
+    MeCollectionPage, MePage, MessagePage, SingleChatPage,
+)
 
 
 class Preconditions(LoginPreconditions):
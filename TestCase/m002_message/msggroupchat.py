@@ -8,7 +8,13 @@ from library.core.TestCase import TestCase
 from library.core.common.simcardtype import CardType
 from library.core.utils.applicationcache import current_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatAudioPage, ChatGIFPage, ChatLocationPage, ChatMorePage, ChatPhotoPage, ChatPicPage, ChatPicPreviewPage,
+    ChatProfilePage, ChatSelectFilePage, ChatSelectLocalFilePage, ContactDetailsPage, ContactsPage, CreateContactPage,
+    CreateGroupNamePage, GroupChatPage, GroupChatSetFindChatContentPage, GroupChatSetManagerPage,
+    GroupChatSetModifyMyCardPage, GroupChatSetPage, GroupChatSetSeeMembersPage, GroupChatSetSeeQRCodePage,
+    GroupNamePage, MessagePage, SelectContactsPage, SelectLocalContactsPage, SelectOneGroupPage,
+)
 
 
 class Preconditions(LoginPreconditions):
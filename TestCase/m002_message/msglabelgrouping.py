@@ -5,7 +5,12 @@ from library.core.common.simcardtype import CardType
 from library.core.utils.applicationcache import current_mobile
 from preconditions.BasePreconditions import LoginPreconditions
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatGIFPage, ChatLocationPage, ChatMorePage, ChatPhotoPage, ChatPicEditPage, ChatPicPage, ChatPicPreviewPage,
+    ChatSelectFilePage, ChatSelectLocalFilePage, ContactsPage, LabelGroupingChatPage, LabelGroupingPage,
+    LableGroupDetailPage, MeCollectionPage, MePage, MessagePage, SelectContactsPage, SelectHeContactsDetailPage,
+    SelectHeContactsPage, SelectLocalContactsPage, SelectOneGroupPage,
+)
 import re
 import random
 
@@ -4,7 +4,11 @@ from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile
 from preconditions.BasePreconditions import LoginPreconditions
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatFilePage, ChatMorePage, ChatPicPage, ChatSelectFilePage, ChatSelectLocalFilePage, ContactDetailsPage,
+    CreateGroupNamePage, FindChatRecordPage, GroupChatPage, GroupChatSetPage, MessagePage, PicVideoPage,
+    SelectContactsPage, SelectLocalContactsPage, SingleChatPage, SingleChatSetPage,
+)
 import uuid
 
 
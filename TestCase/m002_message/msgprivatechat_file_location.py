@@ -4,7 +4,11 @@ from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile
 from preconditions.BasePreconditions import LoginPreconditions
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatFilePage, ChatLocationPage, ChatMorePage, ChatSelectFilePage, ChatSelectLocalFilePage, ContactDetailsPage,
+    ContactsPage, CreateContactPage, FindChatRecordPage, MessagePage, SelectContactsPage, SelectHeContactsDetailPage,
+    SelectHeContactsPage, SelectLocalContactsPage, SelectOneGroupPage, SingleChatPage, SingleChatSetPage,
+)
 
 
 class Preconditions(LoginPreconditions):
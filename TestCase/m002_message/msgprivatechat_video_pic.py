@@ -5,7 +5,11 @@ from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile
 from preconditions.BasePreconditions import LoginPreconditions
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatGIFPage, ChatPhotoPage, ChatPicEditPage, ChatPicPage, ChatPicPreviewPage, ContactDetailsPage, ContactsPage,
+    CreateContactPage, FindChatRecordPage, MeCollectionPage, MePage, MessagePage, PicVideoPage, SelectContactsPage,
+    SelectHeContactsDetailPage, SelectHeContactsPage, SelectLocalContactsPage, SingleChatPage, SingleChatSetPage,
+)
 
 
 class Preconditions(LoginPreconditions):
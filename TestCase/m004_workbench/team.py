@@ -3,7 +3,7 @@ from preconditions.BasePreconditions import WorkbenchPreconditions
 from library.core.TestCase import TestCase
 from library.core.utils.testcasefilter import tags
 from library.core.utils.applicationcache import current_mobile
-from pages import *
+from pages import CreateTeamPage, MessagePage, OneKeyLoginPage, WorkbenchPage
 import time
 
 from pages.workbench.create_team.CreateTeam import CreateTeamPage
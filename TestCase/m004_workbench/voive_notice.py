@@ -10,7 +10,7 @@ from library.core.TestCase import TestCase
 from library.core.common.simcardtype import CardType
 from library.core.utils.applicationcache import current_mobile, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import AgreementDetailPage, GuidePage, MessagePage, OneKeyLoginPage, PermissionListPage, WorkbenchPage
 from pages.workbench.Workbench import WorkbenchPage
 from pages.workbench.voice_notice.VoiceNotice import VoiceNoticePage
 
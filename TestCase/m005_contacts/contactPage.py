@@ -8,7 +8,11 @@ from selenium.common.exceptions import TimeoutException
 from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile, current_driver, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, ChatWindowPage, ContactDetailsPage, ContactListSearchPage, ContactsPage, CreateContactPage,
+    GuidePage, MePage, MessagePage, OneKeyLoginPage, PermissionListPage, SelectContactsPage, SelectOneGroupPage,
+    SettingPage,
+)
 from pages.contacts.HeContacts import HeContactsPage
 from pages.contacts.official_account import OfficialAccountPage
 from pages.contacts.EditContactPage import EditContactPage
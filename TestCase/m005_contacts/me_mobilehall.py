@@ -4,7 +4,10 @@ import time
 from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile, current_driver, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, GuidePage, MePage, MessagePage, OneKeyLoginPage, PermissionListPage,
+    SelectHeContactsDetailPage,
+)
 from pages.me.MeMobileAccunt import  MeMobileAccuntPage
 from pages.me.MeMobileCharge import  MeMobileChargePage
 from pages.me.MeMobileHall import  MeMobileHallPage
@@ -5,7 +5,9 @@ from selenium.common.exceptions import TimeoutException
 from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile, current_driver, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, ContactsPage, GuidePage, MePage, MessagePage, OneKeyLoginPage, PermissionListPage, SettingPage,
+)
 from pages.contacts import OfficialAccountPage, SearchOfficialAccountPage
 
 REQUIRED_MOBILES = {
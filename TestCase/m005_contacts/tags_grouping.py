@@ -6,7 +6,11 @@ from selenium.common.exceptions import TimeoutException
 from library.core.TestCase import TestCase
 from library.core.utils.applicationcache import current_mobile, current_driver, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, ChatWindowPage, ContactDetailsPage, ContactListSearchPage, ContactsPage, CreateContactPage,
+    GuidePage, LabelGroupingPage, LableGroupDetailPage, MePage, MessagePage, OneKeyLoginPage, PermissionListPage,
+    SettingPage,
+)
 from pages.call.multipartycall import MultipartyCallPage
 from pages.call.mutivideo import MutiVideoPage
 from pages.components import ContactsSelector
@@ -5,7 +5,10 @@ from library.core.TestCase import TestCase
 from library.core.utils import email_helper
 from library.core.utils.applicationcache import current_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    ChatWindowPage, EmailAssistantPage, EmailListPage, MePage, MessageNoticeSettingPage, MessagePage, MyQRCodePage,
+    SettingPage, SmsSettingPage,
+)
 from pages.components import ContactsSelector
 from pages.components.PickGroup import PickGroupPage
 from pages.components.SearchGroup import SearchGroupPage
@@ -79,18 +82,8 @@ class MeTest(TestCase):
         chat = ChatWindowPage()
         chat.wait_for_page_load()
 
-        # 获取截图
-        screen_shot = current_mobile().get_screenshot_as_png()
-        import io
-        from PIL import Image
-        from pyzbar import pyzbar
-
         # 屏幕是否包含刚刚转发的二维码（解析为文本链接）
-        qrs = pyzbar.decode(Image.open(io.BytesIO(screen_shot)))
-        self.assertIsNotNone(qrs)
-        links = []
-        for qr in qrs:
-            links.append(qr.data.decode('utf-8'))
+        links = [qr.data for qr in current_mobile().scan_codes()]
         self.assertIn(my_link, links)
 
     def setUp_test_me_0002(self):
@@ -145,18 +138,8 @@ class MeTest(TestCase):
         if chat.is_tips_display():
             chat.directly_close_tips_alert()
 
-        # 获取截图
-        screen_shot = current_mobile().get_screenshot_as_png()
-        import io
-        from PIL import Image
-        from pyzbar import pyzbar
-
         # 屏幕是否包含刚刚转发的二维码（解析为文本链接）
-        qrs = pyzbar.decode(Image.open(io.BytesIO(screen_shot)))
-        self.assertIsNotNone(qrs)
-        links = []
-        for qr in qrs:
-            links.append(qr.data.decode('utf-8'))
+        links = [qr.data for qr in current_mobile().scan_codes()]
         self.assertIn(my_link, links)
 
     def setUp_test_me_0005(self):
@@ -213,18 +196,8 @@ class MeTest(TestCase):
         chat = ChatWindowPage()
         chat.wait_for_page_load()
 
-        # 获取截图
-        screen_shot = current_mobile().get_screenshot_as_png()
-        import io
-        from PIL import Image
-        from pyzbar import pyzbar
-
         # 屏幕是否包含刚刚转发的二维码（解析为文本链接）
-        qrs = pyzbar.decode(Image.open(io.BytesIO(screen_shot)))
-        self.assertIsNotNone(qrs)
-        links = []
-        for qr in qrs:
-            links.append(qr.data.decode('utf-8'))
+        links = [qr.data for qr in current_mobile().scan_codes()]
         self.assertIn(my_link, links)
 
     def setUp_test_me_0008(self):
@@ -281,18 +254,8 @@ class MeTest(TestCase):
         if chat.is_tips_display():
             chat.directly_close_tips_alert()
 
-        # 获取截图
-        screen_shot = current_mobile().get_screenshot_as_png()
-        import io
-        from PIL import Image
-        from pyzbar import pyzbar
-
         # 屏幕是否包含刚刚转发的二维码（解析为文本链接）
-        qrs = pyzbar.decode(Image.open(io.BytesIO(screen_shot)))
-        self.assertIsNotNone(qrs)
-        links = []
-        for qr in qrs:
-            links.append(qr.data.decode('utf-8'))
+        links = [qr.data for qr in current_mobile().scan_codes()]
         self.assertIn(my_link, links)
 
     def setUp_test_me_0009(self):
@@ -349,18 +312,8 @@ class MeTest(TestCase):
         if chat.is_tips_display():
             chat.directly_close_tips_alert()
 
-        # 获取截图
-        screen_shot = current_mobile().get_screenshot_as_png()
-        import io
-        from PIL import Image
-        from pyzbar import pyzbar
-
         # 屏幕是否包含刚刚转发的二维码（解析为文本链接）
-        qrs = pyzbar.decode(Image.open(io.BytesIO(screen_shot)))
-        self.assertIsNotNone(qrs)
-        links = []
-        for qr in qrs:
-            links.append(qr.data.decode('utf-8'))
+        links = [qr.data for qr in current_mobile().scan_codes()]
         self.assertIn(my_link, links)
 
     def setUp_test_me_0010(self):
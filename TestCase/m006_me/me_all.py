@@ -10,7 +10,10 @@ from library.core.TestCase import TestCase
 from library.core.common.simcardtype import CardType
 from library.core.utils.applicationcache import current_mobile, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, GuidePage, MePage, MessagePage, MyQRCodePage, OneKeyLoginPage, PermissionListPage,
+    SelectContactsPage, SelectHeContactsDetailPage, SelectHeContactsPage, SelectLocalContactsPage, SelectOneGroupPage,
+)
 from pages.me.MeCardName import MeCardNamePage
 from pages.me.MeEditUserProfile import MeEditUserProfilePage
 from pages.me.MeViewUserProfile import MeViewUserProfilePage
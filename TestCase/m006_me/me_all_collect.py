@@ -9,7 +9,11 @@ from library.core.TestCase import TestCase
 from library.core.common.simcardtype import CardType
 from library.core.utils.applicationcache import current_mobile, switch_to_mobile
 from library.core.utils.testcasefilter import tags
-from pages import *
+from pages import (
+    AgreementDetailPage, ChatLocationPage, ChatMorePage, ChatPicPage, ChatSelectFilePage, ChatSelectLocalFilePage,
+    CreateGroupNamePage, GroupChatPage, GuidePage, MeCollectionPage, MePage, MessagePage, OneKeyLoginPage,
+    PermissionListPage, SelectContactsPage, SelectLocalContactsPage, SelectOneGroupPage, SettingPage,
+)
 from pages.components import BaseChatPage
 from pages.me.MeAboutChinasofti import MeAboutChinasoftiPage
 from pages.me.MeHelpAndFeedback import MeHelpAndFeedbackPage
@@ -39,6 +39,9 @@ def get_preset_group_chats():
 
 
 def push_resource_dir_to_mobile_sdcard(dist_mobile):
+    """
+    推送预置文件到手机 /sdcard（只推送手机上不存在或者内容不一致的文件）
+    """
     from settings import RESOURCE_FILE_PATH
     push_to = '/sdcard'
     dist_mobile.push_folder(RESOURCE_FILE_PATH, push_to)
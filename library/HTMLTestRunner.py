@@ -57,6 +57,7 @@ __version__ = "0.8.2.2"
 
 import datetime
 import sys
+import time
 import unittest
 from xml.sax import saxutils
 
@@ -397,16 +398,27 @@ class _TestResult(TestResult):
         self.buffer = buffer
         from io import StringIO
         self.log_output = StringIO()
+        # 每个用例的耗时：[(用例 id, 耗时（秒）, 手机别名)]
+        self.durations = []
+        self._test_started_at = None
 
     def _setupStdout(self):
         if getattr(self, 'buffer', None):
             from library.core.utils.common import FlushingStringIO
-            self._stderr_buffer = FlushingStringIO(self._dump_test_stderr)
-            self._stdout_buffer = FlushingStringIO(self._dump_test_stdout)
+            from library.core.utils import ConfigManager
+            self._stdout_buffer = FlushingStringIO(self._dump_test_stdout, ConfigManager.get_log_buffer_size())
+            # stderr 按行输出，输出之前先输出 stdout 缓冲的内容，保持日志的先后顺序
+            self._stderr_buffer = FlushingStringIO(self._dump_test_stderr, flush_before=self._stdout_buffer.flush)
             sys.stdout = self._stdout_buffer
             sys.stderr = self._stderr_buffer
 
+    def _flushStdout(self):
+        if getattr(self, 'buffer', None) and self._stdout_buffer is not None:
+            self._stdout_buffer.flush()
+            self._stderr_buffer.flush()
+
     def _restoreStdout(self):
+        self._flushStdout()
         super(_TestResult, self)._restoreStdout()
         self.log_output.seek(0)
         self.log_output.truncate()
@@ -415,9 +427,13 @@ class _TestResult(TestResult):
         super(_TestResult, self).startTest(test)
         from library.core.TestLogger import TestLogger
         TestLogger.start_test(test)
+        self._test_started_at = time.time()
 
     def stopTest(self, test):
         from library.core.TestLogger import TestLogger
+        if self._test_started_at is not None:
+            self.durations.append((test.id(), time.time() - self._test_started_at, TestLogger.current_device()))
+            self._test_started_at = None
         TestLogger.stop_test(test)
         super(_TestResult, self).stopTest(test=test)
 
@@ -426,6 +442,7 @@ class _TestResult(TestResult):
         from library.core.TestLogger import TestLogger
         from library.core.utils import common
         TestLogger.test_success(test)
+        self._flushStdout()
         self.success_count += 1
         output = self.log_output.getvalue()
         self.result.append((0, test, output, ''))
@@ -440,6 +457,7 @@ class _TestResult(TestResult):
         from library.core.TestLogger import TestLogger
         from library.core.utils import common
         TestLogger.test_error(test, err)
+        self._flushStdout()
         self.error_count += 1
         super(_TestResult, self).addError(test, err)
         _, _exc_str = self.errors[-1]
@@ -456,6 +474,7 @@ class _TestResult(TestResult):
         from library.core.TestLogger import TestLogger
         from library.core.utils import common
         TestLogger.test_fail(test, err)
+        self._flushStdout()
         self.failure_count += 1
         super(_TestResult, self).addFailure(test, err)
         _, _exc_str = self.failures[-1]
@@ -510,6 +529,8 @@ class HTMLTestRunner(Template_mixin):
         "Run the given test case or test suite."
         result = _TestResult(self.verbosity)
         test(result)
+        from library.core.utils import common
+        common.flush_log_file()
         self.stopTime = datetime.datetime.now()
         self.generateReport(test, result)
         print('\nTime Elapsed: %s' % (self.stopTime - self.startTime), file=sys.stderr)
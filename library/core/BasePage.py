@@ -1,9 +1,11 @@
 import os
 import re
 import time
+from collections import OrderedDict
 
 from appium.webdriver.common.mobileby import MobileBy
 from appium.webdriver.common.touch_action import TouchAction
+from lxml import etree
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
@@ -85,14 +87,10 @@ class BasePage(object):
         return self.mobile.is_text_present(text)
 
     def _is_element_present(self, locator):
-        elements = self.get_elements(locator)
-        return len(elements) > 0
+        return self.mobile._is_element_present(locator)
 
     def _is_visible(self, locator):
-        elements = self.get_elements(locator)
-        if len(elements) > 0:
-            return elements[0].is_displayed()
-        return None
+        return self.mobile._is_visible(locator)
 
     def _is_clickable(self, locator):
         mapper = {
@@ -141,12 +139,16 @@ class BasePage(object):
         }
         return self.driver.execute_script('mobile:shell', script)
 
+    def execute_shell_batch(self, commands):
+        """在一次请求中批量执行ADB shell命令，返回每条命令的输出与退出码"""
+        return self.mobile.execute_shell_batch(commands)
+
     def _is_enabled(self, locator):
         element = self.get_element(locator)
         return element.is_enabled()
 
     def get_source(self):
-        return self.driver.page_source
+        return self.mobile.get_source()
 
     def click_element(self, locator, default_timeout=5, auto_accept_permission_alert=True):
         self.mobile.click_element(locator, default_timeout, auto_accept_permission_alert)
@@ -154,6 +156,11 @@ class BasePage(object):
     def is_current_activity_match_this_page(self):
         return self.driver == self.__class__.ACTIVITY
 
+    def is_current_screen(self, threshold=None):
+        """根据一次 page_source 判断当前界面是否为该页面（不等待，见 ScreenClassifier）"""
+        from library.core.screenclassifier import SCREEN_CLASSIFIER
+        return SCREEN_CLASSIFIER.current_page(self.mobile, threshold) is self.__class__
+
     def click_text(self, text, exact_match=False):
         if self._get_platform() == 'ios':
             if exact_match:
@@ -269,6 +276,161 @@ class BasePage(object):
                 y_offset = height
                 self.driver.swipe(x_start, y_start, x_offset, y_offset, duration)
 
+    @staticmethod
+    def _parse_bounds(bounds):
+        """解析 page_source 中的 bounds 属性：'[x1,y1][x2,y2]' -> (x1, y1, x2, y2)"""
+        numbers = re.findall(r'-?\d+', bounds or '')
+        if len(numbers) != 4:
+            return None
+        return tuple(int(n) for n in numbers)
+
+    @staticmethod
+    def _extract_item_fields(node, fields):
+        """从列表项节点中提取字段：属性名，或者相对于列表项的 XPath（结果为节点时取其 text）"""
+        item = {}
+        for name, spec in fields.items():
+            if spec.startswith('.'):
+                values = node.xpath(spec)
+                value = values[0] if values else None
+                if value is not None and not isinstance(value, str):
+                    value = value.get('text')
+            else:
+                value = node.get(spec)
+            item[name] = None if value is None else str(value)
+        return item
+
+    @staticmethod
+    def _read_element_fields(element, fields):
+        """逐个元素读取列表项字段（无法在本地解析 page_source 时使用）"""
+        item = {}
+        for name, spec in fields.items():
+            if spec.startswith('.'):
+                children = element.find_elements(MobileBy.XPATH, spec)
+                value = children[0].text if children else None
+            elif spec == 'text':
+                value = element.text
+            else:
+                value = element.get_attribute(spec)
+            item[name] = None if value is None else str(value)
+        return item
+
+    @TestLogger.log('滑动列表并收集列表项')
+    def scroll_and_collect(self, container, item, fields=None, key=None, until=None, direction='up',
+                           max_swipes=50, duration=800):
+        """
+        在列表中滑动并收集列表项：
+            每一步只获取一次 page_source，在本地解析所有列表项的字段（不再逐个元素读取 text）；
+            按 key 去重；连续两次快照中列表容器完全相同时认为已经到达列表末尾。
+            非 Android 平台或者无法在本地解析的定位器，逐个元素读取字段，滑动后没有新的列表项时认为到达列表末尾。
+        :param container: 列表容器定位器（在容器内滑动），None 表示在整个屏幕滑动
+        :param item: 列表项定位器（ID 或 XPath 在本地解析，其它定位器逐个元素读取）
+        :param fields: {字段名: 列表项的属性名 或 相对于列表项的 XPath（以 . 开头）}，默认 {'text': 'text'}
+        :param key: 去重使用的字段名或者 callable(item)，默认使用全部字段
+        :param until: callable(item)，返回 True 时停止滑动，该列表项为返回结果的最后一项
+        :param direction: 滑动方向（up：向上滑动，查看下面的内容；down：向下滑动，查看上面的内容）
+        :param max_swipes: 最多滑动次数
+        :param duration: 每次滑动的持续时间ms
+        :return: 列表项字典的列表（按出现的顺序）
+        """
+        fields = fields or {'text': 'text'}
+        if key is None:
+            def get_key(i):
+                return tuple(i[name] for name in fields)
+        elif callable(key):
+            get_key = key
+        else:
+            def get_key(i):
+                return i[key]
+
+        snapshot = self.mobile.snapshot
+        collected = OrderedDict()
+        previous = None
+        for swipe in range(max_swipes + 1):
+            snapshot.invalidate()
+            nodes = snapshot.find(item)
+            if nodes is None:
+                values = [self._read_element_fields(el, fields) for el in self.get_elements(item)]
+            else:
+                values = [self._extract_item_fields(node, fields) for node in nodes]
+            found_new = False
+            for value in values:
+                item_key = get_key(value)
+                if item_key in collected:
+                    continue
+                collected[item_key] = value
+                found_new = True
+                if until is not None and until(value):
+                    return list(collected.values())
+
+            if nodes is None:
+                if not found_new or swipe == max_swipes:
+                    break
+                self._swipe_list(container, direction, duration)
+                continue
+
+            # 列表容器与上一次完全相同：已经滑到底（或者无法滑动）
+            if container is not None:
+                containers = snapshot.find(container)
+                area = containers[0] if containers else None
+                current = etree.tostring(area) if area is not None else None
+            else:
+                area = next(iter(snapshot.tree), None)
+                current = snapshot.source
+            if area is None or current == previous or swipe == max_swipes:
+                break
+            previous = current
+
+            bounds = self._parse_bounds(area.get('bounds'))
+            if bounds is None:
+                break
+            left, top, right, bottom = bounds
+            x = (left + right) // 2
+            # 整个屏幕滑动时避开标题栏与底部输入框、标签栏
+            margin = (bottom - top) // (10 if container is not None else 5)
+            if direction.lower() == 'up':
+                self.driver.swipe(x, bottom - margin, x, top + margin, duration)
+            else:
+                self.driver.swipe(x, top + margin, x, bottom - margin, duration)
+        return list(collected.values())
+
+    @TestLogger.log('滑动查找列表项')
+    def scroll_to_item(self, item, until, directions=('up', 'down'), max_swipes=10, container=None):
+        """
+        按 directions 依次滑动列表（见 scroll_and_collect），查找第一个满足 until 的列表项：
+            找到后按该列表项在当前界面中的下标取元素，不再逐个元素读取 text
+        :param item: 列表项定位器
+        :param until: callable(item)，item 为 {'text': 列表项的 text}
+        :return: 列表项元素；没有找到时返回 None
+        """
+        fields = {'text': 'text'}
+        for direction in directions:
+            items = self.scroll_and_collect(container, item, fields, until=until, direction=direction,
+                                            max_swipes=max_swipes)
+            if not items or not until(items[-1]):
+                continue
+            nodes = self.mobile.snapshot.find(item)
+            elements = self.get_elements(item)
+            if nodes is not None and len(nodes) == len(elements):
+                values = [self._extract_item_fields(node, fields) for node in nodes]
+            else:
+                values = [self._read_element_fields(el, fields) for el in elements]
+            if items[-1] in values:
+                return elements[values.index(items[-1])]
+        return None
+
+    def find_file_by_type(self, locator, file_type, times=10):
+        """根据文件类型（文件名后缀）查找文件（先向上滑动查找，再向下滑动查找）"""
+        return self.scroll_to_item(locator, lambda item: (item['text'] or '').endswith(file_type), max_swipes=times)
+
+    def _swipe_list(self, container, direction, duration):
+        """按元素位置滑动列表（container 为 None 时在整个屏幕滑动）"""
+        if container is not None:
+            self.swipe_by_direction(container, direction, duration)
+        elif direction.lower() == 'up':
+            self.swipe_by_percent_on_screen(50, 70, 50, 30, duration)
+        else:
+            self.swipe_by_percent_on_screen(50, 30, 50, 70, duration)
+
     def swipe_by_percent_on_screen(self, start_x, start_y, end_x, end_y, duration):
         width = self.driver.get_window_size()["width"]
         height = self.driver.get_window_size()["height"]
@@ -379,6 +541,10 @@ class BasePage(object):
             kwargs=kwargs
         )
 
+    def wait_for_ui_idle(self, stable_time=500, timeout=5):
+        """等待界面稳定，用于替代固定时长的 time.sleep"""
+        return self.mobile.wait_for_ui_idle(stable_time, timeout)
+
     def wait_for_page_load(self, timeout=8, auto_accept_alerts=True):
         """默认使用activity作为判断页面是否加载的条件，继承类应该重写该方法"""
         self.wait_until(
@@ -486,6 +652,10 @@ class BasePage(object):
     def get_coordinate_color_of_element(self, element, x, y, by_percent=False, mode='RGBA') -> tuple:
         return self.mobile.get_coordinate_color_of_element(element, x, y, by_percent, mode)
 
+    @TestLogger.log('识别二维码/条形码')
+    def scan_codes(self, region=None):
+        return self.mobile.scan_codes(region)
+
     @TestLogger.log("按住并向下滑动")
     def press_and_move_to_down(self, locator):
         """按住并滑动"""
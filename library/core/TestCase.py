@@ -1,5 +1,9 @@
+import time
 import unittest
 
+from library.core.TestLogger import TestLogger
+from library.core.utils.tracing import TRACER
+
 
 class TestCase(unittest.TestCase):
     """Login 模块"""
@@ -20,11 +24,19 @@ class TestCase(unittest.TestCase):
 
     def setUp(self):
         setup = getattr(self, "setUp_{}".format(self._testMethodName), self.default_setUp)
-        setup()
+        start = time.time()
+        try:
+            setup()
+        finally:
+            TRACER.complete(setup.__name__, 'precondition', start, device=TestLogger.current_device())
 
     def tearDown(self):
         tear_down = getattr(self, "tearDown_{}".format(self._testMethodName), self.default_tearDown)
-        tear_down()
+        start = time.time()
+        try:
+            tear_down()
+        finally:
+            TRACER.complete(tear_down.__name__, 'precondition', start, device=TestLogger.current_device())
 
 
 if __name__ == '__main__':
@@ -1,80 +1,179 @@
 import functools
+import inspect
 import os
 import re
 import time
 
+import settings
 from library.core.utils.common import capture_screen_shot
+from library.core.utils.connectioncache import NoConnection
+from library.core.utils.tracing import TRACER
 
 _time = time.time
 _localtime = time.localtime
 _strftime = time.strftime
 
 
+def _format_time(t):
+    """格式化时间戳：2019-01-01T12:00:00.000"""
+    (current_time_int, current_time_fraction) = divmod(t, 1)
+    current_time_struct = _localtime(current_time_int)
+    return _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (int(current_time_fraction * 1000))
+
+
+def _get_signature(func):
+    try:
+        return inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+
+
+class _CallState(object):
+    """当前的调用嵌套层数（放在实例上：每次调用都修改类属性会使类型的属性查找缓存失效）"""
+    __slots__ = ('depth',)
+
+    def __init__(self):
+        self.depth = 0
+
+
+_call_state = _CallState()
+
+
+# 方法调用记录：(结束时间, 级别, 嵌套层数, 方法名, 描述, 签名, args, kwargs, 用例, 手机)
+# 记录时只保存原始参数，只有在需要输出时才格式化
+
+
+def _get_trace_category(func):
+    """trace 区间的类别：预置条件、页面方法、手机方法"""
+    module = getattr(func, '__module__', None) or ''
+    if module.startswith('preconditions') or module.startswith('TestCase'):
+        return 'precondition'
+    if module.startswith('library.core.mobile') or module.startswith('mobileimplements'):
+        return 'mobile'
+    return 'page'
+
+
+def _format_args(signature, args, kwargs):
+    if signature is not None:
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            pass
+        else:
+            bound.apply_defaults()
+            received_args = dict(bound.arguments)
+            received_args.pop('self', None)
+            return '{}'.format(received_args)
+    return '{}'.format(dict(args=args, kwargs=kwargs))
+
+
+def _format_event(event):
+    from library.core.utils import common
+    end_time, level, depth, func_name, description, signature, args, kwargs, test, mobile = event
+    template = '%(indent)s%(time)s - %(mobile)s - %(level)s - %(caseName)s - %(func)s%(args)s ' \
+               + '- %(description)s'
+    return template % dict(indent='    ' * depth,
+                           time=_format_time(end_time),
+                           level=level,
+                           caseName=common.get_test_id(test),
+                           func=func_name,
+                           mobile=mobile.__str__(),
+                           description=description if description else "no description",
+                           args=_format_args(signature, args, kwargs),
+                           )
+
+
 class TestLogger(object):
     current_test = None
     log_level = 'INFO'
-    _do_log = True
+    # 输出调用日志的最大嵌套层数：0 不输出，1 只输出最外层调用，2 及以上同时输出嵌套调用
+    verbosity = getattr(settings, 'LOG_VERBOSITY', 1)
+    # 最近调用记录的环形缓冲区大小，用例失败时输出该用例的记录（未输出的嵌套调用只在开启 trace 时记录）
+    ring_size = getattr(settings, 'LOG_RING_SIZE', 200)
+    _ring = [None] * ring_size
+    _ring_index = 0
+    _applicationcache = None
+    _test_started_at = None
 
     @staticmethod
     def log(info=None):
         def decorator(func):
+            from library.core.utils import common
+            signature = _get_signature(func)
+            func_name = common.get_method_fullname(func)
+            description = func.__doc__ if info is None else info
+            category = _get_trace_category(func)
+
             @functools.wraps(func)
             def wrapper(*args, **kw):
-                # info = description if description else func.__doc__
-                template = '%(time)s - %(mobile)s - %(level)s - %(caseName)s - %(func)s%(args)s ' \
-                           + '- %(description)s'
-                TestLogger.log_level = "INFO"
-                turn_on = False
+                depth = _call_state.depth
+                if depth and depth >= TestLogger.verbosity and not TRACER.enabled:
+                    # 不输出的嵌套调用直接执行：更深的调用同样不输出，不需要维护嵌套层数
+                    return func(*args, **kw)
+                start = _time()
+                _call_state.depth = depth + 1
+                level = 'INFO'
                 try:
-                    if TestLogger._do_log:
-                        turn_on = True
-                        TestLogger._do_log = False
-                    result = func(*args, **kw)
-                    return result
-                except Exception as error:
-                    TestLogger.log_level = "ERROR"
-                    raise error
-
+                    return func(*args, **kw)
+                except Exception:
+                    level = 'ERROR'
+                    raise
                 finally:
-                    if turn_on:
-                        TestLogger._do_log = True
-                        # from library.core.BasePage import BasePage
-                        from library.core.utils import applicationcache
-                        from library.core.utils import common
-                        current_mobile = getattr(applicationcache, 'current_mobile', lambda: None)
-                        mobile = current_mobile()
-                        log_info = func.__doc__ if info is None else info
-
-                        current_time = _time()
-                        (current_time_int, current_time_fraction) = divmod(current_time, 1)
-                        current_time_struct = _localtime(current_time_int)
-
-                        timestamp = _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (
-                            int(current_time_fraction * 1000))
-                        import inspect
-                        received_args = inspect.getcallargs(func, *args, **kw)
-                        if 'self' in received_args:
-                            received_args.pop('self')
-                        print(template % dict(time=timestamp,
-                                              level=TestLogger.log_level,
-                                              # caseName=getattr(TestLogger.current_test, '_testMethodName', None),
-                                              caseName=common.get_test_id(TestLogger.current_test),
-                                              func=common.get_method_fullname(func),
-                                              mobile=mobile.__str__(),
-                                              description=log_info if log_info else "no description",
-                                              # args='[Args: {} {}]'.format(
-                                              #     args[1:] if bool(args[:1]) and isinstance(args[0],
-                                              #                                               BasePage) else args,
-                                              #     kw)
-                                              args='{}'.format(received_args),
-                                              )
-                              )
-                        TestLogger.log_level = "INFO"
+                    _call_state.depth = depth
+                    TestLogger.log_level = level
+                    mobile = TestLogger._current_mobile()
+                    event = (_time(), level, depth, func_name, description, signature, args, kw,
+                             TestLogger.current_test, mobile)
+                    TRACER.complete(func_name, category, start, event[0], TestLogger._get_alias(mobile))
+                    index = TestLogger._ring_index
+                    TestLogger._ring[index] = event
+                    TestLogger._ring_index = (index + 1) % TestLogger.ring_size
+                    if depth < TestLogger.verbosity:
+                        print(_format_event(event))
 
             return wrapper
 
         return decorator
 
+    @staticmethod
+    def set_verbosity(verbosity):
+        TestLogger.verbosity = verbosity
+
+    @staticmethod
+    def _current_mobile():
+        if TestLogger._applicationcache is None:
+            from library.core.utils import applicationcache
+            TestLogger._applicationcache = applicationcache
+        current_mobile = getattr(TestLogger._applicationcache, 'current_mobile', None)
+        return current_mobile() if current_mobile else None
+
+    @staticmethod
+    def _get_alias(mobile):
+        if mobile is None or isinstance(mobile, NoConnection):
+            return None
+        return getattr(mobile, 'alis', None)
+
+    @staticmethod
+    def current_device():
+        """当前手机的别名，没有手机时返回 None"""
+        return TestLogger._get_alias(TestLogger._current_mobile())
+
+    @staticmethod
+    def recent_events(test=None):
+        """环形缓冲区中的调用记录（按时间顺序），可以按用例过滤"""
+        index = TestLogger._ring_index
+        events = TestLogger._ring[index:] + TestLogger._ring[:index]
+        return [e for e in events if e is not None and (test is None or e[8] is test)]
+
+    @staticmethod
+    def dump_recent_events(test, limit=50):
+        """输出用例最近的调用记录"""
+        events = TestLogger.recent_events(test)[-limit:]
+        if events:
+            print('最近的调用记录：')
+            for event in events:
+                print(_format_event(event))
+
     @staticmethod
     def set_current_test(test):
         TestLogger.current_test = test
@@ -87,12 +186,8 @@ class TestLogger(object):
     def start_test(test):
         from library.core.utils import common
         TestLogger.current_test = test
-        current_time = _time()
-        (current_time_int, current_time_fraction) = divmod(current_time, 1)
-        current_time_struct = _localtime(current_time_int)
-
-        timestamp = _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (
-            int(current_time_fraction * 1000))
+        TestLogger._test_started_at = _time()
+        timestamp = _format_time(TestLogger._test_started_at)
         if getattr(TestLogger.current_test, '_testMethodName', None):
             print(' - '.join(
                 [
@@ -106,17 +201,26 @@ class TestLogger(object):
 
     @staticmethod
     def stop_test(test):
+        if TestLogger._test_started_at is not None:
+            from library.core.utils import common
+            TRACER.complete(common.get_test_id(test), 'test', TestLogger._test_started_at,
+                            device=TestLogger.current_device())
+            TestLogger._test_started_at = None
+        from library.core.utils.sleepaccounting import SLEEP_ACCOUNTING
+        if SLEEP_ACCOUNTING.installed and getattr(test, '_testMethodName', None):
+            from library.core.utils import common
+            print(' - '.join(
+                [
+                    common.get_test_id(test),
+                    'time.sleep 耗时：{:.1f}s'.format(SLEEP_ACCOUNTING.seconds_of(test))
+                ]
+            ))
         TestLogger.current_test = None
 
     @staticmethod
     def test_fail(test, err):
         from library.core.utils import common
-        current_time = _time()
-        (current_time_int, current_time_fraction) = divmod(current_time, 1)
-        current_time_struct = _localtime(current_time_int)
-
-        timestamp = _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (
-            int(current_time_fraction * 1000))
+        timestamp = _format_time(_time())
         import sys
         sys.excepthook(*err)
         TestLogger.take_screen_shot()
@@ -130,17 +234,16 @@ class TestLogger(object):
                     '********** TEST FAIL **********'
                 ]
             ))
+            TestLogger.dump_recent_events(test)
+        # 失败现场的日志尽快写入文件
+        sys.stdout.flush()
+        common.flush_log_file(wait=False)
         TestLogger.current_test = None
 
     @staticmethod
     def test_error(test, err):
         from library.core.utils import common
-        current_time = _time()
-        (current_time_int, current_time_fraction) = divmod(current_time, 1)
-        current_time_struct = _localtime(current_time_int)
-
-        timestamp = _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (
-            int(current_time_fraction * 1000))
+        timestamp = _format_time(_time())
         import sys
         sys.excepthook(*err)
         TestLogger.take_screen_shot()
@@ -154,17 +257,16 @@ class TestLogger(object):
                     '********** TEST ERROR **********'
                 ]
             ))
+            TestLogger.dump_recent_events(test)
+        # 失败现场的日志尽快写入文件
+        sys.stdout.flush()
+        common.flush_log_file(wait=False)
         TestLogger.current_test = None
 
     @staticmethod
     def test_success(test):
         from library.core.utils import common
-        current_time = _time()
-        (current_time_int, current_time_fraction) = divmod(current_time, 1)
-        current_time_struct = _localtime(current_time_int)
-
-        timestamp = _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (
-            int(current_time_fraction * 1000))
+        timestamp = _format_time(_time())
         if getattr(test, '_testMethodName', None):
             print(' - '.join(
                 [
@@ -179,12 +281,7 @@ class TestLogger(object):
     @staticmethod
     def test_skip(test, reason):
         from library.core.utils import common
-        current_time = _time()
-        (current_time_int, current_time_fraction) = divmod(current_time, 1)
-        current_time_struct = _localtime(current_time_int)
-
-        timestamp = _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (
-            int(current_time_fraction * 1000))
+        timestamp = _format_time(_time())
         if getattr(test, '_testMethodName', None):
             print(' - '.join(
                 [
@@ -198,12 +295,7 @@ class TestLogger(object):
 
     @staticmethod
     def take_screen_shot():
-        current_time = _time()
-        (current_time_int, current_time_fraction) = divmod(current_time, 1)
-        current_time_struct = _localtime(current_time_int)
-
-        timestamp = _strftime("%Y-%m-%dT%H:%M:%S.", current_time_struct) + "%03d" % (
-            int(current_time_fraction * 1000))
+        timestamp = _format_time(_time())
         method_name = getattr(TestLogger.current_test, '_testMethodName', '')
         exception_time = re.sub(r'[:.]', '-', timestamp)
         file_name = "%(method)s - %(time)s.png" % {'method': method_name, 'time': exception_time}
@@ -0,0 +1,146 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+# 不需要保存的目录（lib 是指向安装目录的链接，缓存目录可以重建）
+EXCLUDED_DIRS = ('lib', 'cache', 'code_cache')
+
+
+class AppStateSnapshot(object):
+    """
+    应用数据快照：把已登录状态下的应用数据目录（/data/data/<包名>）打包保存到电脑，
+    需要重置应用时直接恢复，跳过引导页、权限列表、协议与登录。
+
+        1、debuggable 的安装包使用 run-as，已 root 的手机使用 su；两者都不可用时不保存、不恢复；
+        2、快照按应用版本保存：<root>/<手机别名>/<包名>/<版本>/<名称>.tar，版本变化后旧快照自动删除；
+        3、恢复前比较手机上缓存的压缩包 md5，相同则不再重复推送；
+        4、压缩包校验通过后才清空数据目录，结束进程、清空、解压任何一步失败都不再执行后面的步骤，
+           并执行 pm clear，保证应用处于干净的初始状态。
+    """
+
+    REMOTE_DIR = '/data/local/tmp'
+
+    def __init__(self, mobile, root):
+        self._mobile = mobile
+        self.root = root
+        self._access = {}
+
+    def _shell(self, *commands):
+        return self._mobile.execute_shell_batch(list(commands))
+
+    def get_access(self, package):
+        """访问应用数据目录的方式：run-as、su，都不可用时返回 None"""
+        if package not in self._access:
+            run_as, su = self._shell('run-as {} id'.format(package), "su -c 'id'")
+            if run_as.exit_code == 0:
+                self._access[package] = 'run-as'
+            elif su.exit_code == 0 and 'uid=0' in (su.output or ''):
+                self._access[package] = 'su'
+            else:
+                self._access[package] = None
+        return self._access[package]
+
+    def _wrap(self, package, script):
+        """以应用身份（run-as）或 root 身份（su）执行脚本"""
+        if self.get_access(package) == 'run-as':
+            return "run-as {} sh -c '{}'".format(package, script)
+        return "su -c '{}'".format(script)
+
+    def _get_dir(self, package, version):
+        return os.path.join(self.root, self._mobile.alis, package, re.sub(r'[\\/:*?"<>|\s]', '_', version))
+
+    def _remove_other_versions(self, package, version):
+        """删除其它版本的快照"""
+        package_dir = os.path.dirname(self._get_dir(package, version))
+        if not os.path.isdir(package_dir):
+            return
+        current = os.path.basename(self._get_dir(package, version))
+        for name in os.listdir(package_dir):
+            if name != current:
+                shutil.rmtree(os.path.join(package_dir, name), ignore_errors=True)
+
+    def get(self, package, version, name):
+        """当前版本的快照信息，不存在时返回 None"""
+        path = os.path.join(self._get_dir(package, version), name + '.json')
+        try:
+            with open(path, 'r', encoding='UTF-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('version') != version or not os.path.isfile(meta.get('archive', '')):
+            return None
+        return meta
+
+    def save(self, package, version, name):
+        """
+        保存应用数据目录（会先结束应用进程）
+        :return: 快照信息；无法访问应用数据目录时返回 None
+        """
+        if self.get_access(package) is None:
+            return None
+        remote = '{}/{}.{}.tar'.format(self.REMOTE_DIR, package, name)
+        excluded = '|'.join(EXCLUDED_DIRS)
+        script = 'cd /data/data/{} && tar -cf - $(ls | grep -vE "^({})$")'.format(package, excluded)
+        stop, tar = self._shell('am force-stop {}'.format(package),
+                                '{} > {}'.format(self._wrap(package, script), remote))
+        if stop.exit_code != 0 or tar.exit_code != 0:
+            return None
+        content = base64.b64decode(self._mobile.driver.pull_file(remote))
+        self._remove_other_versions(package, version)
+        directory = self._get_dir(package, version)
+        os.makedirs(directory, exist_ok=True)
+        archive = os.path.join(directory, name + '.tar')
+        with open(archive, 'wb') as f:
+            f.write(content)
+        meta = dict(package=package, version=version, archive=archive,
+                    md5=hashlib.md5(content).hexdigest(), created_at=time.time())
+        with open(os.path.join(directory, name + '.json'), 'w', encoding='UTF-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return meta
+
+    def restore(self, package, version, name):
+        """
+        恢复应用数据目录（会先结束应用进程并清空数据目录）
+        :return: 是否恢复成功；没有当前版本的快照或者无法访问应用数据目录时返回 False
+        """
+        self._remove_other_versions(package, version)
+        meta = self.get(package, version, name)
+        if meta is None or self.get_access(package) is None:
+            return False
+        remote = '{}/{}.{}.tar'.format(self.REMOTE_DIR, package, name)
+        md5, = self._shell('md5sum -b {}'.format(remote))
+        if self._get_md5(md5) != meta['md5']:
+            with open(meta['archive'], 'rb') as f:
+                self._mobile.driver.push_file(remote, str(base64.b64encode(f.read()), 'UTF-8'))
+            chmod, md5 = self._shell('chmod 644 {}'.format(remote), 'md5sum -b {}'.format(remote))
+        else:
+            chmod, = self._shell('chmod 644 {}'.format(remote))
+        # 压缩包不完整时不能清空数据目录
+        if chmod.exit_code != 0 or self._get_md5(md5) != meta['md5']:
+            return False
+        excluded = '|'.join(EXCLUDED_DIRS)
+        clear = 'cd /data/data/{} && rm -rf $(ls | grep -vE "^({})$")'.format(package, excluded)
+        extract = 'cd /data/data/{} && tar -xf -'.format(package)
+        steps = ['am force-stop {}'.format(package),
+                 self._wrap(package, clear),
+                 '{} < {}'.format(self._wrap(package, extract), remote)]
+        if self.get_access(package) == 'su':
+            # root 解压的文件需要恢复属主与 SELinux 上下文
+            steps.append(self._wrap(package, 'chown -R $(stat -c %u:%g /data/data/{0}) /data/data/{0} && '
+                                             'restorecon -R /data/data/{0}'.format(package)))
+        restore, = self._shell(' && '.join(steps))
+        if restore.exit_code != 0:
+            # 数据目录可能已经被清空了一部分，恢复为干净的初始状态
+            self._shell('pm clear {}'.format(package))
+            return False
+        return True
+
+    @staticmethod
+    def _get_md5(result):
+        if result.exit_code != 0:
+            return None
+        return (result.output or '').split(' ')[0].strip()
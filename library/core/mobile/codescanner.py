@@ -0,0 +1,84 @@
+from collections import OrderedDict, namedtuple
+
+# 识别结果：data 为解码后的文本，type 为码制（QRCODE、EAN13 等），rect 为在屏幕上的位置 (x, y, width, height)
+ScannedCode = namedtuple('ScannedCode', ['data', 'type', 'rect'])
+
+
+class CodeScanner(object):
+    """
+    二维码/条形码识别：
+        1、只识别指定区域（元素）内的截图，不传区域时识别全屏；
+        2、先缩小到最长边不超过 MAX_SIDE 再识别，识别不到时才依次尝试原图、放大图；
+        3、识别结果按 (截图 md5, 区域) 缓存，同一截图重复识别直接返回。
+    """
+
+    MAX_SIDE = 800
+    # 区域最长边小于该值时，原图也识别不到会再尝试放大一倍
+    UPSCALE_BELOW = 400
+    CACHE_SIZE = 32
+
+    def __init__(self, screenshot_cache):
+        self._screenshots = screenshot_cache
+        self._results = OrderedDict()
+        self.decode_count = 0
+
+    def get_scales(self, width, height):
+        """依次尝试的缩放比例"""
+        longest = max(width, height)
+        scales = [min(1.0, self.MAX_SIDE / longest)] if longest else [1.0]
+        if scales[0] < 1:
+            scales.append(1.0)
+        if longest < self.UPSCALE_BELOW:
+            scales.append(2.0)
+        return scales
+
+    def _decode(self, image, scales):
+        from PIL import Image
+        from pyzbar import pyzbar
+
+        for scale in scales:
+            if scale == 1:
+                scaled = image
+            else:
+                size = (max(int(image.width * scale), 1), max(int(image.height * scale), 1))
+                scaled = image.resize(size, Image.BILINEAR)
+            self.decode_count += 1
+            codes = pyzbar.decode(scaled)
+            if codes:
+                return codes, scale
+        return [], 1.0
+
+    def scan(self, rect=None):
+        """
+        :param rect: 识别区域 (x, y, width, height)，使用元素坐标；None 表示全屏
+        :return: [ScannedCode]；识别不到时返回空列表
+        """
+        image = self._screenshots.get_image('L')
+        ratio = self._screenshots.get_scale()
+        if rect is None:
+            box = (0, 0, image.width, image.height)
+        else:
+            box = (max(int(rect[0] * ratio), 0), max(int(rect[1] * ratio), 0),
+                   min(int((rect[0] + rect[2]) * ratio), image.width),
+                   min(int((rect[1] + rect[3]) * ratio), image.height))
+        key = (self._screenshots.digest, box)
+        if key in self._results:
+            self._results.move_to_end(key)
+            return list(self._results[key])
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return []
+        region = image if rect is None else image.crop(box)
+        codes, scale = self._decode(region, self.get_scales(region.width, region.height))
+        result = []
+        for code in codes:
+            left, top, width, height = code.rect
+            result.append(ScannedCode(
+                data=code.data.decode('utf-8', 'replace'),
+                type=code.type,
+                rect=(int((box[0] + left / scale) / ratio), int((box[1] + top / scale) / ratio),
+                      int(width / scale / ratio), int(height / scale / ratio))
+            ))
+        self._results[key] = result
+        while len(self._results) > self.CACHE_SIZE:
+            self._results.popitem(last=False)
+        return list(result)
@@ -0,0 +1,76 @@
+def measure_scroll(previous, current, expected):
+    """
+    两屏之间列表内容向上移动的像素：
+        用两屏中都只出现一次的内容对齐（取最多列表项支持的位移）；
+        内容都重复时（例如没有文本的图片缩略图），在所有可能的对齐方式中取最接近滑动距离的；
+        两屏没有相同的内容时使用滑动距离。
+    :param previous: 上一屏的 [(内容, bounds)]
+    :param current: 这一屏的 [(内容, bounds)]
+    :param expected: 滑动距离
+    """
+
+    def tops(items):
+        result = {}
+        for content, bound in items:
+            if bound:
+                result.setdefault(content, []).append(bound[1])
+        return result
+
+    before, after = tops(previous), tops(current)
+    shared = [content for content in after if content in before]
+    unique = [before[c][0] - after[c][0] for c in shared if len(before[c]) == 1 and len(after[c]) == 1]
+    if unique:
+        return max(set(unique), key=lambda d: (unique.count(d), -abs(d - expected)))
+    candidates = [b - a for c in shared for b in before[c] for a in after[c]]
+    if candidates:
+        return min(candidates, key=lambda d: abs(d - expected))
+    return expected
+
+
+class ListItemTracker(object):
+    """
+    记录 list_iterator 已经返回过的列表项：
+        列表项用 (内容, 左边界, 在整个列表中的上边界) 标识，上边界 = 屏幕上的位置 + 测量出的累计滑动距离，
+        内容相同的列表项（没有文本的图片缩略图、同名联系人）用位置区分，网格中同一行的列表项用左边界区分；
+        被列表底部截断的列表项留到滑动之后再返回；
+        滑动之后列表没有变化时到底。
+    """
+
+    def __init__(self, bottom, swipe_distance):
+        """
+        :param bottom: 列表容器的下边界
+        :param swipe_distance: 每次滑动手指移动的距离
+        """
+        self.bottom = bottom
+        self.swipe_distance = swipe_distance
+        self.at_end = False
+        self._yielded = set()
+        self._previous = None
+        self._offset = 0
+
+    def new_items(self, items):
+        """
+        :param items: 这一屏的 [(内容, bounds)]，bounds 为 (left, top, right, bottom) 或 None
+        :return: 这一屏需要返回的列表项下标
+        """
+        # 滑动后列表没有变化：已经到底，剩下的列表项（包括被截断的）全部返回
+        self.at_end = items == self._previous
+        if self._previous is not None and not self.at_end:
+            self._offset += measure_scroll(self._previous, items, self.swipe_distance)
+        self._previous = items
+        heights = sorted(b[3] - b[1] for _, b in items if b)
+        full_height = heights[len(heights) // 2] if heights else 0
+        result = []
+        for index, (content, bound) in enumerate(items):
+            if bound:
+                key = (content, bound[0], bound[1] + self._offset)
+            else:
+                key = (content, None, self._offset, index)
+            if key in self._yielded:
+                continue
+            # 被列表底部截断的列表项（高度不到正常高度的一半）滑动之后再返回
+            if not self.at_end and bound and bound[3] >= self.bottom - 1 and bound[3] - bound[1] < full_height // 2:
+                continue
+            self._yielded.add(key)
+            result.append(index)
+        return result
@@ -5,22 +5,52 @@ import hashlib
 import json
 import os
 import re
+import time
 from abc import *
-from unicodedata import normalize
 
 from appium import webdriver
 from appium.webdriver.common.mobileby import MobileBy
 from selenium.common.exceptions import TimeoutException, \
     NoSuchElementException
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.wait import WebDriverWait
 
 from library.core.TestLogger import TestLogger
+from library.core.mobile.appstate import AppStateSnapshot
+from library.core.mobile.codescanner import CodeScanner
+from library.core.mobile.listscroll import ListItemTracker
+from library.core.mobile.permissionwatcher import ANDROID_PERMISSION_DIALOG, PermissionWatcher
+from library.core.mobile.resourcesync import ResourceSync
+from library.core.mobile.screenshotcache import ScreenshotCache
+from library.core.mobile.sessionhealth import SessionHealth
+from library.core.mobile.shellbatch import build_shell_batch_script, new_shell_batch_marker, normalize_shell_commands, \
+    parse_shell_batch_output
+from library.core.mobile.transport import PooledConnection
+from library.core.mobile.uisnapshot import UiSnapshot
+from library.core.mobile.waiting import AdaptiveWait, FixedPolling, create_polling_strategy, get_condition_name
+from library.core.utils import ConfigManager
+from library.core.utils.tracing import TRACER
+
+
+class ListIteratorCounters(object):
+    """list_iterator 的统计：滑动次数、请求次数（查找元素、获取 page_source、读取元素属性）、返回的列表项数量"""
+
+    def __init__(self):
+        self.scrolls = 0
+        self.requests = 0
+        self.items = 0
+
+    def reset(self):
+        self.__init__()
+
+    def __repr__(self):
+        return 'ListIteratorCounters(scrolls={}, requests={}, items={})'.format(self.scrolls, self.requests, self.items)
 
 
 class MobileDriver(ABC):
     def __init__(self, alis_name, model_info, command_executor='http://127.0.0.1:4444/wd/hub',
-                 desired_capabilities=None, browser_profile=None, proxy=None, keep_alive=False, card_slot=None):
+                 desired_capabilities=None, browser_profile=None, proxy=None, keep_alive=True, card_slot=None,
+                 pool_size=PooledConnection.DEFAULT_POOL_SIZE, max_retries=PooledConnection.DEFAULT_MAX_RETRIES,
+                 permission_check_interval=PermissionWatcher.DEFAULT_INTERVAL):
         self._alis = alis_name
         self._model_info = model_info
         self._remote_url = command_executor
@@ -28,8 +58,20 @@ class MobileDriver(ABC):
         self._browser_profile = browser_profile
         self._proxy = proxy
         self._keep_alive = keep_alive
+        self._pool_size = pool_size
+        self._max_retries = max_retries
+        self._command_executor = None
         self._card_slot = self._init_sim_card(card_slot)
         self._driver = None
+        self._snapshot = UiSnapshot(self)
+        self._screenshot_cache = ScreenshotCache(self)
+        self._code_scanner = CodeScanner(self._screenshot_cache)
+        self._health = SessionHealth(self)
+        self._permission_watcher = PermissionWatcher(self, permission_check_interval)
+        self._app_state = AppStateSnapshot(self, ConfigManager.get_app_state_path())
+        self._resource_sync = ResourceSync(self, ConfigManager.get_resource_manifest_path())
+        self._polling_strategy = None
+        self.list_iterator_counters = ListIteratorCounters()
         self.turn_off_reset()
 
     def __del__(self):
@@ -61,6 +103,16 @@ class MobileDriver(ABC):
     def driver(self):
         return self._driver
 
+    @property
+    def snapshot(self):
+        """当前界面的页面快照"""
+        return self._snapshot
+
+    @property
+    def screenshot_cache(self):
+        """当前界面的截图缓存"""
+        return self._screenshot_cache
+
     @property
     def current_activity(self):
         return self.driver.current_activity
@@ -122,34 +174,66 @@ class MobileDriver(ABC):
         """返回手机卡支持类型列表"""
         raise NotImplementedError("This method must be implemented!")
 
+    @property
+    def permission_watcher(self):
+        """权限弹窗监听器"""
+        return self._permission_watcher
+
+    def permission_dialog_signatures(self):
+        """需要自动点击允许的系统弹窗特征（不同机型的弹窗不一样，可以在实现类里面重写该方法）"""
+        return [ANDROID_PERMISSION_DIALOG]
+
+    @property
+    def health(self):
+        """会话健康状态"""
+        return self._health
+
     @property
     def is_connection_created(self):
         if self.driver is None:
             return False
-        else:
-            try:
-                t = self.driver.find_elements('xpath', '//*')
-                del t
-                return True
-            except Exception:  # InvalidSessionIdException or WebDriverException:
-                return False
+        return self._health.is_alive()
+
+    def _get_command_executor(self):
+        """开启 keep_alive 时使用同一 hub 共享的连接池，否则每个命令单独建立连接"""
+        if not self._keep_alive:
+            return self._remote_url
+        if self._command_executor is None:
+            self._command_executor = PooledConnection(self._remote_url, self._pool_size, self._max_retries,
+                                                      self.alis)
+        return self._command_executor
+
+    @property
+    def command_latency(self):
+        """每个 WebDriver 命令的耗时统计（仅 keep_alive 模式下可用）"""
+        return getattr(self._command_executor, 'latency', None)
+
+    def _on_session_created(self):
+        """新会话创建后的初始化"""
+        self._health.install(self._driver)
+        self._snapshot.install(self._driver)
+        self._screenshot_cache.install(self._driver)
+        TRACER.install(self._driver, self.alis)
 
     @TestLogger.log('连接到手机')
     def connect_mobile(self):
         if self.driver is None:
             try:
-                self._driver = webdriver.Remote(self._remote_url, self._desired_caps, self._browser_profile,
+                self._driver = webdriver.Remote(self._get_command_executor(), self._desired_caps,
+                                                self._browser_profile,
                                                 self._proxy,
                                                 self._keep_alive)
             except Exception as e:
                 raise RuntimeError('无法连接到 appium server: {}'.format(self._remote_url))
+            self._on_session_created()
         elif not self.is_connection_created:
             try:
                 self.driver.quit()
             except:
                 pass
             try:
-                self._driver = webdriver.Remote(self._remote_url, self._desired_caps, self._browser_profile,
+                self._driver = webdriver.Remote(self._get_command_executor(), self._desired_caps,
+                                                self._browser_profile,
                                                 self._proxy,
                                                 self._keep_alive)
             except:
@@ -157,12 +241,19 @@ class MobileDriver(ABC):
                 msg = traceback.format_exc()
                 print(msg)
                 raise RuntimeError('无法连接到 appium server: {}'.format(self._remote_url))
+            self._on_session_created()
         else:
             pass
-        if self.is_android:
-            app_version_info = self.get_app_version_info()
-            real_model = self.get_mobile_model_info()
-            network_state_info = self.get_mobile_network_connection_info()
+        if self.is_android():
+            version_result, model_result, network_result = self.execute_shell_batch([
+                self._app_version_info_command(self._desired_caps['appPackage']),
+                self._mobile_model_info_command(),
+                ['ifconfig'],
+            ])
+            app_version_info = self._parse_app_version_info(version_result.output)
+            real_model = (model_result.output or "暂无信息").strip()
+            network_state_info = network_result.output or "暂无信息"
+            self.model_info["ReadableName"] = real_model
             print(
                 """
 已连接到手机：
@@ -179,7 +270,8 @@ class MobileDriver(ABC):
                     networkState=network_state_info
                 )
             )
-        self.model_info["ReadableName"] = self.get_mobile_model_info()
+        else:
+            self.model_info["ReadableName"] = self.get_mobile_model_info()
 
     @TestLogger.log('断开手机连接')
     def disconnect_mobile(self):
@@ -187,6 +279,7 @@ class MobileDriver(ABC):
             self.driver.quit()
         except:
             pass
+        self._health.reset()
 
     @TestLogger.log('打开重置APP选项（仅当手机未连接时有效）')
     def turn_on_reset(self):
@@ -200,10 +293,7 @@ class MobileDriver(ABC):
 
     @TestLogger.log('判断当前设备与传入平台名是否一致')
     def is_platform(self, platform):
-        if self.is_connection_created:
-            platform_name = self.driver.desired_capabilities['platformName']
-        else:
-            platform_name = self._desired_caps['platformName']
+        platform_name = self._health.platform or self._desired_caps['platformName']
         return platform.lower() == platform_name.lower()
 
     @TestLogger.log('判断当前设备是否为IOS设备')
@@ -236,6 +326,54 @@ class MobileDriver(ABC):
     def reset_app(self):
         self.driver.reset()
 
+    @property
+    def app_state(self):
+        """应用数据快照"""
+        return self._app_state
+
+    def _get_app_state_key(self, package=None):
+        """(包名, 版本号)，无法获取版本号时版本号为 None"""
+        if not package:
+            package = self._desired_caps['appPackage']
+        version = self.get_app_version_info(package)
+        return package, (None if version == '未知版本' else version)
+
+    def has_app_state(self, name='logged_in', package=None):
+        """是否存在当前应用版本的数据快照"""
+        if not self.is_android():
+            return False
+        package, version = self._get_app_state_key(package)
+        return version is not None and self._app_state.get(package, version, name) is not None
+
+    @TestLogger.log('保存应用数据快照')
+    def save_app_state(self, name='logged_in', package=None):
+        """
+        保存应用数据目录（按应用版本保存，会结束应用进程）
+        :return: 快照信息；不支持（非 Android、无法获取版本号、没有 run-as/su 权限）时返回 None
+        """
+        if not self.is_android():
+            return None
+        package, version = self._get_app_state_key(package)
+        if version is None:
+            return None
+        return self._app_state.save(package, version, name)
+
+    @TestLogger.log('恢复应用数据快照')
+    def restore_app_state(self, name='logged_in', package=None, launch=True):
+        """
+        恢复当前应用版本的数据快照，代替重置应用后重新走引导页与登录
+        :param launch: 恢复后是否启动应用
+        :return: 是否恢复成功
+        """
+        if not self.is_android():
+            return False
+        package, version = self._get_app_state_key(package)
+        if version is None or not self._app_state.restore(package, version, name):
+            return False
+        if launch:
+            self.activate_app(package)
+        return True
+
     @TestLogger.log('获取屏幕截图')
     def get_screenshot_as_png(self):
         """
@@ -277,6 +415,24 @@ class MobileDriver(ABC):
         print(result)
         return result
 
+    @TestLogger.log('批量执行ADB shell命令')
+    def execute_shell_batch(self, commands):
+        """
+        在一次 mobile:shell 请求中顺序执行多条 ADB shell 命令（requires server flag --relaxed-security to be set）
+
+        例：execute_shell_batch([('getprop', 'ro.product.name'), 'ifconfig'])
+
+        :param commands: 命令列表，每条命令可以是字符串，或者 (command, *args) 形式的列表/元组
+        :return: ShellResult 列表（command、output、exit_code），命令未执行完成时 output、exit_code 为 None
+        """
+        lines = normalize_shell_commands(commands)
+        if not lines:
+            return []
+        marker = new_shell_batch_marker()
+        script = build_shell_batch_script(lines, marker)
+        output = self.driver.execute_script('mobile:shell', {'command': script, 'args': []})
+        return parse_shell_batch_output(output, lines, marker)
+
     @contextlib.contextmanager
     def listen_verification_code(self, max_wait_time=30):
         """监听验证码"""
@@ -308,6 +464,25 @@ class MobileDriver(ABC):
             return result[0]
         raise Exception("手机收不到验证码")
 
+    @property
+    def polling_strategy(self):
+        """等待使用的轮询策略"""
+        if self._polling_strategy is None:
+            from library.core.utils import ConfigManager
+            self._polling_strategy = create_polling_strategy(ConfigManager.get_wait_polling_strategy(),
+                                                             ConfigManager.get_wait_telemetry_path())
+        return self._polling_strategy
+
+    @polling_strategy.setter
+    def polling_strategy(self, strategy):
+        self._polling_strategy = strategy
+
+    def _create_wait(self, condition, timeout, poll=None):
+        strategy = self.polling_strategy
+        if poll is not None and isinstance(strategy, FixedPolling):
+            strategy = FixedPolling(poll)
+        return AdaptiveWait(self.driver, timeout, strategy, get_condition_name(condition), device=self.alis)
+
     @TestLogger.log('等待')
     def wait_until(
             self,
@@ -315,9 +490,10 @@ class MobileDriver(ABC):
             timeout=8,
             auto_accept_permission_alert=True
     ):
-        wait = WebDriverWait(self.driver, timeout)
+        wait = self._create_wait(condition, timeout)
         if auto_accept_permission_alert:
             condition = self._auto_click_permission_alert_wrapper(condition)
+        condition = self._refresh_snapshot_wrapper(condition)
         # if callable(unexpected):
         #     condition = self._error_listener(unexpected, *args, **kwargs)(condition)
         return wait.until(condition)
@@ -329,9 +505,10 @@ class MobileDriver(ABC):
             timeout=8,
             auto_accept_permission_alert=True
     ):
-        wait = WebDriverWait(self.driver, timeout)
+        wait = self._create_wait(condition, timeout)
         if auto_accept_permission_alert:
             condition = self._auto_click_permission_alert_wrapper(condition)
+        condition = self._refresh_snapshot_wrapper(condition)
         # if callable(unexpected):
         #     condition = self._error_listener(unexpected, *args, **kwargs)(condition)
         return wait.until_not(condition)
@@ -361,9 +538,9 @@ class MobileDriver(ABC):
 
         return decorator
 
-    def _auto_click_permission_alert_wrapper(self, func):
+    def _refresh_snapshot_wrapper(self, func):
         """
-        权限自动点击装饰器（如果手机无法自动点击权限，可以在实现类里面重写该方法）
+        每次轮询之前使页面快照失效，保证每次轮询最多获取一次 page_source
         :param func:
         :return:
         """
@@ -371,28 +548,35 @@ class MobileDriver(ABC):
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            possible_activity = [
-                'com.android.packageinstaller.permission.ui.GrantPermissionsActivity',
-                '.permission.ui.GrantPermissionsActivity'
-            ]
-            if this.driver.current_activity in possible_activity:
-                need = True
-                while need:
-                    try:
-                        alert = this.driver.switch_to.alert
-                        alert.accept()
-                        continue
-                    except:
-                        alert = this.get_elements(
-                            [MobileBy.XPATH, '//android.widget.Button[@text="始终允许" or @text="允许"]'])
-                        if alert:
-                            alert[0].click()
-                            continue
-                    break
+            this.snapshot.invalidate()
+            this.screenshot_cache.invalidate()
             return func(*args, **kwargs)
 
         return wrapper
 
+    def _auto_click_permission_alert_wrapper(self, func):
+        """
+        权限自动点击装饰器（如果手机的权限弹窗不一样，可以在实现类里面重写 permission_dialog_signatures 方法）
+        条件求值之后再检查弹窗，这样可以复用条件刚获取的页面快照；点击了弹窗则重新求值
+        :param func:
+        :return:
+        """
+        this = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                if this.permission_watcher.check():
+                    return func(*args, **kwargs)
+                raise
+            if this.permission_watcher.check(free_only=bool(result)):
+                return func(*args, **kwargs)
+            return result
+
+        return wrapper
+
     @TestLogger.log('等待条件成功，并监听异常条件')
     def wait_condition_and_listen_unexpected(
             self,
@@ -414,15 +598,43 @@ class MobileDriver(ABC):
         :param kwargs: unexpected 方法的参数
         :return: 
         """""
-        wait = WebDriverWait(self.driver, timeout, poll)
+        wait = self._create_wait(condition, timeout, poll)
         if auto_accept_permission_alert:
             condition = self._auto_click_permission_alert_wrapper(condition)
         if callable(unexpected):
             condition = self._error_listener(unexpected, *args, **kwargs)(condition)
+        condition = self._refresh_snapshot_wrapper(condition)
         return wait.until(condition)
 
+    @TestLogger.log('等待界面稳定')
+    def wait_for_ui_idle(self, stable_time=500, timeout=5, poll=0.2):
+        """
+        等待界面稳定（连续获取的页面DOM在 stable_time 毫秒内没有变化），用于替代固定时长的 time.sleep
+        :param stable_time: 界面保持不变的时长（毫秒）
+        :param timeout: 最长等待时间（秒）
+        :param poll: 获取页面DOM的间隔（秒）
+        :return: 超时前界面是否已经稳定
+        """
+        start = time.time()
+        last_digest = None
+        stable_since = start
+        while True:
+            self.snapshot.invalidate()
+            digest = hashlib.md5(self.snapshot.source.encode('UTF-8')).hexdigest()
+            now = time.time()
+            if digest != last_digest:
+                last_digest = digest
+                stable_since = now
+            elif (now - stable_since) * 1000 >= stable_time:
+                return True
+            if now - start >= timeout:
+                return False
+            time.sleep(poll)
+
     @TestLogger.log('获取OS平台名')
     def get_platform(self):
+        if self._health.platform:
+            return self._health.platform
         try:
             platform_name = self.driver.desired_capabilities['platformName']
         except Exception as e:
@@ -453,8 +665,10 @@ class MobileDriver(ABC):
     def get_text(self, locator):
         """获取元素文本"""
         self.wait_until(
-            condition=lambda d: self.get_elements(locator)
+            condition=lambda d: self._is_element_present(locator)
         )
+        if self.snapshot.find(locator) is not None:
+            return self.snapshot.get_text(locator)
         elements = self.get_elements(locator)
         if len(elements) > 0:
             return elements[0].text
@@ -474,18 +688,21 @@ class MobileDriver(ABC):
 
     @TestLogger.log('判断页面是否包含指定文本')
     def is_text_present(self, text):
-        text_norm = normalize('NFD', text)
-        source_norm = normalize('NFD', self.get_source())
-        result = text_norm in source_norm
-        return result
+        return self.snapshot.is_text_present(text)
 
     @TestLogger.log('判断元素是否包含在页面DOM')
     def _is_element_present(self, locator):
+        result = self.snapshot.is_element_present(locator)
+        if result is not None:
+            return result
         elements = self.get_elements(locator)
         return len(elements) > 0
 
     @TestLogger.log('判断元素是否可见')
     def _is_visible(self, locator):
+        result = self.snapshot.is_visible(locator)
+        if result is not None:
+            return result
         elements = self.get_elements(locator)
         if len(elements) > 0:
             return elements[0].is_displayed()
@@ -531,7 +748,7 @@ class MobileDriver(ABC):
 
     @TestLogger.log('获取页面DOM文档')
     def get_source(self):
-        return self.driver.page_source
+        return self.snapshot.source
 
     @TestLogger.log('点击坐标')
     def tap(self, positions, duration=None):
@@ -919,7 +1136,29 @@ class MobileDriver(ABC):
 
     @TestLogger.log('推送文件夹到手机内存')
     def push_folder(self, folder_path, to_path, save_name=None, force_replace=False):
-        """推送文件夹到手机内存"""
+        """
+        推送文件夹到手机内存
+        Android 只推送手机上不存在或者内容不一致的文件（见 ResourceSync），force_replace 为 True 时全部推送
+        """
+        folder_path = os.path.abspath(folder_path)
+        if not save_name:
+            save_name = os.path.basename(folder_path)
+        if not self._is_legal_file_name(save_name):
+            raise ValueError(r'文件名不能包含/\:*?<>|特殊字符')
+        if not os.path.exists(folder_path):
+            raise ValueError('找不到路径："{}"'.format(folder_path))
+        if not self.is_android():
+            return self._push_folder_recursively(folder_path, to_path, save_name, force_replace)
+        result = self._resource_sync.sync(folder_path, to_path, save_name, force=force_replace)
+        print('Local: {};\nPush to: {}/{};\nPushed: {}, unchanged: {}.'.format(
+            folder_path, to_path.rstrip('/'), save_name, len(result.pushed), result.skipped))
+        if result.failed:
+            print('推送的文件可能已经损坏：{}'.format(result.failed))
+            return False
+        return True
+
+    def _push_folder_recursively(self, folder_path, to_path, save_name=None, force_replace=False):
+        """逐个文件推送文件夹"""
         folder_path = os.path.abspath(folder_path)
         base_name = os.path.basename(folder_path)
         if not save_name:
@@ -941,7 +1180,7 @@ class MobileDriver(ABC):
             files = os.listdir(folder_path)
             for f in files:
                 child_path = os.path.join(folder_path, f)
-                self.push_folder(child_path, to_path, f, force_replace)
+                self._push_folder_recursively(child_path, to_path, f, force_replace)
             return True
         else:
             raise ValueError('找不到路径："{}"'.format(folder_path))
@@ -1017,58 +1256,69 @@ class MobileDriver(ABC):
         else:
             raise NotImplementedError('该API不支持android/ios以外的系统')
 
+    def _get_list_items(self, item_locator, elements):
+        """
+        列表项的内容 (resource-id, 子孙节点的文本) 与 bounds
+        page_source 与查找结果不一致时，退回到逐个读取元素的文本与位置
+        """
+        counters = self.list_iterator_counters
+        fetch_count = self.snapshot.fetch_count
+        nodes = self.snapshot.find(item_locator)
+        counters.requests += self.snapshot.fetch_count - fetch_count
+        if nodes is not None and len(nodes) == len(elements):
+            contents = [(node.get('resource-id'), tuple(n.get('text') for n in node.iter() if n.get('text')))
+                        for node in nodes]
+            bounds = [re.findall(r'-?\d+', node.get('bounds') or '') for node in nodes]
+            bounds = [tuple(int(n) for n in b) if len(b) == 4 else None for b in bounds]
+        else:
+            contents, bounds = [], []
+            for element in elements:
+                rect = element.rect
+                counters.requests += 2
+                contents.append((None, (element.text,)))
+                bounds.append((rect['x'], rect['y'], rect['x'] + rect['width'], rect['y'] + rect['height']))
+        return list(zip(contents, bounds))
+
     def list_iterator(self, scroll_view_locator, item_locator):
         """
-        迭代列表内容
+        迭代列表内容：
+            每一屏只查找一次列表项，只返回没有返回过的列表项；
+            列表项的标识、被截断的列表项、是否到底见 ListItemTracker；
+        统计信息见 list_iterator_counters。
         :param scroll_view_locator: 列表容器的定位器
         :param item_locator: 列表项定位器
         :return:
         """
-        if self.get_elements(scroll_view_locator):
-            scroll_view = self.get_element(scroll_view_locator)
-        else:
+        counters = self.list_iterator_counters
+        counters.requests += 1
+        scroll_views = self.get_elements(scroll_view_locator)
+        if not scroll_views:
             return
+        rect = scroll_views[0].rect
+        counters.requests += 1
+        left, top = int(rect['x']), int(rect['y'])
+        right, bottom = left + int(rect['width']), top + int(rect['height'])
+        # 稳定的滑动最少要在press后保持600ms才能移动（慢速滑动没有惯性，滑动距离接近手指移动的距离）
+        minimum_hold_time = 600
+        x = (left + right) // 2
+        margin = (bottom - top) // 5
+        swipe_distance = (bottom - top) - 2 * margin
+
+        tracker = ListItemTracker(bottom, swipe_distance)
+        while True:
+            counters.requests += 1
+            elements = self.get_elements(item_locator)
+            if not elements:
+                return
+            for index in tracker.new_items(self._get_list_items(item_locator, elements)):
+                counters.items += 1
+                yield elements[index]
+            if tracker.at_end:
+                return
 
-        items = self.get_elements(item_locator)
-        if not items:
-            return
-        for i in items:
-
-            # 判断元素位置是否已经超过滚动视图的中点
-            scroll_view_center = scroll_view.location.get('y') + scroll_view.size.get('height') // 2
-            if i.location.get('y') > scroll_view_center:
-                pre_y = i.location.get('y')
-
-                # 稳定的滑动最少要在press后保持600ms才能移动
-                minimum_hold_time = 600
-                self.swipe_by_direction(i, 'up', minimum_hold_time)
-                post_y = i.location.get('y')
-                if pre_y == post_y:
-
-                    # 坐标没变化就把剩下的抛出去然后结束循环
-                    yield from items[items.index(i):]
-                    return
-                else:
-
-                    # 坐标变化就更新找出的列表
-                    restorer = items[:items.index(i)]
-                    items.clear()
-                    refreshed_items = self.get_elements(item_locator)
-                    if not refreshed_items:
-                        return
-                    for refreshed_item in refreshed_items:
-                        if refreshed_item.location.get('y') == post_y:
-                            the_rests = refreshed_items[refreshed_items.index(refreshed_item):]
-                            restorer.extend(the_rests)
-                            break
-                    items.extend(restorer)
-            yield i
-            refreshed_items = self.get_elements(item_locator)
-            refreshed_items.reverse()
-            for refreshed_item in refreshed_items:
-                offset = -1 - refreshed_items.index(refreshed_item)
-                if abs(offset) <= len(items):
-                    items[offset] = refreshed_item
+            self.driver.swipe(x, bottom - margin, x, top + margin, minimum_hold_time)
+            counters.scrolls += 1
+            counters.requests += 1
 
     @TestLogger.log('开启数据流量')
     def turn_on_mobile_data(self):
@@ -1279,22 +1529,31 @@ class MobileDriver(ABC):
         if self.is_android():
             if not package:
                 package = self._desired_caps['appPackage']
-            result = self.execute_shell_command('pm', 'dump', package, '|', 'grep', '"versionName"')
-            try:
-                name, value = result.strip().split('=')
-                del name
-                return value
-            except:
-                return '未知版本'
+            result = self.execute_shell_command(*self._app_version_info_command(package))
+            return self._parse_app_version_info(result)
         else:
             # TODO IOS平台待实现
             raise NotImplementedError('该接口目前只支持Android')
 
+    @staticmethod
+    def _app_version_info_command(package):
+        """获取app版本号的shell命令"""
+        return ['pm', 'dump', package, '|', 'grep', '"versionName"']
+
+    @staticmethod
+    def _parse_app_version_info(result):
+        try:
+            name, value = result.strip().split('=')
+            del name
+            return value
+        except:
+            return '未知版本'
+
     @TestLogger.log('获取手机型号')
     def get_mobile_model_info(self):
         if self.is_android():
             try:
-                result = self.execute_shell_command('getprop', 'ro.product.name')
+                result = self.execute_shell_command(*self._mobile_model_info_command())
             except:
                 result = "暂无信息"
             return result.strip()
@@ -1302,6 +1561,10 @@ class MobileDriver(ABC):
             # TODO IOS平台待实现
             raise NotImplementedError('该接口目前只支持Android')
 
+    def _mobile_model_info_command(self):
+        """获取手机型号的shell命令（不同机型读取的属性不一样，可以在实现类里面重写该方法）"""
+        return ['getprop', 'ro.product.name']
+
     @TestLogger.log('获取手机IP信息')
     def get_mobile_network_connection_info(self):
         if self.is_android():
@@ -1369,6 +1632,7 @@ Tips:
     def get_coordinate_color_of_element(self, element, x, y, by_percent=False, mode='RGBA') -> tuple:
         """
         以元素左上角为坐标原点, 获取元素相对坐标颜色
+        同一界面状态只截取一次全屏截图，按元素位置取色（见 ScreenshotCache）
         :param element: 定位器、元素
         :param x: x 轴坐标/百分比
         :param y: y 轴坐标/百分比
@@ -1377,15 +1641,32 @@ Tips:
         :return:
         :rtype: tuple
         """
-        if isinstance(element, WebElement):
-            el = element
-        else:
-            el = self.get_element(element)
-        import io
-        with io.BytesIO(el.screenshot_as_png) as fp:
-            from library.core.utils import image_util
-            color = image_util.get_pixel_point_color(fp, x, y, by_percent, mode)
-            return color
+        return self._screenshot_cache.get_color(self._get_element_rect(element), x, y, by_percent, mode)
+
+    def _get_element_rect(self, element):
+        """
+        元素区域 (x, y, width, height)
+        定位器优先使用页面快照中的 bounds，不需要再查找元素
+        """
+        if not isinstance(element, WebElement):
+            nodes = self.snapshot.find(element)
+            if nodes:
+                rect = ScreenshotCache.parse_bounds(nodes[0].get('bounds'))
+                if rect:
+                    return rect
+            element = self.get_element(element)
+        rect = element.rect
+        return rect['x'], rect['y'], rect['width'], rect['height']
+
+    @TestLogger.log('识别二维码/条形码')
+    def scan_codes(self, region=None):
+        """
+        识别当前界面中的二维码/条形码（同一界面状态只截一次图，相同截图与区域的结果会缓存）
+        :param region: 识别区域（定位器、元素），None 表示全屏
+        :return: [ScannedCode(data, type, rect)]，识别不到时返回空列表
+        """
+        rect = None if region is None else self._get_element_rect(region)
+        return self._code_scanner.scan(rect)
 
     @TestLogger.log('判断是否在通话界面')
     def is_phone_in_calling_state(self):
@@ -0,0 +1,121 @@
+import time
+
+from appium.webdriver.common.mobileby import MobileBy
+
+
+class DialogSignature(object):
+    """
+    系统弹窗特征
+    :param name: 弹窗名称（用于统计）
+    :param detect_locator: 判断弹窗出现的定位器
+    :param accept_locator: 允许按钮的定位器
+    :param min_count: detect_locator 匹配到的元素数量达到该值才认为弹窗出现
+    """
+
+    def __init__(self, name, detect_locator, accept_locator, min_count=1):
+        self.name = name
+        self.detect_locator = detect_locator
+        self.accept_locator = accept_locator
+        self.min_count = min_count
+
+    def __repr__(self):
+        return 'DialogSignature({})'.format(self.name)
+
+
+# 安卓原生权限弹窗
+ANDROID_PERMISSION_DIALOG = DialogSignature(
+    '系统权限弹窗',
+    (MobileBy.XPATH, '//*[@package="com.android.packageinstaller" or @package="com.google.android.packageinstaller"'
+                     ' or @package="com.android.permissioncontroller"]'),
+    (MobileBy.XPATH, '//android.widget.Button[@text="始终允许" or @text="允许"]'),
+)
+
+# MIUI 安全中心权限弹窗
+MIUI_PERMISSION_DIALOG = DialogSignature(
+    'MIUI权限弹窗',
+    (MobileBy.XPATH, '//*[@package="com.lbe.security.miui"]'),
+    (MobileBy.XPATH, '//*[@package="com.lbe.security.miui" and @resource-id="android:id/button1"]'),
+)
+
+
+class PermissionWatcher(object):
+    """
+    权限/系统弹窗监听器：
+        1、在等待的条件求值之后检查弹窗，如果条件刚刚获取过页面快照，检查不需要额外的请求；
+        2、否则最多每 interval 秒检查一次；
+        3、记录检查次数与每种弹窗被点击的次数。
+    """
+
+    DEFAULT_INTERVAL = 2
+    MAX_ACCEPT_TIMES = 5
+
+    def __init__(self, mobile, interval=DEFAULT_INTERVAL):
+        self._mobile = mobile
+        self.interval = interval
+        self._last_check_at = 0
+        self.check_count = 0
+        self.fired = {}
+
+    @property
+    def fire_count(self):
+        return sum(self.fired.values())
+
+    def check(self, free_only=False):
+        """
+        检查并点击允许弹出的系统弹窗
+        :param free_only: 只在页面快照仍然有效（检查不需要额外请求）时检查
+        :return: 是否点击了弹窗
+        """
+        now = time.time()
+        if not self._mobile.snapshot.is_fresh:
+            if free_only or now - self._last_check_at < self.interval:
+                return False
+        self._last_check_at = now
+        self.check_count += 1
+        accepted = False
+        for _ in range(self.MAX_ACCEPT_TIMES):
+            signature = self._detect()
+            if signature is None or not self._accept(signature):
+                break
+            self.fired[signature.name] = self.fired.get(signature.name, 0) + 1
+            accepted = True
+        return accepted
+
+    def _detect(self):
+        for signature in self._mobile.permission_dialog_signatures():
+            nodes = self._mobile.snapshot.find(signature.detect_locator)
+            if nodes is None:
+                nodes = self._mobile.get_elements(signature.detect_locator)
+            if len(nodes) >= signature.min_count:
+                return signature
+        return None
+
+    def _accept(self, signature):
+        buttons = self._mobile.get_elements(signature.accept_locator)
+        if buttons:
+            buttons[0].click()
+            return True
+        try:
+            self._mobile.driver.switch_to.alert.accept()
+            return True
+        except:
+            return False
+
+    def drain(self):
+        """取出并清空统计结果（并行执行时由工作进程交给调度进程合并）"""
+        result = (self.check_count, self.fired)
+        self.check_count = 0
+        self.fired = {}
+        return result
+
+    def merge(self, drained):
+        check_count, fired = drained
+        self.check_count += check_count
+        for name, count in fired.items():
+            self.fired[name] = self.fired.get(name, 0) + count
+
+    def report(self):
+        lines = ['权限弹窗检查次数：{}，点击次数：{}'.format(self.check_count, self.fire_count)]
+        for name, count in sorted(self.fired.items(), key=lambda i: i[1], reverse=True):
+            lines.append('    {}: {}'.format(name, count))
+        return '\n'.join(lines)
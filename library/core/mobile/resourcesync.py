@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
+import tarfile
+import uuid
+from collections import OrderedDict, namedtuple
+
+# 同步结果：pushed 为推送的文件（相对路径），skipped 为手机上已经相同而跳过的文件数量，failed 为推送后校验失败的文件
+SyncResult = namedtuple('SyncResult', ['pushed', 'skipped', 'failed'])
+
+_MD5_LINE = re.compile(r'^\\?([0-9a-fA-F]{32})\s+\*?(.+)$')
+
+
+def _normalize(path):
+    return path[2:] if path.startswith('./') else path
+
+
+def _is_same(remote_entry, size, md5):
+    """手机上的文件与本地是否相同（手机不支持 stat -c 时只比较 md5）"""
+    if remote_entry is None:
+        return False
+    remote_size, remote_md5 = remote_entry
+    return remote_md5 == md5 and remote_size in (None, size)
+
+
+class LocalManifest(object):
+    """
+    本地文件清单：{相对路径: (本地路径, 大小, md5)}
+    md5 按 (大小, 修改时间) 缓存到 cache_path，文件没有变化时不再重新读取
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self._cache = None
+        self._dirty = False
+
+    def _load(self):
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path and os.path.isfile(self.cache_path):
+                try:
+                    with open(self.cache_path, 'r', encoding='UTF-8') as f:
+                        self._cache = json.load(f)
+                except (OSError, ValueError):
+                    self._cache = {}
+        return self._cache
+
+    def save(self):
+        if not self._dirty or not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, 'w', encoding='UTF-8') as f:
+            json.dump(self._cache, f, ensure_ascii=False, indent=2)
+        self._dirty = False
+
+    def get_md5(self, path):
+        """文件的大小与 md5（大小、修改时间与缓存一致时直接使用缓存）"""
+        cache = self._load()
+        stat = os.stat(path)
+        entry = cache.get(path)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime_ns:
+            return stat.st_size, entry['md5']
+        md5 = hashlib.md5()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                md5.update(chunk)
+        cache[path] = dict(size=stat.st_size, mtime=stat.st_mtime_ns, md5=md5.hexdigest())
+        self._dirty = True
+        return stat.st_size, cache[path]['md5']
+
+    def scan(self, local_path, name):
+        """
+        :param local_path: 本地文件或者文件夹
+        :param name: 推送到手机上的名称（相对路径的第一级）
+        :return: OrderedDict {相对路径: (本地路径, 大小, md5)}
+        """
+        local_path = os.path.abspath(local_path)
+        files = []
+        if os.path.isfile(local_path):
+            files.append((name, local_path))
+        else:
+            for root, dirs, names in os.walk(local_path):
+                dirs.sort()
+                relative = os.path.relpath(root, local_path)
+                parts = [name] if relative == '.' else [name] + relative.split(os.sep)
+                for file_name in sorted(names):
+                    files.append((posixpath.join(*(parts + [file_name])), os.path.join(root, file_name)))
+        manifest = OrderedDict()
+        for relative, path in files:
+            size, md5 = self.get_md5(path)
+            manifest[relative] = (path, size, md5)
+        self.save()
+        return manifest
+
+
+class ResourceSync(object):
+    """
+    增量推送文件（夹）到手机：
+        1、本地清单（路径、大小、md5）按修改时间缓存；
+        2、一次 shell 请求获取手机上的清单（md5sum、stat）；
+        3、只推送大小或 md5 不一致的文件，多个文件时打包成一个 tar 推送后在手机上解压，
+           手机不支持 tar 时退回到逐个推送；
+        4、推送后再获取一次手机清单校验。
+    手机上已经是相同文件时不传输任何内容。
+    """
+
+    REMOTE_DIR = '/data/local/tmp'
+
+    def __init__(self, mobile, manifest_cache_path=None):
+        self._mobile = mobile
+        self.local = LocalManifest(manifest_cache_path)
+
+    def get_remote_manifest(self, to_path, name):
+        """
+        手机上的文件清单
+        :return: {相对路径: (大小, md5)}；目录不存在时返回空字典
+        """
+        find = 'cd "{}" && find "{}" -type f -exec {} {{}} +'
+        md5_result, stat_result = self._mobile.execute_shell_batch([
+            find.format(to_path, name, 'md5sum'),
+            find.format(to_path, name, 'stat -c "%s %n"'),
+        ])
+        sizes = {}
+        for line in (stat_result.output or '').splitlines():
+            size, _, path = line.partition(' ')
+            if size.isdigit():
+                sizes[_normalize(path)] = int(size)
+        manifest = {}
+        for line in (md5_result.output or '').splitlines():
+            match = _MD5_LINE.match(line.strip())
+            if match:
+                path = _normalize(match.group(2))
+                manifest[path] = (sizes.get(path), match.group(1).lower())
+        return manifest
+
+    def _push_files(self, to_path, files):
+        """逐个推送文件（一次请求创建所有目录）"""
+        directories = sorted({posixpath.dirname(posixpath.join(to_path, relative)) for relative in files})
+        self._mobile.execute_shell_batch(['mkdir -p "{}"'.format(d) for d in directories])
+        for relative, path in files.items():
+            with open(path, 'rb') as f:
+                content = str(base64.b64encode(f.read()), 'UTF-8')
+            self._mobile.driver.push_file(posixpath.join(to_path, relative), content)
+
+    def _push_archive(self, to_path, files):
+        """
+        打包成一个 tar 推送后在手机上解压
+        :return: 是否解压成功
+        """
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w', format=tarfile.GNU_FORMAT, encoding='UTF-8') as tar:
+            for relative, path in files.items():
+                tar.add(path, arcname=relative, recursive=False)
+        remote = '{}/resource_sync.{}.tar'.format(self.REMOTE_DIR, uuid.uuid4().hex)
+        self._mobile.driver.push_file(remote, str(base64.b64encode(buffer.getvalue()), 'UTF-8'))
+        _, extract, _ = self._mobile.execute_shell_batch([
+            'mkdir -p "{}"'.format(to_path),
+            'tar -xf "{}" -C "{}"'.format(remote, to_path),
+            'rm -f "{}"'.format(remote),
+        ])
+        return extract.exit_code == 0
+
+    def sync(self, local_path, to_path, name=None, force=False, archive=True):
+        """
+        :param local_path: 本地文件或者文件夹
+        :param to_path: 手机上的父目录
+        :param name: 推送到手机上的名称，默认与本地相同
+        :param force: 是否忽略手机上的清单，全部推送
+        :param archive: 多个文件需要推送时是否打包成 tar 推送
+        :return: SyncResult
+        """
+        to_path = to_path.rstrip('/') or '/'
+        name = name or os.path.basename(os.path.abspath(local_path))
+        local = self.local.scan(local_path, name)
+        remote = {} if force else self.get_remote_manifest(to_path, name)
+        changed = OrderedDict((relative, path) for relative, (path, size, md5) in local.items()
+                              if not _is_same(remote.get(relative), size, md5))
+        if not changed:
+            return SyncResult([], len(local), [])
+        if not (archive and len(changed) > 1 and self._push_archive(to_path, changed)):
+            self._push_files(to_path, changed)
+        remote = self.get_remote_manifest(to_path, name)
+        failed = [relative for relative in changed if not _is_same(remote.get(relative), *local[relative][1:])]
+        return SyncResult(list(changed), len(local) - len(changed), failed)
@@ -0,0 +1,119 @@
+import functools
+import hashlib
+import io
+import re
+import time
+
+from library.core.mobile.uisnapshot import READ_ONLY_COMMANDS
+
+
+class ScreenshotCache(object):
+    """
+    截图缓存：每个界面状态只截取一次全屏截图并解码一次，
+    之后的颜色取样都按元素的 bounds 在这张截图上计算，不再逐个元素截图。
+
+    与 UiSnapshot 一样，截图在以下情况失效：
+        1、执行了任何可能改变界面的命令（见 READ_ONLY_COMMANDS）；
+        2、截图存在时间超过 max_age 秒；
+        3、显式调用 invalidate()。
+    """
+
+    DEFAULT_MAX_AGE = 1.0
+
+    def __init__(self, mobile, max_age=DEFAULT_MAX_AGE):
+        self._mobile = mobile
+        self.max_age = max_age
+        self._images = {}
+        self._digest = None
+        self._taken_at = 0
+        self._scale = None
+        self.capture_count = 0
+        self.hit_count = 0
+
+    def invalidate(self):
+        """使当前截图失效"""
+        self._images = {}
+
+    @property
+    def is_fresh(self):
+        if not self._images:
+            return False
+        return time.time() - self._taken_at <= self.max_age
+
+    def install(self, driver):
+        """拦截 driver 的所有命令，遇到会改变界面状态的命令时使截图失效"""
+        execute = driver.execute
+        this = self
+
+        @functools.wraps(execute)
+        def wrapper(driver_command, params=None):
+            if driver_command not in READ_ONLY_COMMANDS:
+                this.invalidate()
+            return execute(driver_command, params)
+
+        driver.execute = wrapper
+        self._scale = None
+        self.invalidate()
+
+    def get_image(self, mode='RGBA'):
+        """当前界面的全屏截图（PIL Image，按颜色模式缓存转换结果）"""
+        from PIL import Image
+
+        if self.is_fresh:
+            self.hit_count += 1
+        else:
+            png = self._mobile.driver.get_screenshot_as_png()
+            with Image.open(io.BytesIO(png)) as img:
+                img.load()
+                self._images = {None: img.copy()}
+            self._digest = hashlib.md5(png).hexdigest()
+            self._taken_at = time.time()
+            self.capture_count += 1
+        if mode not in self._images:
+            self._images[mode] = self._images[None].convert(mode)
+        return self._images[mode]
+
+    @property
+    def digest(self):
+        """当前截图的 md5（必要时重新截图）"""
+        self.get_image()
+        return self._digest
+
+    def get_scale(self):
+        """截图像素与元素坐标的比例（iOS 的元素坐标单位是点，Android 一般为 1）"""
+        if self._scale is None:
+            width = self._mobile.driver.get_window_size()['width']
+            self._scale = self.get_image().width / width if width else 1
+        return self._scale
+
+    @staticmethod
+    def parse_bounds(bounds):
+        """page_source 中的 bounds（[x1,y1][x2,y2]）转换为 (x, y, width, height)，无法解析时返回 None"""
+        numbers = [int(n) for n in re.findall(r'-?\d+', bounds or '')]
+        if len(numbers) != 4:
+            return None
+        return numbers[0], numbers[1], numbers[2] - numbers[0], numbers[3] - numbers[1]
+
+    def get_color(self, rect, x, y, by_percent=False, mode='RGBA'):
+        """
+        以元素左上角为坐标原点, 获取元素相对坐标颜色
+        :param rect: 元素区域 (x, y, width, height)
+        :param x: x 轴坐标/百分比
+        :param y: y 轴坐标/百分比
+        :param by_percent: 是否切换成百分比模式定位
+        :param mode: 颜色模式（RGBA、RGB、CMYK..)
+        :return:
+        """
+        image = self.get_image(mode)
+        scale = self.get_scale()
+        left, top = int(rect[0] * scale), int(rect[1] * scale)
+        width, height = max(int(rect[2] * scale), 1), max(int(rect[3] * scale), 1)
+        if by_percent:
+            x = width * (x / 100)
+            y = height * (y / 100)
+        else:
+            x, y = x * scale, y * scale
+        # 与元素截图一致：坐标限制在元素区域与屏幕之内
+        px = min(max(left + int(x), left), left + width - 1, image.width - 1)
+        py = min(max(top + int(y), top), top + height - 1, image.height - 1)
+        return image.getpixel((max(px, 0), max(py, 0)))
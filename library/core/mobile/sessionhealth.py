@@ -0,0 +1,89 @@
+import functools
+import time
+
+
+class SessionHealth(object):
+    """
+    会话健康状态：
+        1、会话创建时缓存 capabilities 与平台名，判断平台时不再访问服务端；
+        2、任何命令执行成功都视为会话存活，ttl 秒内没有成功的命令时才发起一次轻量探测
+           （Android 使用 current_package，其它平台使用 getSession）；
+        3、命令抛出异常时使存活状态失效，下一次判断时重新探测。
+    """
+
+    DEFAULT_TTL = 10
+
+    def __init__(self, mobile, ttl=DEFAULT_TTL):
+        self._mobile = mobile
+        self.ttl = ttl
+        self._capabilities = None
+        self._platform = None
+        self._last_alive_at = None
+        self.probe_count = 0
+
+    @property
+    def capabilities(self):
+        """会话创建时服务端返回的 capabilities"""
+        return self._capabilities
+
+    @property
+    def platform(self):
+        """会话的平台名（小写），未创建会话时返回 None"""
+        return self._platform
+
+    def install(self, driver):
+        """缓存新会话的信息，并拦截 driver 的命令以维护存活状态"""
+        self._capabilities = dict(driver.desired_capabilities or {})
+        platform_name = self._capabilities.get('platformName')
+        self._platform = platform_name.lower() if platform_name else None
+        self.touch()
+
+        execute = driver.execute
+        this = self
+
+        @functools.wraps(execute)
+        def wrapper(driver_command, params=None):
+            try:
+                result = execute(driver_command, params)
+            except Exception:
+                this.invalidate()
+                raise
+            this.touch()
+            return result
+
+        driver.execute = wrapper
+
+    def touch(self):
+        """标记会话刚刚确认存活"""
+        self._last_alive_at = time.time()
+
+    def invalidate(self):
+        """使存活状态失效，下一次判断时重新探测"""
+        self._last_alive_at = None
+
+    def reset(self):
+        """会话已关闭，清空缓存的会话信息"""
+        self._capabilities = None
+        self._platform = None
+        self._last_alive_at = None
+
+    def is_alive(self):
+        driver = self._mobile.driver
+        if driver is None or self._capabilities is None:
+            return False
+        if self._last_alive_at is not None and time.time() - self._last_alive_at <= self.ttl:
+            return True
+        return self.probe()
+
+    def probe(self):
+        """发起一次轻量的存活探测"""
+        driver = self._mobile.driver
+        self.probe_count += 1
+        try:
+            if self._platform == 'android':
+                driver.current_package
+            else:
+                driver.execute('getSession')
+            return True
+        except Exception:  # InvalidSessionIdException or WebDriverException:
+            return False
@@ -0,0 +1,47 @@
+import re
+import uuid
+from collections import namedtuple
+
+# 批量执行shell命令时单条命令的结果
+ShellResult = namedtuple('ShellResult', ['command', 'output', 'exit_code'])
+
+
+def normalize_shell_commands(commands):
+    """把 (command, *args) 形式的命令拼接成字符串"""
+    lines = []
+    for command in commands:
+        if isinstance(command, (list, tuple)):
+            command = ' '.join(str(part) for part in command)
+        lines.append(command)
+    return lines
+
+
+def new_shell_batch_marker():
+    return '__SHELL_BATCH_{}__'.format(uuid.uuid4().hex)
+
+
+def build_shell_batch_script(lines, marker):
+    """每条命令后面输出一行 marker:序号:退出码"""
+    return ' ; '.join(
+        "{} ; printf '\\n%s:%s:%s\\n' {} {} $?".format(command, marker, index)
+        for index, command in enumerate(lines)
+    )
+
+
+def parse_shell_batch_output(output, lines, marker):
+    """
+    按 marker 切分批量命令的输出
+    appium 会 trim mobile:shell 的输出，所以第一个 marker 前面的换行、最后一个 marker 后面的换行可能已经不存在
+    :return: ShellResult 列表，没有找到 marker 的命令 output、exit_code 为 None
+    """
+    output = (output or '').replace('\r\n', '\n')
+    results = []
+    position = 0
+    for index, command in enumerate(lines):
+        match = re.compile(r'(?:^|\n){}:{}:(\d+)(?:\n|$)'.format(marker, index)).search(output, position)
+        if match is None:
+            results.append(ShellResult(command, None, None))
+            continue
+        results.append(ShellResult(command, output[position:match.start()], int(match.group(1))))
+        position = match.end()
+    return results
@@ -0,0 +1,106 @@
+import threading
+import time
+from urllib import parse
+
+import urllib3
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+
+# 同一个 appium hub 上的所有手机共用一个连接池，键为 (scheme, netloc)
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_shared_pool(url, pool_size, max_retries, timeout):
+    """
+    获取（或创建）指定 hub 的共享连接池
+    :param url: appium server 地址
+    :param pool_size: 每个 hub 保持的最大连接数（以第一次创建时的参数为准）
+    :param max_retries: 连接失败、以及幂等命令（GET/DELETE等）读取失败时的重试次数
+    :param timeout: socket 超时时间
+    :return: urllib3.PoolManager
+    """
+    parsed = parse.urlparse(url)
+    key = (parsed.scheme, parsed.netloc)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            retries = urllib3.Retry(total=None, connect=max_retries, read=max_retries, redirect=5)
+            pool = urllib3.PoolManager(num_pools=1, maxsize=pool_size, block=False, timeout=timeout,
+                                       retries=retries)
+            _POOLS[key] = pool
+        return pool
+
+
+class CommandLatency(object):
+    """按 WebDriver 命令统计调用次数和耗时"""
+
+    def __init__(self):
+        self._records = {}
+
+    def record(self, command, elapsed):
+        count, total, maximum = self._records.get(command, (0, 0.0, 0.0))
+        self._records[command] = (count + 1, total + elapsed, max(maximum, elapsed))
+
+    def clear(self):
+        self._records.clear()
+
+    def drain(self):
+        """取出并清空统计结果（并行执行时由工作进程交给调度进程合并）"""
+        records = dict(self._records)
+        self.clear()
+        return records
+
+    def merge(self, records):
+        for command, (count, total, maximum) in records.items():
+            total_count, total_time, total_max = self._records.get(command, (0, 0.0, 0.0))
+            self._records[command] = (total_count + count, total_time + total, max(total_max, maximum))
+
+    @property
+    def total_count(self):
+        return sum(r[0] for r in self._records.values())
+
+    @property
+    def total_time(self):
+        return sum(r[1] for r in self._records.values())
+
+    def items(self):
+        """[(命令, 次数, 总耗时, 平均耗时, 最大耗时)]，按总耗时降序"""
+        result = [(command, count, total, total / count, maximum)
+                  for command, (count, total, maximum) in self._records.items()]
+        result.sort(key=lambda r: r[2], reverse=True)
+        return result
+
+    def report(self, title=''):
+        lines = ['{:<32}{:>8}{:>12}{:>12}{:>12}'.format(title or 'Command', 'Count', 'Total(s)', 'Avg(ms)',
+                                                         'Max(ms)')]
+        for command, count, total, avg, maximum in self.items():
+            lines.append('{:<32}{:>8}{:>12.3f}{:>12.1f}{:>12.1f}'.format(command, count, total, avg * 1000,
+                                                                         maximum * 1000))
+        lines.append('{:<32}{:>8}{:>12.3f}'.format('TOTAL', self.total_count, self.total_time))
+        return '\n'.join(lines)
+
+
+class PooledConnection(RemoteConnection):
+    """
+    使用共享 keep-alive 连接池的 appium 连接：
+        1、同一个 hub 上的手机复用 TCP 连接，避免每个命令重新建立连接；
+        2、连接失败与幂等命令读取失败时自动重试；
+        3、记录每个命令的耗时。
+    """
+
+    DEFAULT_POOL_SIZE = 4
+    DEFAULT_MAX_RETRIES = 2
+
+    def __init__(self, remote_server_addr, pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES, device=None):
+        super(PooledConnection, self).__init__(remote_server_addr, keep_alive=True, resolve_ip=False)
+        self._conn = get_shared_pool(remote_server_addr, pool_size, max_retries, self._timeout)
+        self.latency = CommandLatency()
+        self.device = device
+
+    def execute(self, command, params):
+        start = time.time()
+        try:
+            return super(PooledConnection, self).execute(command, params)
+        finally:
+            self.latency.record(command, time.time() - start)
@@ -0,0 +1,163 @@
+import functools
+import time
+from unicodedata import normalize
+
+from lxml import etree
+
+# 不会改变界面状态的 WebDriver 命令，执行这些命令时不需要让页面快照失效
+READ_ONLY_COMMANDS = frozenset([
+    'getPageSource',
+    'findElement',
+    'findElements',
+    'findChildElement',
+    'findChildElements',
+    'getElementText',
+    'getElementAttribute',
+    'getElementProperty',
+    'getElementTagName',
+    'getElementLocation',
+    'getElementSize',
+    'getElementRect',
+    'isElementDisplayed',
+    'isElementEnabled',
+    'isElementSelected',
+    'screenshot',
+    'elementScreenshot',
+    'getWindowSize',
+    'getWindowRect',
+    'getCurrentActivity',
+    'getCurrentPackage',
+    'getNetworkConnection',
+    'isKeyboardShown',
+    'getSession',
+    'status',
+    'getAlertText',
+])
+
+
+class UiSnapshot(object):
+    """
+    页面快照：每个界面状态只获取一次 page_source，之后的 ID/XPath/文本 查询都在本地用 lxml 求值。
+
+    快照在以下情况失效：
+        1、执行了任何可能改变界面的命令（点击、输入、滑动、返回等，见 READ_ONLY_COMMANDS）；
+        2、快照存在时间超过 max_age 秒（界面可能自己发生了变化，例如加载完成、收到消息）；
+        3、显式调用 invalidate()（例如 wait_until 每次轮询之前）。
+
+    无法在本地求值的定位器（accessibility id、uiautomator 等）返回 None，由调用方回退到服务端查询。
+    """
+
+    DEFAULT_MAX_AGE = 1.0
+
+    def __init__(self, mobile, max_age=DEFAULT_MAX_AGE):
+        self._mobile = mobile
+        self.max_age = max_age
+        self._source = None
+        self._tree = None
+        self._taken_at = 0
+        self.enabled = False
+        self.fetch_count = 0
+        self.hit_count = 0
+
+    def invalidate(self):
+        """使当前快照失效"""
+        self._source = None
+        self._tree = None
+
+    @property
+    def is_fresh(self):
+        if self._source is None:
+            return False
+        return time.time() - self._taken_at <= self.max_age
+
+    @property
+    def source(self):
+        """当前界面的 page_source（必要时重新获取）"""
+        if self.is_fresh:
+            self.hit_count += 1
+        else:
+            self._source = self._mobile.driver.page_source
+            self._tree = None
+            self._taken_at = time.time()
+            self.fetch_count += 1
+        return self._source
+
+    @property
+    def tree(self):
+        """当前界面 DOM 的 lxml 根节点"""
+        source = self.source
+        if self._tree is None:
+            parser = etree.XMLParser(recover=True, huge_tree=True)
+            self._tree = etree.fromstring(source.encode('UTF-8'), parser)
+        return self._tree
+
+    def install(self, driver):
+        """拦截 driver 的所有命令，遇到会改变界面状态的命令时使快照失效"""
+        execute = driver.execute
+        this = self
+
+        @functools.wraps(execute)
+        def wrapper(driver_command, params=None):
+            if driver_command not in READ_ONLY_COMMANDS:
+                this.invalidate()
+            return execute(driver_command, params)
+
+        driver.execute = wrapper
+        # 只有 Android 的 page_source 与服务端定位使用同一套属性（resource-id、text 等）
+        platform_name = driver.desired_capabilities.get('platformName') or ''
+        self.enabled = platform_name.lower() == 'android'
+        self.invalidate()
+
+    def find(self, locator):
+        """
+        在本地快照中查找节点
+        :param locator: 定位器
+        :return: lxml 节点列表；定位方式不支持本地求值时返回 None
+        """
+        if not self.enabled:
+            return None
+        by, value = locator[0], locator[1]
+        if by == 'xpath':
+            xpath = value
+        elif by == 'id':
+            if ':id/' in value:
+                xpath = '//*[@resource-id="{}"]'.format(value)
+            else:
+                xpath = '//*[@resource-id="{0}" or substring(@resource-id, string-length(@resource-id) - ' \
+                        'string-length(":id/{0}") + 1) = ":id/{0}"]'.format(value)
+        elif by == 'class name':
+            xpath = '//{}'.format(value)
+        else:
+            return None
+        try:
+            result = self.tree.xpath(xpath)
+        except (etree.XPathError, ValueError):
+            return None
+        if not isinstance(result, list):
+            return None
+        return [node for node in result if isinstance(node, etree._Element)]
+
+    def is_element_present(self, locator):
+        nodes = self.find(locator)
+        if nodes is None:
+            return None
+        return len(nodes) > 0
+
+    def is_visible(self, locator):
+        nodes = self.find(locator)
+        if nodes is None:
+            return None
+        if not nodes:
+            return False
+        return nodes[0].get('displayed', 'true').lower() == 'true'
+
+    def get_text(self, locator):
+        nodes = self.find(locator)
+        if not nodes:
+            return None
+        return nodes[0].get('text')
+
+    def is_text_present(self, text):
+        text_norm = normalize('NFD', text)
+        source_norm = normalize('NFD', self.source)
+        return text_norm in source_norm
@@ -0,0 +1,218 @@
+import json
+import os
+import time
+from collections import deque, namedtuple
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from library.core.TestLogger import TestLogger
+from library.core.utils import common
+from library.core.utils.tracing import TRACER
+
+# 单次等待的记录：条件名、用例、轮询次数、耗时（秒）、结果（success/timeout/error）
+WaitRecord = namedtuple('WaitRecord', ['name', 'test', 'attempts', 'elapsed', 'outcome'])
+
+
+def get_condition_name(condition):
+    """等待条件的名称，lambda 使用定义它的方法名，例如 MessagePage.is_on_this_page"""
+    name = getattr(condition, '__qualname__', None) or repr(condition)
+    return name.replace('.<locals>.<lambda>', '').replace('.<locals>', '')
+
+
+class FixedPolling(object):
+    """固定频率轮询（与 WebDriverWait 一致）"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+
+    def intervals(self, name):
+        while True:
+            yield self.interval
+
+    def learn(self, record):
+        pass
+
+
+class BackoffPolling(object):
+    """快速开始，之后按指数退避，直到达到最大间隔"""
+
+    def __init__(self, initial=0.1, factor=1.5, maximum=0.5):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+
+    def intervals(self, name):
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.maximum)
+
+    def learn(self, record):
+        pass
+
+
+class LearnedPolling(BackoffPolling):
+    """
+    根据同名条件的历史耗时轮询：第一次失败后直接等待到历史耗时中位数附近，之后按指数退避轮询。
+    没有历史记录的条件与 BackoffPolling 一致。
+    """
+
+    HISTORY_SIZE = 20
+
+    def __init__(self, initial=0.1, factor=1.5, maximum=0.5, history=None):
+        super(LearnedPolling, self).__init__(initial, factor, maximum)
+        self._history = {}
+        for record in history or []:
+            self.learn(record)
+
+    def expected_elapsed(self, name):
+        history = self._history.get(name)
+        if not history:
+            return None
+        ordered = sorted(history)
+        return ordered[len(ordered) // 2]
+
+    def intervals(self, name):
+        expected = self.expected_elapsed(name)
+        backoff = super(LearnedPolling, self).intervals(name)
+        if expected is not None and expected > self.initial:
+            yield expected * 0.9
+        yield from backoff
+
+    def learn(self, record):
+        if record.outcome != 'success':
+            return
+        self._history.setdefault(record.name, deque(maxlen=self.HISTORY_SIZE)).append(record.elapsed)
+
+
+class WaitTelemetry(object):
+    """记录每一次等待，用于统计哪些等待最耗时"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, record):
+        self.records.append(record)
+
+    def clear(self):
+        self.records = []
+
+    def drain(self):
+        """取出并清空已记录的等待（并行执行时由工作进程交给调度进程合并）"""
+        records, self.records = self.records, []
+        return records
+
+    def merge(self, records):
+        self.records.extend(WaitRecord(*record) for record in records)
+
+    def summary(self):
+        """[(条件名, 次数, 总耗时, 平均轮询次数, 超时次数)]，按总耗时降序"""
+        groups = {}
+        for record in self.records:
+            count, elapsed, attempts, timeouts = groups.get(record.name, (0, 0.0, 0, 0))
+            groups[record.name] = (count + 1, elapsed + record.elapsed, attempts + record.attempts,
+                                   timeouts + (record.outcome == 'timeout'))
+        result = [(name, count, elapsed, attempts / count, timeouts)
+                  for name, (count, elapsed, attempts, timeouts) in groups.items()]
+        result.sort(key=lambda r: r[2], reverse=True)
+        return result
+
+    def report(self, top=20):
+        lines = ['{:<72}{:>8}{:>12}{:>12}{:>10}'.format('Wait', 'Count', 'Total(s)', 'Attempts', 'Timeouts')]
+        for name, count, elapsed, attempts, timeouts in self.summary()[:top]:
+            lines.append('{:<72}{:>8}{:>12.2f}{:>12.1f}{:>10}'.format(name[-72:], count, elapsed, attempts, timeouts))
+        return '\n'.join(lines)
+
+    def save(self, path):
+        dir_name = os.path.dirname(path)
+        if not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+        with open(path, 'w', encoding='UTF-8') as f:
+            json.dump([record._asdict() for record in self.records], f, ensure_ascii=False, indent=1)
+
+    @staticmethod
+    def load(path):
+        """读取保存的等待记录，文件不存在或格式错误时返回空列表"""
+        try:
+            with open(path, 'r', encoding='UTF-8') as f:
+                return [WaitRecord(**item) for item in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return []
+
+
+WAIT_TELEMETRY = WaitTelemetry()
+
+
+def create_polling_strategy(name, history_path=None):
+    """
+    根据名称创建轮询策略
+    :param name: fixed / backoff / learned
+    :param history_path: learned 策略读取历史记录的文件
+    """
+    if name == 'fixed':
+        return FixedPolling()
+    elif name == 'backoff':
+        return BackoffPolling()
+    elif name == 'learned':
+        return LearnedPolling(history=WaitTelemetry.load(history_path) if history_path else None)
+    raise ValueError('不支持的轮询策略：{}'.format(name))
+
+
+class AdaptiveWait(object):
+    """
+    与 WebDriverWait 用法一致的等待，轮询间隔由轮询策略决定，并把每次等待记录到 WAIT_TELEMETRY
+    """
+
+    def __init__(self, driver, timeout, strategy, name, ignored_exceptions=None, telemetry=WAIT_TELEMETRY,
+                 device=None):
+        self._driver = driver
+        self._timeout = timeout
+        self._strategy = strategy
+        self._name = name
+        self._ignored_exceptions = (NoSuchElementException,) + tuple(ignored_exceptions or ())
+        self._telemetry = telemetry
+        self._device = device
+
+    def until(self, method, message=''):
+        return self._wait(method, message, True)
+
+    def until_not(self, method, message=''):
+        return self._wait(method, message, False)
+
+    def _wait(self, method, message, expected):
+        screen = None
+        stacktrace = None
+        attempts = 0
+        start = time.time()
+        end_time = start + self._timeout
+        intervals = self._strategy.intervals(self._name)
+        while True:
+            attempts += 1
+            try:
+                value = method(self._driver)
+                if bool(value) == expected:
+                    self._record(attempts, start, 'success')
+                    return value
+            except self._ignored_exceptions as exc:
+                if not expected:
+                    self._record(attempts, start, 'success')
+                    return True
+                screen = getattr(exc, 'screen', None)
+                stacktrace = getattr(exc, 'stacktrace', None)
+            except Exception:
+                self._record(attempts, start, 'error')
+                raise
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                break
+            time.sleep(min(next(intervals), remaining))
+        self._record(attempts, start, 'timeout')
+        raise TimeoutException(message, screen, stacktrace)
+
+    def _record(self, attempts, start, outcome):
+        end = time.time()
+        record = WaitRecord(self._name, common.get_test_id(TestLogger.current_test), attempts, end - start, outcome)
+        TRACER.complete(self._name, 'wait', start, end, self._device, dict(attempts=attempts, outcome=outcome))
+        self._strategy.learn(record)
+        if self._telemetry is not None:
+            self._telemetry.record(record)
@@ -1,14 +1,14 @@
 import os
 
 from library.core.common.supportedmodel import SupportedModel
-from mobileimplements import *
+import mobileimplements
 
 try:
     from settings.mobile_driver_mapper import MOBILE_DRIVER_CREATORS
 except ImportError as e:
     MOBILE_DRIVER_CREATORS = {
-        SupportedModel.MI6['Model']: lambda kw: MI6(**kw),
-        SupportedModel.MEIZU_PRO_6_PLUS['Model']: lambda kw: MXPro6Plus(**kw)
+        SupportedModel.MI6['Model']: lambda kw: mobileimplements.get_implementation('MI6')(**kw),
+        SupportedModel.MEIZU_PRO_6_PLUS['Model']: lambda kw: mobileimplements.get_implementation('MXPro6Plus')(**kw)
     }
 
 
@@ -33,9 +33,15 @@ class MobileFactory:
             desired_capabilities=mobile_config.get('DEFAULT_CAPABILITY'),
             browser_profile=mobile_config.get('BROWSER_PROFILE'),
             proxy=mobile_config.get('PROXY'),
-            keep_alive=mobile_config.get('KEEP_ALIVE') if 'KEEP_ALIVE' in mobile_config else False,
+            keep_alive=mobile_config.get('KEEP_ALIVE') if 'KEEP_ALIVE' in mobile_config else True,
             card_slot=mobile_config.get('CARDS')
         )
+        if 'POOL_SIZE' in mobile_config:
+            params['pool_size'] = mobile_config.get('POOL_SIZE')
+        if 'MAX_RETRIES' in mobile_config:
+            params['max_retries'] = mobile_config.get('MAX_RETRIES')
+        if 'PERMISSION_CHECK_INTERVAL' in mobile_config:
+            params['permission_check_interval'] = mobile_config.get('PERMISSION_CHECK_INTERVAL')
         mobile_model = mobile_config.get('MODEL')['Model']
         return MOBILE_DRIVER_CREATORS[mobile_model](params)
 
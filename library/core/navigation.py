@@ -0,0 +1,166 @@
+import heapq
+import itertools
+from collections import OrderedDict
+
+from library.core.TestLogger import TestLogger
+
+
+class Edge(object):
+    """页面跳转：在 source 页面执行 action 后到达 target 页面"""
+
+    def __init__(self, source, target, action, cost=1):
+        self.source = source
+        self.target = target
+        self.action = action
+        self.cost = cost
+
+    def run(self, page):
+        if callable(self.action):
+            self.action(page)
+        else:
+            getattr(page, self.action)()
+
+    def __repr__(self):
+        action = self.action if isinstance(self.action, str) else getattr(self.action, '__name__', 'action')
+        return '{}.{} -> {}'.format(self.source.__name__, action, self.target.__name__)
+
+
+class NavigationGraph(object):
+    """
+    页面导航图：
+        节点是页面类，marker 用于判断当前是否在该页面（定位器或者 callable(page)，默认使用 is_on_this_page）；
+        边是页面方法（方法名或者 callable(page)），执行后到达另一个页面。
+    navigate_to(PageClass) 先判断当前页面，再按最短路径点击过去；
+    实际到达的页面与预期不一致时（例如返回键回到了其它页面）重新判断并规划，
+    只有没有路径可以到达时才重新启动应用。
+    边必须到达确定的页面状态（例如不能是"通讯录中的第一个联系人"这种取决于数据的跳转）。
+    """
+
+    MAX_STEPS = 10
+
+    def __init__(self):
+        self._markers = OrderedDict()
+        self._edges = {}
+
+    def add_page(self, page_class, marker=None):
+        self._markers[page_class] = marker
+        self._edges.setdefault(page_class, [])
+        return page_class
+
+    def add_edge(self, source, target, action, cost=1):
+        for page_class in (source, target):
+            if page_class not in self._markers:
+                self.add_page(page_class)
+        self._edges[source].append(Edge(source, target, action, cost))
+
+    @property
+    def pages(self):
+        return list(self._markers)
+
+    def shortest_path(self, source, target):
+        """
+        Dijkstra 最短路径
+        :return: [Edge]；source 与 target 相同时返回空列表；无法到达时返回 None
+        """
+        if source is target:
+            return []
+        counter = itertools.count()
+        queue = [(0, next(counter), source, [])]
+        visited = set()
+        while queue:
+            cost, _, page_class, path = heapq.heappop(queue)
+            if page_class is target:
+                return path
+            if page_class in visited:
+                continue
+            visited.add(page_class)
+            for edge in self._edges.get(page_class, []):
+                if edge.target not in visited:
+                    heapq.heappush(queue, (cost + edge.cost, next(counter), edge.target, path + [edge]))
+        return None
+
+    def is_on_page(self, page_class):
+        marker = self._markers.get(page_class)
+        page = page_class()
+        try:
+            if marker is None:
+                return bool(page.is_on_this_page())
+            if callable(marker):
+                return bool(marker(page))
+            return bool(page._is_element_present(marker))
+        except Exception:
+            return False
+
+    @TestLogger.log('判断当前页面')
+    def current_page(self, candidates=None):
+        """
+        当前所在页面：按 ScreenClassifier 的得分（只获取一次 page_source）排序后逐个检查 marker
+        :param candidates: 优先判断的页面类
+        :return: 页面类；不在导航图中的任何页面时返回 None
+        """
+        from library.core.screenclassifier import SCREEN_CLASSIFIER, page_key
+
+        candidates = list(candidates or [])
+        try:
+            scores = dict(SCREEN_CLASSIFIER.rank())
+        except Exception:
+            scores = {}
+        pages = sorted(self._markers, key=lambda p: (p not in candidates, -scores.get(page_key(p), 0)))
+        for page_class in pages:
+            if self.is_on_page(page_class):
+                return page_class
+        return None
+
+    def wait_for_page(self, candidates=None, timeout=8):
+        """
+        等待进入导航图中的任意页面（例如应用启动过程中）
+        :return: 页面类；超时返回 None
+        """
+        from selenium.common.exceptions import TimeoutException
+        from library.core.utils.applicationcache import current_mobile
+
+        try:
+            return current_mobile().wait_until(condition=lambda d: self.current_page(candidates), timeout=timeout)
+        except TimeoutException:
+            return None
+
+    @TestLogger.log('导航到页面')
+    def navigate_to(self, target, relaunch=None, timeout=0):
+        """
+        从当前页面导航到目标页面
+        :param target: 目标页面类
+        :param relaunch: 没有路径可以到达时执行的操作（默认重新启动应用），False 表示不重新启动
+        :param timeout: 当前界面不是导航图中的页面时（例如应用还在启动），等待页面出现的秒数，重新启动应用后同样等待
+        :return: 目标页面对象；无法到达时返回 None
+        """
+        from library.core.utils.applicationcache import current_mobile
+
+        relaunched = False
+        expected = None
+        for _ in range(self.MAX_STEPS):
+            candidates = [expected, target] if expected else [target]
+            current = self.current_page(candidates)
+            if current is None and timeout:
+                current = self.wait_for_page(candidates, timeout)
+            if current is target:
+                return target()
+            path = self.shortest_path(current, target) if current is not None else None
+            if not path:
+                if relaunched or relaunch is False:
+                    return None
+                (relaunch or current_mobile().launch_app)()
+                relaunched = True
+                expected = None
+                continue
+            # 沿路径执行，到达的页面与预期不一致时重新规划
+            for edge in path:
+                edge.run(edge.source())
+                expected = edge.target
+                if not self.is_on_page(edge.target):
+                    try:
+                        edge.target().wait_for_page_load()
+                    except Exception:
+                        break
+            else:
+                return target()
+        return None
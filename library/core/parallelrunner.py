@@ -0,0 +1,268 @@
+import datetime
+import inspect
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import unittest
+from collections import OrderedDict
+from multiprocessing import util
+from unittest.suite import _ErrorHolder
+
+from library.HTMLTestRunner import HTMLTestRunner, _TestResult
+from library.core.utils.mobilemanager import BOUND_DEVICE_ENVIRON, PARALLEL_COORDINATOR_ENVIRON
+from library.core.utils.testloader import iter_tests, load_suite
+
+# 工作进程的状态：绑定的手机、按用例 id 索引的用例
+_WORKER = {}
+
+
+def split_into_units(suite):
+    """
+    把套件拆分为可以在不同手机上独立执行的单元：
+        同一个类的用例放在同一个单元（setUpClass/tearDownClass 只执行一次），
+        定义了 setUpModule/tearDownModule 的模块整个放在同一个单元
+    :return: [[用例 id, ...], ...]，单元与单元内的用例保持原来的执行顺序
+    """
+    units = OrderedDict()
+    for test in iter_tests(suite):
+        cls = test.__class__
+        module = sys.modules.get(cls.__module__)
+        if hasattr(module, 'setUpModule') or hasattr(module, 'tearDownModule'):
+            key = cls.__module__
+        else:
+            key = (cls.__module__, cls.__qualname__)
+        units.setdefault(key, []).append(test.id())
+    return list(units.values())
+
+
+def plan_units(units, estimates, workers):
+    """
+    最长处理时间优先（LPT）：预计耗时长的单元先分配，每个单元分配给预计最早空闲的工作进程
+    :param units: [[用例 id, ...], ...]
+    :param estimates: {用例 id: 预计耗时}
+    :param workers: 工作进程数量
+    :return: (按分配顺序排列的单元, 每个工作进程的预计耗时)
+    """
+    unit_estimates = [sum(estimates.get(test_id, 0) for test_id in unit) for unit in units]
+    order = sorted(range(len(units)), key=lambda i: unit_estimates[i], reverse=True)
+    loads = [0.0] * workers
+    for i in order:
+        index = loads.index(min(loads))
+        loads[index] += unit_estimates[i]
+    return [units[i] for i in order], loads
+
+
+def _get_test_file(test):
+    try:
+        return inspect.getfile(test.__class__)
+    except TypeError:
+        return None
+
+
+# 不绑定手机、初始化所有手机的工作进程（执行需要同时使用多台手机的单元）
+ALL_DEVICES = 'all'
+
+
+def _init_worker(devices, suite_paths, discovery, log_file_path, screen_shot_path, verbosity):
+    """工作进程初始化：绑定一台手机（ALL_DEVICES 表示使用所有手机）、加载用例"""
+    device = devices.get()
+    os.environ.pop(PARALLEL_COORDINATOR_ENVIRON, None)
+    if device == ALL_DEVICES:
+        os.environ.pop(BOUND_DEVICE_ENVIRON, None)
+    else:
+        os.environ[BOUND_DEVICE_ENVIRON] = device
+
+    import settings
+    from library.core.utils.logsink import LOG_SINK
+    from library.core.utils.sleepaccounting import SLEEP_ACCOUNTING
+
+    root, ext = os.path.splitext(log_file_path)
+    settings.LOG_FILE_PATH = LOG_SINK.path = '{}-{}{}'.format(root, device, ext)
+    settings.SCREEN_SHOT_PATH = screen_shot_path
+    SLEEP_ACCOUNTING.install()
+
+    _WORKER['device'] = device
+    _WORKER['verbosity'] = verbosity
+    _WORKER['tests'] = {test.id(): test for test in iter_tests(load_suite(suite_paths, discovery))}
+    # 工作进程退出时不会执行 atexit，使用 multiprocessing 的 Finalize 断开手机、写入剩余日志
+    util.Finalize(None, _finalize_worker, exitpriority=10)
+
+
+def _finalize_worker():
+    from library.core.utils.applicationcache import MOBILE_DRIVER_CACHE
+    from library.core.utils.logsink import LOG_SINK
+    for mobile in MOBILE_DRIVER_CACHE:
+        try:
+            mobile.disconnect_mobile()
+        except:
+            traceback.print_exc()
+    LOG_SINK.close()
+
+
+def _drain_telemetry():
+    from library.core.mobile.waiting import WAIT_TELEMETRY
+    from library.core.utils.applicationcache import MOBILE_DRIVER_CACHE
+    from library.core.utils.sleepaccounting import SLEEP_ACCOUNTING
+    from library.core.utils.tracing import TRACER
+    devices = {}
+    for mobile in MOBILE_DRIVER_CACHE:
+        latency = mobile.command_latency
+        devices[mobile.alis] = dict(latency=latency.drain() if latency is not None else {},
+                                    permissions=mobile.permission_watcher.drain())
+    return dict(trace=TRACER.drain(), waits=[tuple(r) for r in WAIT_TELEMETRY.drain()],
+                sleeps=SLEEP_ACCOUNTING.drain(), devices=devices)
+
+
+def _run_unit(test_ids):
+    """在工作进程中执行一个单元，返回 [(结果码, 用例 id, 输出, 异常信息)]、用例耗时与统计数据"""
+    from library.core.utils import common
+    from library.core.utils.applicationcache import MOBILE_DRIVER_CACHE
+    start = time.time()
+    tests = _WORKER['tests']
+    result = _TestResult(_WORKER['verbosity'])
+    MOBILE_DRIVER_CACHE.begin_unit()
+    unittest.TestSuite(tests[test_id] for test_id in test_ids if test_id in tests)(result)
+    common.flush_log_file()
+    results = [(n, t.id(), o, e) for n, t, o, e in result.result]
+    for test_id in test_ids:
+        if test_id not in tests:
+            results.append((2, test_id, '', '工作进程（{}）中找不到用例：{}'.format(_WORKER['device'], test_id)))
+    return dict(device=_WORKER['device'], unit=list(test_ids), results=results, durations=result.durations,
+                elapsed=time.time() - start, multi_device=MOBILE_DRIVER_CACHE.multi_device_requested,
+                requested_device=MOBILE_DRIVER_CACHE.requested_device, telemetry=_drain_telemetry())
+
+
+class ParallelHTMLTestRunner(HTMLTestRunner):
+    """
+    多手机并行执行用例：
+        1、每台手机对应一个工作进程，工作进程中只初始化这台手机，一个单元选择的手机都切换到这台手机；
+           单元选择的第一台手机与这台手机卡类型不同时，丢弃该单元的结果，
+           所有并行单元执行完后，在绑定了选择的手机的工作进程中重新执行；
+        2、按类（或者定义了模块级 fixture 的模块）把用例分配给空闲的工作进程，
+           提供了 timing_store 时按历史耗时从长到短分配（LPT），并输出预计与实际的最长执行时间（makespan）；
+        3、单元选择了第二台手机（需要同时操作多台手机）时，丢弃该单元的结果，
+           所有并行单元执行完后，在一个使用所有手机的工作进程中重新依次执行这些单元；
+        4、各进程的结果、用例耗时、trace、等待与 sleep 统计、每台手机的命令耗时与权限弹窗统计合并后生成一份报告。
+    工作进程按 suite_paths、discovery 重新加载用例，用例通过 id 对应。
+    """
+
+    def __init__(self, devices, suite_paths=None, stream=sys.stdout, verbosity=1, title=None, description=None,
+                 tester=None, timing_store=None, discovery=None):
+        super(ParallelHTMLTestRunner, self).__init__(stream, verbosity, title, description, tester)
+        self.devices = list(devices)
+        self.suite_paths = suite_paths
+        self.discovery = discovery
+        self.timing_store = timing_store
+        self.predicted_loads = None
+        self.device_busy = {}
+        self.device_stats = OrderedDict()
+        self.multi_device_units = []
+        self.mismatched_units = OrderedDict()
+
+    def run(self, test):
+        "Run the given test case or test suite."
+        units = self.split(test)
+        tests = {t.id(): t for t in iter_tests(test)}
+        result = _TestResult(self.verbosity)
+        context = multiprocessing.get_context('spawn')
+        self._run_pool(context, self.devices, units, result, tests)
+        mismatched_units, self.mismatched_units = self.mismatched_units, OrderedDict()
+        for device, units in mismatched_units.items():
+            print('以下单元要求的手机卡类型不同，在 {} 上重新执行：\n    {}'.format(
+                device, '\n    '.join(unit[0] for unit in units)), file=sys.stderr)
+            self._run_pool(context, [device], units, result, tests)
+        if self.multi_device_units:
+            print('以下单元需要同时使用多台手机，在所有手机上重新执行：\n    {}'.format(
+                '\n    '.join(unit[0] for unit in self.multi_device_units)), file=sys.stderr)
+            units, self.multi_device_units = self.multi_device_units, []
+            self._run_pool(context, [ALL_DEVICES], units, result, tests)
+        self.stopTime = datetime.datetime.now()
+        self.generateReport(test, result)
+        print('\nTime Elapsed: %s' % (self.stopTime - self.startTime), file=sys.stderr)
+        print(self.makespan_report(), file=sys.stderr)
+        return result
+
+    def _run_pool(self, context, devices, units, result, tests):
+        import settings
+        queue = context.Queue()
+        for device in devices:
+            queue.put(device)
+        pool = context.Pool(len(devices), _init_worker,
+                            (queue, self.suite_paths, self.discovery, settings.LOG_FILE_PATH,
+                             settings.SCREEN_SHOT_PATH, self.verbosity))
+        try:
+            for unit_result in pool.imap_unordered(_run_unit, units):
+                self._merge(result, unit_result, tests)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    def split(self, test):
+        """拆分执行单元，按分配的先后顺序返回"""
+        units = split_into_units(test)
+        if self.timing_store is None:
+            return units
+        estimates = self.timing_store.estimate([(t.id(), _get_test_file(t)) for t in iter_tests(test)])
+        units, self.predicted_loads = plan_units(units, estimates, len(self.devices))
+        return units
+
+    def makespan_report(self):
+        """预计与实际的最长执行时间，以及每台手机的实际执行时间"""
+        lines = []
+        if self.predicted_loads is not None:
+            lines.append('预计 makespan：{:.1f}s（{}）'.format(
+                max(self.predicted_loads), ', '.join('{:.1f}s'.format(load) for load in self.predicted_loads)))
+        if self.device_busy:
+            lines.append('实际 makespan：{:.1f}s（{}）'.format(
+                max(self.device_busy.values()),
+                ', '.join('{}: {:.1f}s'.format(device, busy) for device, busy in self.device_busy.items())))
+        return '\n'.join(lines)
+
+    def device_report(self):
+        """每台手机的 WebDriver 命令耗时统计、权限弹窗统计"""
+        lines = []
+        for device, (latency, permissions) in self.device_stats.items():
+            lines.append(latency.report(device))
+            lines.append(permissions.report())
+        return '\n'.join(lines)
+
+    def _merge(self, result, unit_result, tests):
+        from library.core.mobile.waiting import WAIT_TELEMETRY
+        from library.core.utils.sleepaccounting import SLEEP_ACCOUNTING
+        from library.core.mobile.permissionwatcher import PermissionWatcher
+        from library.core.mobile.transport import CommandLatency
+        from library.core.utils.tracing import TRACER
+        telemetry = unit_result['telemetry']
+        TRACER.merge(telemetry['trace'])
+        WAIT_TELEMETRY.merge(telemetry['waits'])
+        SLEEP_ACCOUNTING.merge(telemetry['sleeps'])
+        for device, stats in telemetry['devices'].items():
+            if device not in self.device_stats:
+                self.device_stats[device] = (CommandLatency(), PermissionWatcher(None))
+            latency, permissions = self.device_stats[device]
+            latency.merge(stats['latency'])
+            permissions.merge(stats['permissions'])
+        device = unit_result['device']
+        self.device_busy[device] = self.device_busy.get(device, 0) + unit_result['elapsed']
+        if unit_result['multi_device']:
+            # 结果作废，等所有手机空闲后重新执行
+            self.multi_device_units.append(unit_result['unit'])
+            return
+        if unit_result['requested_device'] is not None:
+            # 结果作废，在绑定了要求的手机的工作进程中重新执行
+            self.mismatched_units.setdefault(unit_result['requested_device'], []).append(unit_result['unit'])
+            return
+        for n, test_id, output, error in unit_result['results']:
+            result.result.append((n, tests.get(test_id) or _ErrorHolder(test_id), output, error))
+            if n == 0:
+                result.success_count += 1
+            elif n == 1:
+                result.failure_count += 1
+            else:
+                result.error_count += 1
+        result.durations.extend(unit_result['durations'])
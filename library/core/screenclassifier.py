@@ -0,0 +1,303 @@
+import ast
+import importlib
+import importlib.util
+import inspect
+import math
+import os
+import re
+from collections import Counter
+
+from lxml import etree
+
+from library.core.TestLogger import TestLogger
+
+_XPATH_ATTRIBUTES = re.compile(r'@(resource-id|text|content-desc)\s*=\s*["\']([^"\']+)["\']')
+_ATTRIBUTE_FEATURES = {'resource-id': 'id', 'text': 'text', 'content-desc': 'desc'}
+# 源码中定位器的 MobileBy.XXX（只需要 locator_features 处理的两种）
+_MOBILE_BY = {'ID': 'id', 'XPATH': 'xpath'}
+
+
+def _id_features(resource_id):
+    """resource-id 的特征：完整 id 以及 :id/ 后面的短 id（定位器可以省略包名）"""
+    if ':id/' in resource_id:
+        return ['id:' + resource_id, 'idshort:' + resource_id.split(':id/', 1)[1]]
+    return ['idshort:' + resource_id]
+
+
+def locator_features(locator):
+    """
+    定位器对应的特征（只处理可以在 page_source 中直接判断的 ID 以及 XPath 中的等值条件）
+    :return: ['id:xxx', 'text:xxx', ...]
+    """
+    by, value = locator[0], locator[1]
+    if by == 'id':
+        return _id_features(value)
+    if by == 'xpath' and '%' not in value and 'contains(' not in value:
+        features = []
+        for attribute, attribute_value in _XPATH_ATTRIBUTES.findall(value):
+            if attribute == 'resource-id':
+                features.extend(_id_features(attribute_value))
+            else:
+                features.append('{}:{}'.format(_ATTRIBUTE_FEATURES[attribute], attribute_value))
+        return features
+    return []
+
+
+def screen_features(tree):
+    """当前界面（lxml 根节点）中所有元素的 resource-id、text、content-desc 特征"""
+    features = set()
+    for node in tree.iter():
+        resource_id = node.get('resource-id')
+        if resource_id:
+            features.update(_id_features(resource_id))
+        text = node.get('text')
+        if text:
+            features.add('text:' + text)
+        desc = node.get('content-desc')
+        if desc:
+            features.add('desc:' + desc)
+    return features
+
+
+def get_page_locators(page_class):
+    """页面类自己定义的 __locators"""
+    locators = vars(page_class).get('_{}__locators'.format(page_class.__name__.lstrip('_')))
+    return locators if isinstance(locators, dict) else {}
+
+
+def page_key(page_class):
+    """页面的标识：模块名.类名"""
+    return '{}.{}'.format(page_class.__module__, page_class.__qualname__)
+
+
+def _load_snapshot(path):
+    if not os.path.isfile(path):
+        return None
+    parser = etree.XMLParser(recover=True, huge_tree=True)
+    try:
+        return etree.parse(path, parser).getroot()
+    except (OSError, etree.XMLSyntaxError):
+        return None
+
+
+def get_page_snapshot(page_class):
+    """页面类所在文件旁边保存的界面快照（同名 .xml），没有时返回 None"""
+    try:
+        path = inspect.getfile(page_class)
+    except TypeError:
+        return None
+    return _load_snapshot(os.path.splitext(path)[0] + '.xml')
+
+
+def _build_signature(locators, snapshot):
+    """
+    页面签名：
+        有界面快照时，使用快照中所有的 resource-id，加上定位器中出现在快照里的文本；
+        没有快照时，使用定位器中的 resource-id 与文本。
+    """
+    features = set()
+    for locator in locators:
+        if isinstance(locator, tuple) and len(locator) == 2:
+            features.update(locator_features(locator))
+    if snapshot is None:
+        return features
+    snapshot_features = screen_features(snapshot)
+    ids = {f for f in snapshot_features if f.startswith('id:') or f.startswith('idshort:')}
+    return ids | (features & snapshot_features)
+
+
+def _string(node):
+    """字符串字面量的值（Python 3.7 为 ast.Str，3.8 开始为 ast.Constant），不是字符串时返回 None"""
+    if isinstance(node, ast.Constant):
+        value = node.value
+    elif isinstance(node, getattr(ast, 'Str', ())):
+        value = node.s
+    else:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def _literal_locator(node):
+    """源码中 (MobileBy.XXX, '...') 或者 ('id', '...') 形式的定位器，其他写法返回 None"""
+    if not isinstance(node, ast.Tuple) or len(node.elts) != 2:
+        return None
+    by, value = node.elts
+    if isinstance(by, ast.Attribute) and isinstance(by.value, ast.Name) and by.value.id == 'MobileBy':
+        by = _MOBILE_BY.get(by.attr)
+    else:
+        by = _string(by)
+    value = _string(value)
+    if by is None or value is None:
+        return None
+    return by, value
+
+
+def _class_attribute(class_node, name):
+    for statement in class_node.body:
+        if isinstance(statement, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == name for target in statement.targets):
+            return statement.value
+    return None
+
+
+def read_page_signatures(path, module_name):
+    """
+    不导入模块，从源码中读取页面签名：
+        源码中定义了 __locators 的类，或者旁边有同名 .xml 快照的模块中定义的类
+    :return: {页面标识: (签名, ACTIVITY)}
+    """
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    snapshot = _load_snapshot(os.path.splitext(path)[0] + '.xml')
+    pages = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        locators = _class_attribute(node, '__locators')
+        if not isinstance(locators, ast.Dict) and snapshot is None:
+            continue
+        values = locators.values if isinstance(locators, ast.Dict) else []
+        activity = _class_attribute(node, 'ACTIVITY')
+        activity = _string(activity) if activity is not None else None
+        signature = _build_signature([_literal_locator(v) for v in values], snapshot)
+        pages['{}.{}'.format(module_name, node.name)] = (signature, activity)
+    return pages
+
+
+def get_page_signature(page_class):
+    """页面类的签名（由 __locators 与 .xml 快照生成）"""
+    return _build_signature(get_page_locators(page_class).values(), get_page_snapshot(page_class))
+
+
+class ScreenClassifier(object):
+    """
+    当前界面分类：获取一次 page_source 与 current_activity，对所有页面签名打分，
+    不需要逐个调用 is_on_this_page 等待超时；页面签名从源码中读取，只导入最匹配的页面所在的模块：
+        page_class = SCREEN_CLASSIFIER.current_page()
+        if page_class is MessagePage:
+            ...
+    打分：签名中出现在当前界面的特征的权重之和 / (签名特征的权重之和 + SMOOTHING)，
+    特征的权重为 log(1 + 页面数 / 包含该特征的页面数)，Activity 相同的页面加 ACTIVITY_BONUS。
+    """
+
+    SMOOTHING = 1.0
+    ACTIVITY_BONUS = 0.1
+    THRESHOLD = 0.5
+
+    def __init__(self, package='pages'):
+        self.package = package
+        self._signatures = {}
+        self._activities = {}
+        self._classes = {}
+        self._loaded = False
+        self._weights = None
+
+    def register(self, page_class, signature=None):
+        """注册页面（签名默认由 __locators 与 .xml 快照生成）"""
+        key = page_key(page_class)
+        self._signatures[key] = set(signature) if signature is not None else get_page_signature(page_class)
+        self._activities[key] = getattr(page_class, 'ACTIVITY', None)
+        self._classes[key] = page_class
+        self._weights = None
+
+    def load_pages(self):
+        """
+        从 package 下所有模块的源码中读取页面签名（不导入模块，见 read_page_signatures），
+        已经用 register 注册的页面不覆盖；读取失败的模块打印出来后跳过
+        """
+        self._loaded = True
+        spec = importlib.util.find_spec(self.package)
+        for directory in (spec.submodule_search_locations or []) if spec else []:
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = sorted(d for d in dirs if os.path.isfile(os.path.join(root, d, '__init__.py')))
+                relative = os.path.relpath(root, directory)
+                package = '.'.join([self.package] + ([] if relative == os.curdir else relative.split(os.sep)))
+                for name in sorted(files):
+                    if not name.endswith('.py') or name == '__init__.py':
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        pages = read_page_signatures(path, '{}.{}'.format(package, name[:-3]))
+                    except (OSError, SyntaxError, ValueError) as e:
+                        print('页面识别：读取 {} 失败：{}'.format(path, e))
+                        continue
+                    for key, (signature, activity) in pages.items():
+                        if key not in self._signatures:
+                            self._signatures[key] = signature
+                            self._activities[key] = activity
+        self._weights = None
+
+    @property
+    def signatures(self):
+        """{页面标识: 签名}"""
+        if not self._loaded:
+            self.load_pages()
+        return self._signatures
+
+    def resolve(self, key):
+        """页面标识对应的页面类（只导入该页面所在的模块），导入失败时打印出来并返回 None"""
+        if key not in self._classes:
+            module_name, _, class_name = key.rpartition('.')
+            try:
+                self._classes[key] = getattr(importlib.import_module(module_name), class_name)
+            except Exception as e:
+                print('页面识别：导入 {} 失败：{!r}'.format(key, e))
+                self._classes[key] = None
+        return self._classes[key]
+
+    def _get_weights(self):
+        if self._weights is None:
+            signatures = self.signatures
+            counts = Counter(f for signature in signatures.values() for f in signature)
+            total = len(signatures)
+            self._weights = {f: math.log(1 + total / count) for f, count in counts.items()}
+        return self._weights
+
+    def score(self, features, activity=None):
+        """
+        :param features: 当前界面的特征（screen_features）
+        :param activity: 当前 Activity
+        :return: [(页面标识, 得分)]，按得分从高到低排列，页面标识见 page_key
+        """
+        weights = self._get_weights()
+        scores = []
+        for key, signature in self.signatures.items():
+            if not signature:
+                continue
+            total = sum(weights[f] for f in signature)
+            matched = sum(weights[f] for f in signature if f in features)
+            score = matched / (total + self.SMOOTHING)
+            if activity and self._activities.get(key) == activity:
+                score += self.ACTIVITY_BONUS
+            scores.append((key, score))
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores
+
+    def rank(self, mobile=None):
+        """对当前界面打分（只获取一次 page_source）"""
+        if mobile is None:
+            from library.core.utils.applicationcache import current_mobile
+
+            mobile = current_mobile()
+        try:
+            activity = mobile.current_activity
+        except Exception:
+            activity = None
+        parser = etree.XMLParser(recover=True, huge_tree=True)
+        tree = etree.fromstring(mobile.get_source().encode('UTF-8'), parser)
+        return self.score(screen_features(tree), activity)
+
+    @TestLogger.log('识别当前页面')
+    def current_page(self, mobile=None, threshold=None):
+        """
+        当前界面最匹配的页面类
+        :return: 页面类；得分低于 threshold（默认 THRESHOLD）时返回 None
+        """
+        ranking = self.rank(mobile)
+        threshold = self.THRESHOLD if threshold is None else threshold
+        if ranking and ranking[0][1] >= threshold:
+            return self.resolve(ranking[0][0])
+        return None
+
+
+SCREEN_CLASSIFIER = ScreenClassifier()
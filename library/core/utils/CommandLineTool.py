@@ -3,6 +3,7 @@ import json
 import os
 
 from library.core.utils.testcasefilter import TEST_CASE_TAG_ENVIRON
+from library.core.utils.tracing import TRACE_ENABLED_ENVIRON, TRACER
 
 
 def parse_and_store_command_line_params():
@@ -13,6 +14,17 @@ def parse_and_store_command_line_params():
     parser.add_argument('--deviceConfig', '-d', help='手机配置名称')
     parser.add_argument('--appUrl', help='测试APP下载路径')
     parser.add_argument('--installOn', action='store_true', default=False, help='初始化运行时，是否安装应用')
+    parser.add_argument('--discovery', choices=['ast', 'import'], help='用例加载方式（默认使用配置 TEST_DISCOVERY）')
+    parser.add_argument('--order', choices=['name', 'precondition'],
+                        help='用例执行顺序（默认使用配置 TEST_ORDER），precondition 表示起始状态相同的用例排在一起')
+    parser.add_argument('--parallel', '-p', type=int, help='并行执行用例的手机数量（每台手机一个进程）')
+    parser.add_argument('--devices', nargs='+', help='并行执行使用的手机别名，all 表示全部可用手机')
+    parser.add_argument('--profile-startup', action='store_true', default=False,
+                        help='打印启动耗时（各模块导入耗时与启动各阶段耗时）')
+    parser.add_argument('--trace', action='store_true', default=False,
+                        help='记录并导出 trace（默认使用配置 TRACE_ENABLED），文件路径见配置 TRACE_PATH')
+    parser.add_argument('--skipInstallRequirements', action='store_true', default=False,
+                        help='依赖不满足时不执行 pip install（离线环境）')
     args = parser.parse_args()
     if args.include:
         include = json.dumps(args.include, ensure_ascii=False).upper()
@@ -21,4 +33,7 @@ def parse_and_store_command_line_params():
         os.environ['APP_DOWNLOAD_URL'] = args.appUrl
     if args.installOn:
         os.environ['APPIUM_INSTALL_APP_ACTION'] = 'ON'
+    if args.trace:
+        os.environ[TRACE_ENABLED_ENVIRON] = '1'
+        TRACER.enabled = True
     return args
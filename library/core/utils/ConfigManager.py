@@ -36,3 +36,63 @@ def get_test_case_root():
 
 def get_screen_shot_path():
     return settings.SCREEN_SHOT_PATH
+
+
+def get_wait_polling_strategy():
+    return getattr(settings, 'WAIT_POLLING_STRATEGY', 'backoff')
+
+
+def get_wait_telemetry_path():
+    return settings.WAIT_TELEMETRY_PATH
+
+
+def get_trace_path():
+    return settings.TRACE_PATH
+
+
+def get_test_discovery():
+    return getattr(settings, 'TEST_DISCOVERY', 'ast')
+
+
+def get_test_index_cache_path():
+    return settings.TEST_INDEX_CACHE_PATH
+
+
+def get_test_order():
+    return settings.TEST_ORDER
+
+
+def get_precondition_navigation_cost():
+    return settings.PRECONDITION_NAVIGATION_COST
+
+
+def get_timing_store_path():
+    return settings.TIMING_STORE_PATH
+
+
+def get_requirements_file_path():
+    return settings.REQUIREMENTS_FILE_PATH
+
+
+def get_requirements_stamp_path():
+    return settings.REQUIREMENTS_STAMP_PATH
+
+
+def get_install_requirements():
+    return settings.INSTALL_REQUIREMENTS
+
+
+def get_app_state_enabled():
+    return settings.APP_STATE_ENABLED
+
+
+def get_app_state_path():
+    return settings.APP_STATE_PATH
+
+
+def get_resource_manifest_path():
+    return settings.RESOURCE_MANIFEST_PATH
+
+
+def get_log_buffer_size():
+    return getattr(settings, 'LOG_BUFFER_SIZE', 8 * 1024)
@@ -13,23 +13,37 @@ _ENCODING = sys.stdin.encoding if sys.stdin.encoding else "UTF-8"
 
 
 class FlushingStringIO(StringIO, object):
+    """
+    捕获输出的缓冲区：内容达到 buffer_size 个字符或者调用 flush 时交给 flush_function 处理，
+    buffer_size 为 0 时每写入一行就处理一次。
+    flush_before 用于在处理之前先处理另一个缓冲区的内容（例如 stderr 先处理 stdout），保持两者的先后顺序。
+    """
     encoding = _ENCODING  # stdout must have encoding
 
-    def __init__(self, flush_function):
+    def __init__(self, flush_function, buffer_size=0, flush_before=None):
         super(FlushingStringIO, self).__init__()
 
         self._flush_function = flush_function
+        self._buffer_size = buffer_size
+        self._flush_before = flush_before
         self.encoding = _ENCODING
 
     def _flush_to_flush_function(self):
-        self._flush_function(self.getvalue())
-        self.seek(0)
-        self.truncate()
+        if self._flush_before is not None:
+            self._flush_before()
+        value = self.getvalue()
+        if value:
+            self._flush_function(value)
+            self.seek(0)
+            self.truncate()
 
     def write(self, str):
         super(FlushingStringIO, self).write(str)
 
-        if '\n' in str:
+        if self._buffer_size:
+            if self.tell() >= self._buffer_size:
+                self._flush_to_flush_function()
+        elif '\n' in str:
             self._flush_to_flush_function()
 
     def flush(self, *args, **kwargs):
@@ -57,13 +71,19 @@ def get_log_file():
 
 
 def write_str_to_log_file(s):
-    with get_log_file() as log_file:
-        log_file.write(s)
+    from library.core.utils.logsink import LOG_SINK
+    LOG_SINK.write(s)
 
 
 def write_lines_to_log_file(lines):
-    with get_log_file() as log_file:
-        log_file.writelines(lines)
+    from library.core.utils.logsink import LOG_SINK
+    LOG_SINK.writelines(lines)
+
+
+def flush_log_file(wait=True):
+    """把日志队列中的内容写入文件"""
+    from library.core.utils.logsink import LOG_SINK
+    LOG_SINK.flush(wait)
 
 
 def get_method_fullname(func):
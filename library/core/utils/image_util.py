@@ -1,3 +1,8 @@
+import functools
+import time
+from collections import OrderedDict
+
+import numpy as np
 from PIL import Image
 
 
@@ -33,6 +38,50 @@ def split_image(image, part_size):
     return sub_image_list
 
 
+def _load_image(image):
+    """PIL Image、numpy 数组、图片路径或文件对象统一转换为 PIL Image"""
+    if isinstance(image, Image.Image):
+        return image
+    if isinstance(image, np.ndarray):
+        return Image.fromarray(image)
+    return Image.open(image)
+
+
+@functools.lru_cache(maxsize=8)
+def _tile_index(size, part_size):
+    """每个像素所在分块的直方图起始下标（分块序号 * 768 + 通道 * 256）"""
+    pw, ph = part_size
+    w, h = size
+    assert w % pw == h % ph == 0, "error"
+    tiles = (np.arange(h) // ph)[:, None] * (w // pw) + (np.arange(w) // pw)[None, :]
+    index = tiles[:, :, None] * 768 + np.arange(3) * 256
+    index.setflags(write=False)
+    return index
+
+
+def histogram_features(image, size=(256, 256), part_size=(64, 64)):
+    """
+    分块 RGB 直方图：缩放到 size 后按 part_size 分块，每块 768 个区间（与 PIL 的 histogram 一致）
+    :return: numpy 数组 (分块数, 768)
+    """
+    pixels = np.asarray(_load_image(image).resize(size).convert("RGB"))
+    index = _tile_index(tuple(size), tuple(part_size))
+    tiles = (size[0] // part_size[0]) * (size[1] // part_size[1])
+    return np.bincount((index + pixels).ravel(), minlength=tiles * 768).reshape(tiles, 768)
+
+
+def histogram_scores(features, baselines):
+    """
+    直方图相似度（与 calculate 的算法相同：每个区间 1 - |差| / 较大值，再求平均）
+    :param features: histogram_features 的结果
+    :param baselines: 多个 histogram_features 结果叠加的数组 (N, 分块数, 768)
+    :return: numpy 数组 (N,)
+    """
+    larger = np.maximum(features, baselines)
+    data = 1 - np.abs(features - baselines) / np.maximum(larger, 1)
+    return np.where(larger > 0, data, 1).mean(axis=(-2, -1))
+
+
 def classfiy_histogram_with_split(image1, image2, size=(256, 256), part_size=(64, 64)):
     ''' 'image1' and 'image2' is a Image Object.
     You can build it by 'Image.open(path)'.
@@ -40,26 +89,140 @@ def classfiy_histogram_with_split(image1, image2, size=(256, 256), part_size=(64
     'part_size' is size of piece what the image will be divided.It's 64*64 when it default.
     This function return the similarity rate betweene 'image1' and 'image2'
     '''
-    image1 = image1.resize(size).convert("RGB")
-    sub_image1 = split_image(image1, part_size)
+    features1 = histogram_features(image1, size, part_size)
+    features2 = histogram_features(image2, size, part_size)
+    pre = round(float(histogram_scores(features1, features2[None])[0]), 3)
+    return pre
 
-    image2 = image2.resize(size).convert("RGB")
-    sub_image2 = split_image(image2, part_size)
 
-    sub_data = 0
-    for im1, im2 in zip(sub_image1, sub_image2):
-        sub_data += calculate(im1, im2)
+def _gray_pixels(image, size):
+    """缩放后的灰度图，numpy 数组 (高, 宽)"""
+    return np.asarray(_load_image(image).convert("L").resize(size, Image.BILINEAR), dtype=np.float64)
 
-    x = size[0] / part_size[0]
-    y = size[1] / part_size[1]
 
-    pre = round((sub_data / (x * y)), 3)
-    return pre
+def average_hash(image, hash_size=8):
+    """aHash：缩放到 hash_size * hash_size 的灰度图，大于平均值的像素为 1"""
+    pixels = _gray_pixels(image, (hash_size, hash_size))
+    return (pixels > pixels.mean()).ravel()
+
+
+def difference_hash(image, hash_size=8):
+    """dHash：缩放到 (hash_size + 1) * hash_size 的灰度图，比较水平相邻像素"""
+    pixels = _gray_pixels(image, (hash_size + 1, hash_size))
+    return (pixels[:, 1:] > pixels[:, :-1]).ravel()
+
+
+@functools.lru_cache(maxsize=4)
+def _dct_matrix(n):
+    """n 点 DCT-II 变换矩阵"""
+    k = np.arange(n)[:, None]
+    return np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+
+
+def perceptual_hash(image, hash_size=8, highfreq_factor=4):
+    """pHash：缩放后的灰度图做二维 DCT，取左上角 hash_size * hash_size 的低频系数，大于中位数（不含直流分量）的为 1"""
+    n = hash_size * highfreq_factor
+    matrix = _dct_matrix(n)
+    low = (matrix @ _gray_pixels(image, (n, n)) @ matrix.T)[:hash_size, :hash_size]
+    return (low > np.median(low.ravel()[1:])).ravel()
+
+
+def hamming_distance(hash1, hash2):
+    """两个哈希不同的位数"""
+    return int(np.count_nonzero(np.asarray(hash1) != np.asarray(hash2)))
+
+
+def hash_scores(features, baselines):
+    """哈希相似度：1 - 汉明距离 / 位数，返回 numpy 数组 (N,)"""
+    return 1 - np.count_nonzero(baselines != features, axis=-1) / features.size
+
 
+def ssim_features(image, size=(128, 128)):
+    """SSIM 使用缩放后的灰度图"""
+    return _gray_pixels(image, size)
 
-__all__ = [
-    classfiy_histogram_with_split
-]
+
+def _box_mean(pixels, window):
+    """最后两个维度上 window * window 窗口的均值（积分图实现，只保留完整窗口）"""
+    padding = [(0, 0)] * (pixels.ndim - 2) + [(1, 0), (1, 0)]
+    integral = np.pad(pixels, padding, mode='constant').cumsum(-2).cumsum(-1)
+    total = integral[..., window:, window:] - integral[..., :-window, window:] \
+        - integral[..., window:, :-window] + integral[..., :-window, :-window]
+    return total / (window * window)
+
+
+def ssim_scores(features, baselines, window=7, data_range=255):
+    """
+    结构相似度（SSIM，均值窗口），返回 numpy 数组 (N,)
+    :param features: ssim_features 的结果
+    :param baselines: 多个 ssim_features 结果叠加的数组 (N, 高, 宽)
+    """
+    c1 = (0.01 * data_range) ** 2
+    c2 = (0.03 * data_range) ** 2
+    mu_x = _box_mean(features, window)
+    mu_y = _box_mean(baselines, window)
+    sigma_x = _box_mean(features * features, window) - mu_x * mu_x
+    sigma_y = _box_mean(baselines * baselines, window) - mu_y * mu_y
+    sigma_xy = _box_mean(features * baselines, window) - mu_x * mu_y
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * sigma_xy + c2)) / \
+               ((mu_x * mu_x + mu_y * mu_y + c1) * (sigma_x + sigma_y + c2))
+    return ssim_map.mean(axis=(-2, -1))
+
+
+# 比较方法：名称 -> (特征提取, 相似度计算)，相似度都在 0 ~ 1 之间，越大越相似
+METHODS = {
+    'histogram': (histogram_features, histogram_scores),
+    'ahash': (average_hash, hash_scores),
+    'dhash': (difference_hash, hash_scores),
+    'phash': (perceptual_hash, hash_scores),
+    'ssim': (ssim_features, ssim_scores),
+}
+
+
+def compare(image1, image2, method='histogram', **kwargs):
+    """
+    比较两张图片的相似度
+    :param method: histogram、ahash、dhash、phash、ssim
+    :param kwargs: 特征提取的参数（例如 size、hash_size）
+    :return: 0 ~ 1
+    """
+    extract, score = METHODS[method]
+    return float(score(extract(image1, **kwargs), extract(image2, **kwargs)[None])[0])
+
+
+class ImageComparer(object):
+    """
+    一张图片与多张基准图片批量比较：基准图片的特征只提取一次，比较时一次计算所有相似度
+        comparer = ImageComparer({'表情': 'emoji.png', 'GIF': 'gif.png'}, method='phash')
+        name, score = comparer.best_match(screenshot)
+    """
+
+    def __init__(self, baselines, method='histogram', **kwargs):
+        """
+        :param baselines: {名称: 图片} 或者图片列表（名称为下标）
+        :param method: histogram、ahash、dhash、phash、ssim
+        :param kwargs: 特征提取的参数（例如 size、hash_size）
+        """
+        if not isinstance(baselines, dict):
+            baselines = OrderedDict(enumerate(baselines))
+        self.method = method
+        self.names = list(baselines)
+        self._extract, self._score = METHODS[method]
+        self._kwargs = kwargs
+        self._features = np.stack([self._extract(image, **kwargs) for image in baselines.values()])
+
+    def compare(self, image):
+        """
+        :return: [(名称, 相似度)]，顺序与基准图片一致
+        """
+        scores = self._score(self._extract(image, **self._kwargs), self._features)
+        return list(zip(self.names, scores.tolist()))
+
+    def best_match(self, image):
+        """
+        :return: (最相似的基准图片名称, 相似度)
+        """
+        return max(self.compare(image), key=lambda item: item[1])
 
 
 def get_similar_degree(fp1, fp2):
@@ -89,3 +252,44 @@ def get_pixel_point_color(fp, x, y, by_percent=False, mode='RGBA'):
             y = img.height * (y / 100)
         data = pixel_data[x, y]
         return data
+
+
+def benchmark(number=10, baselines=30):
+    """
+    与原来逐个区间循环的实现对比耗时
+    :param number: 每项重复次数
+    :param baselines: 批量比较的基准图片数量
+    :return: {项目: 单次耗时（毫秒）}
+    """
+    random = np.random.RandomState(0)
+    images = [Image.fromarray(random.randint(0, 256, (1920, 1080, 3), dtype=np.uint8)) for _ in range(2)]
+    size, part_size = (256, 256), (64, 64)
+
+    def legacy(image1, image2):
+        tiles1 = split_image(image1.resize(size).convert("RGB"), part_size)
+        tiles2 = split_image(image2.resize(size).convert("RGB"), part_size)
+        return round(sum(calculate(im1, im2) for im1, im2 in zip(tiles1, tiles2)) / len(tiles1), 3)
+
+    def timed(func, *args):
+        start = time.perf_counter()
+        for _ in range(number):
+            result = func(*args)
+        return result, (time.perf_counter() - start) / number * 1000
+
+    result = OrderedDict()
+    legacy_score, result['legacy histogram'] = timed(legacy, *images)
+    score, result['histogram'] = timed(classfiy_histogram_with_split, *images)
+    assert abs(legacy_score - score) < 1e-3, (legacy_score, score)
+    for method in ('ahash', 'dhash', 'phash', 'ssim'):
+        _, result[method] = timed(compare, images[0], images[1], method)
+    candidates = [images[i % 2] for i in range(baselines)]
+    _, result['legacy histogram x{}'.format(baselines)] = timed(
+        lambda: [legacy(images[0], candidate) for candidate in candidates])
+    comparer = ImageComparer(candidates)
+    _, result['ImageComparer histogram x{}'.format(baselines)] = timed(comparer.compare, images[0])
+    return result
+
+
+if __name__ == '__main__':
+    for name, cost in benchmark().items():
+        print('{:<36}{:>10.2f} ms'.format(name, cost))
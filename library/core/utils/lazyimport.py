@@ -0,0 +1,32 @@
+import importlib
+import sys
+
+
+def lazy_imports(package, mapping):
+    """
+    包的延迟导入：第一次访问属性时才导入定义它的模块
+        __getattr__, __dir__ = lazy_imports(__name__, {'MessagePage': '.message'})
+    :param package: 包名（__name__）
+    :param mapping: {属性名: 定义该属性的模块（相对于包的模块名）}
+    :return: 模块级的 __getattr__ 与 __dir__
+    """
+
+    def __getattr__(name):
+        if name not in mapping:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(package, name))
+        value = resolve(package, mapping, name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(mapping))
+
+    return __getattr__, __dir__
+
+
+def resolve(package, mapping, name):
+    """
+    从定义属性的模块中取出属性，不经过包的属性
+    （子模块与属性同名时，import 子模块之后包的同名属性会被替换为子模块）
+    """
+    return getattr(importlib.import_module(mapping[name], package), name)
@@ -0,0 +1,159 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+import settings
+
+
+class LogSink(object):
+    """
+    异步日志文件写入：
+        1、write 只把内容放入有界队列，由后台线程写文件，队列满时 write 阻塞等待；
+        2、后台线程保持一个打开的文件句柄，缓冲的内容达到 flush_size 字节或者距上次写入超过 flush_interval 秒时写入文件；
+        3、文件超过 max_bytes 时轮转为 xxx.log.1、xxx.log.2 ...，最多保留 backup_count 个（max_bytes 为 0 时不轮转）；
+        4、进程退出时写入剩余内容并关闭文件。
+    """
+
+    def __init__(self, path, queue_size=10000, flush_size=64 * 1024, flush_interval=1.0, max_bytes=0,
+                 backup_count=5):
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue = queue.Queue(queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = []
+        self._pending_size = 0
+        self._last_flush_at = time.time()
+
+    def write(self, s):
+        if not s:
+            return
+        self._ensure_started()
+        self._queue.put(s)
+
+    def writelines(self, lines):
+        self.write(''.join(lines))
+
+    def flush(self, wait=True, timeout=None):
+        """
+        把队列中的内容写入文件
+        :param wait: 是否等待写入完成
+        :param timeout: 等待超时时间
+        """
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        if wait:
+            done.wait(timeout)
+
+    def close(self):
+        """写入剩余内容并停止后台线程"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name='LogSink', daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self):
+        while True:
+            timeout = max(self._last_flush_at + self.flush_interval - time.time(), 0) if self._pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write_pending()
+                continue
+            if item is None:
+                self._write_pending()
+                self._close_file()
+                return
+            if isinstance(item, threading.Event):
+                self._write_pending()
+                item.set()
+                continue
+            self._pending.append(item)
+            self._pending_size += len(item)
+            if self._pending_size >= self.flush_size or time.time() - self._last_flush_at >= self.flush_interval:
+                self._write_pending()
+
+    def _write_pending(self):
+        self._last_flush_at = time.time()
+        if not self._pending:
+            return
+        data = ''.join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        try:
+            log_file = self._open_file()
+            log_file.write(data)
+            log_file.flush()
+            if self.max_bytes and log_file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            # 日志写入失败不能影响用例执行
+            self._close_file()
+
+    def _open_file(self):
+        if self._file is None:
+            dir_name = os.path.dirname(self.path)
+            if dir_name and not os.path.isdir(dir_name):
+                os.makedirs(dir_name)
+            self._file = open(self.path, 'a', encoding='UTF-8')
+        return self._file
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def segments(self):
+        """日志文件以及轮转出来的文件（从旧到新）"""
+        return log_segments(self.path, self.backup_count)
+
+    def _rotate(self):
+        self._close_file()
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = '{}.{}'.format(self.path, i)
+            if os.path.exists(source):
+                os.replace(source, '{}.{}'.format(self.path, i + 1))
+        os.replace(self.path, self.path + '.1')
+
+
+def log_segments(path, backup_count):
+    """日志文件 path 以及轮转出来的 path.1、path.2 ...（从旧到新，只返回存在的文件）"""
+    paths = ['{}.{}'.format(path, i) for i in range(backup_count, 0, -1)] + [path]
+    return [p for p in paths if os.path.isfile(p)]
+
+
+LOG_SINK = LogSink(
+    settings.LOG_FILE_PATH,
+    queue_size=getattr(settings, 'LOG_QUEUE_SIZE', 10000),
+    flush_size=getattr(settings, 'LOG_FLUSH_SIZE', 64 * 1024),
+    flush_interval=getattr(settings, 'LOG_FLUSH_INTERVAL', 1.0),
+    max_bytes=getattr(settings, 'LOG_MAX_BYTES', 0),
+    backup_count=getattr(settings, 'LOG_BACKUP_COUNT', 5),
+)
+atexit.register(LOG_SINK.close)
@@ -4,20 +4,53 @@ from library.core.mobilefactory import MobileFactory
 from .connectioncache import ConnectionCache
 
 ENVIRONMENT_VARIABLE = 'AVAILABLE_DEVICES_SETTING'
+# 并行执行时，工作进程绑定的手机：只初始化这台手机，一个执行单元选择的第一台手机切换到这台手机，
+# 第一台手机与绑定的手机卡类型不同时抛出 DeviceMismatchError（该单元由调度进程在绑定了这台手机的工作进程中重新执行），
+# 再选择其他手机时抛出 MultiDeviceError（该单元由调度进程在所有手机空闲后重新执行）
+BOUND_DEVICE_ENVIRON = 'BOUND_DEVICE'
+# 并行执行时的调度进程：只加载用例、不执行用例，不需要安装应用
+PARALLEL_COORDINATOR_ENVIRON = 'PARALLEL_COORDINATOR'
+
+
+def get_devices_setting():
+    """当前使用的手机配置"""
+    from settings import available_devices
+    devices_setting_value = os.environ.get(ENVIRONMENT_VARIABLE)
+    if devices_setting_value:
+        devices_setting_value = getattr(available_devices, devices_setting_value, None)
+    else:
+        devices_setting_value = available_devices.AVAILABLE_DEVICES
+    return devices_setting_value
+
+
+class MultiDeviceError(RuntimeError):
+    """绑定了手机的工作进程中，用例需要同时使用多台手机"""
+
+
+class DeviceMismatchError(RuntimeError):
+    """绑定了手机的工作进程中，用例选择的手机与绑定的手机卡类型不同（例如运营商相关的登录用例）"""
+
+
+def get_card_types(device_setting):
+    """手机配置中的卡类型（排序后的列表）"""
+    return sorted(card.get('TYPE') for card in device_setting.get('CARDS') or [])
 
 
 class MobileManager(ConnectionCache):
     def __init__(self):
         super(MobileManager, self).__init__()
+        self.bound_device = os.environ.get(BOUND_DEVICE_ENVIRON) or None
+        # 当前执行单元切换到绑定手机的别名，是否要求过其他手机，以及要求的卡类型不同的手机
+        self._bound_alias = None
+        self.multi_device_requested = False
+        self.requested_device = None
         self.init_mobile_resource()
 
     def init_mobile_resource(self):
         from settings import available_devices
-        devices_setting_value = os.environ.get(ENVIRONMENT_VARIABLE)
-        if devices_setting_value:
-            devices_setting_value = getattr(available_devices, devices_setting_value, None)
-        else:
-            devices_setting_value = available_devices.AVAILABLE_DEVICES
+        devices_setting_value = get_devices_setting()
+        if self.bound_device is not None:
+            devices_setting_value = {self.bound_device: devices_setting_value[self.bound_device]}
         for key in devices_setting_value.keys():
             try:
                 mobile = self.get_connection(key)
@@ -35,9 +68,46 @@ class MobileManager(ConnectionCache):
                 install_flag = True
             else:
                 install_flag = available_devices.TARGET_APP.get('INSTALL_BEFORE_RUN')
-            if install_flag:
+            if install_flag and not os.environ.get(PARALLEL_COORDINATOR_ENVIRON):
                 self.try_install_app_while_register_mobile(mobile, download_url, package)
 
+    def begin_unit(self):
+        """开始执行一个新的单元（并行执行时每个单元可以重新选择一台手机）"""
+        self._bound_alias = None
+        self.multi_device_requested = False
+        self.requested_device = None
+
+    def can_substitute(self, alias):
+        """
+        绑定的手机能否代替 alias 对应的手机：卡类型相同时可以代替
+        :return: True 可以代替（按索引切换时也可以代替）；False 卡类型不同；None 手机配置中没有 alias
+        """
+        if not isinstance(alias, str) or alias == self.bound_device:
+            return True
+        devices_setting_value = get_devices_setting()
+        if alias not in devices_setting_value:
+            return None
+        return get_card_types(devices_setting_value[alias]) == get_card_types(devices_setting_value[self.bound_device])
+
+    def switch(self, alias_or_index):
+        if self.bound_device is not None:
+            if self._bound_alias is None:
+                substitute = self.can_substitute(alias_or_index)
+                if substitute is None:
+                    # 与串行执行一样找不到手机
+                    return super(MobileManager, self).switch(alias_or_index)
+                if not substitute:
+                    self.requested_device = alias_or_index
+                    raise DeviceMismatchError('工作进程绑定的手机 {} 与 {} 的卡类型不同'.format(
+                        self.bound_device, alias_or_index))
+                self._bound_alias = alias_or_index
+            elif alias_or_index != self._bound_alias:
+                self.multi_device_requested = True
+                raise MultiDeviceError('工作进程只绑定了手机 {}（代替 {}），不能再切换到 {}'.format(
+                    self.bound_device, self._bound_alias, alias_or_index))
+            alias_or_index = self.bound_device
+        return super(MobileManager, self).switch(alias_or_index)
+
     def close_all(self, closer_method='disconnect_mobile'):
         for conn in self._connections:
             getattr(conn, closer_method)()
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+try:
+    from importlib import metadata
+except ImportError:  # Python < 3.8
+    metadata = None
+    try:
+        import pkg_resources
+    except ImportError:
+        from pip._vendor import pkg_resources
+
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+except ImportError:
+    from pip._vendor.packaging.requirements import InvalidRequirement, Requirement
+
+
+def parse_requirements(path):
+    """
+    解析 requirements 文件（忽略注释、空行以及 -r、-e 等选项）
+    :return: [packaging.requirements.Requirement]
+    """
+    requirements = []
+    with open(path, 'r', encoding='UTF-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line or line.startswith('-'):
+                continue
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                continue
+            if requirement.marker is None or requirement.marker.evaluate():
+                requirements.append(requirement)
+    return requirements
+
+
+def get_installed_version(name):
+    """已安装的版本，没有安装时返回 None"""
+    if metadata is not None:
+        try:
+            return metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return None
+    # 每次重新扫描 sys.path：全局的 pkg_resources.working_set 只在导入时扫描一次，看不到之后 pip install 的包
+    distribution = pkg_resources.WorkingSet().by_key.get(pkg_resources.safe_name(name).lower())
+    return distribution.version if distribution is not None else None
+
+
+def find_unsatisfied(requirements):
+    """没有安装或版本不满足的依赖"""
+    unsatisfied = []
+    for requirement in requirements:
+        version = get_installed_version(requirement.name)
+        if version is None or not requirement.specifier.contains(version, prereleases=True):
+            unsatisfied.append(requirement)
+    return unsatisfied
+
+
+class RequirementsChecker(object):
+    """
+    依赖检查：
+        1、stamp 文件记录 requirements 文件的哈希、Python 解释器以及依赖的已安装版本；
+        2、哈希与已安装版本都没有变化时直接返回，不需要访问 pip 源；
+        3、有变化时用 importlib.metadata（Python 3.7 为 pkg_resources）检查依赖，只有不满足时才执行 pip install。
+    """
+
+    def __init__(self, requirements_path, stamp_path):
+        self.requirements_path = requirements_path
+        self.stamp_path = stamp_path
+
+    def _get_hash(self):
+        sha = hashlib.sha256()
+        with open(self.requirements_path, 'rb') as f:
+            sha.update(f.read())
+        sha.update(sys.executable.encode('UTF-8'))
+        return sha.hexdigest()
+
+    def _load_stamp(self):
+        try:
+            with open(self.stamp_path, 'r', encoding='UTF-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_stamp(self, digest, requirements):
+        dir_name = os.path.dirname(self.stamp_path)
+        if dir_name and not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+        installed = {r.name: get_installed_version(r.name) for r in requirements}
+        with open(self.stamp_path, 'w', encoding='UTF-8') as f:
+            json.dump(dict(hash=digest, installed=installed), f, indent=2)
+
+    def is_up_to_date(self):
+        """stamp 文件记录的哈希与已安装版本都没有变化"""
+        stamp = self._load_stamp()
+        if stamp.get('hash') != self._get_hash():
+            return False
+        installed = stamp.get('installed') or {}
+        return all(get_installed_version(name) == version for name, version in installed.items())
+
+    def install(self):
+        """执行 pip install，返回是否成功"""
+        command = [sys.executable, '-m', 'pip', 'install', '-r', self.requirements_path]
+        print('安装依赖：{}'.format(' '.join(command)))
+        return subprocess.call(command) == 0
+
+    def check(self, install=True):
+        """
+        检查依赖，必要时安装
+        :param install: 依赖不满足时是否执行 pip install（False 时只打印不满足的依赖）
+        :return: 不满足的依赖（requirements 文件中的写法）
+        """
+        if not os.path.isfile(self.requirements_path):
+            return []
+        if self.is_up_to_date():
+            return []
+        digest = self._get_hash()
+        requirements = parse_requirements(self.requirements_path)
+        unsatisfied = find_unsatisfied(requirements)
+        if unsatisfied and install and self.install():
+            unsatisfied = find_unsatisfied(requirements)
+        if unsatisfied:
+            print('依赖不满足：{}'.format(', '.join(str(r) for r in unsatisfied)))
+        else:
+            self._save_stamp(digest, requirements)
+        return [str(r) for r in unsatisfied]
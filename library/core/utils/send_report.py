@@ -12,6 +12,7 @@ from email.mime.text import MIMEText
 import requests
 
 import settings
+from library.core.utils.logsink import log_segments
 
 SUBJECT = u'【持续集成】和飞信[%s]集成报告'
 HOST = 'smtp.139.com'
@@ -144,7 +145,19 @@ def send_mail(*to):
     mail.attach(MIMEText(content, 'html', 'utf-8'))
 
     for FILE in FILES:
-        if os.path.isfile(os.path.abspath(FILE)):
+        segments = log_segments(FILE, getattr(settings, 'LOG_BACKUP_COUNT', 5))
+        if len(segments) > 1:
+            # 日志文件已轮转：所有分段打包成一个附件
+            import zipfile, tempfile
+            tf = tempfile.mktemp()
+            with zipfile.ZipFile(tf, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                for segment in segments:
+                    zipf.write(segment, os.path.basename(segment))
+            with open(tf, 'rb') as f:
+                attachment = MIMEApplication(f.read())
+                attachment.add_header('Content-Disposition', 'attachment', filename=os.path.basename(FILE) + '.zip')
+                mail.attach(attachment)
+        elif os.path.isfile(os.path.abspath(FILE)):
             attachment = MIMEApplication(open(FILE, 'rb').read())
             attachment.add_header('Content-Disposition', 'attachment', filename=os.path.basename(FILE))
             mail.attach(attachment)
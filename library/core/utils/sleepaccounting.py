@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+
+from library.core.utils import common
+from library.core.utils.tracing import TRACER
+
+_LIBRARY_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_PROJECT_PATH = os.path.dirname(_LIBRARY_PATH)
+_THIRD_PARTY_DIRS = ('site-packages', 'dist-packages')
+
+
+def _is_project_file(filename):
+    """是否是本项目的源文件（标准库、第三方包不算）"""
+    if not filename.startswith(_PROJECT_PATH + os.sep):
+        return False
+    parts = filename[len(_PROJECT_PATH):].split(os.sep)
+    return not any(d in parts for d in _THIRD_PARTY_DIRS)
+
+
+def _relpath(filename):
+    try:
+        return os.path.relpath(filename)
+    except ValueError:
+        # Windows 下文件与当前目录不在同一个盘符
+        return filename
+
+
+class SleepAccounting(object):
+    """
+    统计用例、页面对象、预置条件里 time.sleep 的耗时，用于衡量把固定 sleep 替换为 wait_for_ui_idle 之后节省的时间。
+    标准库、第三方包（selenium 的 WebDriverWait、urllib3 的重试等）里的 sleep 记到调用它的最近一层项目代码上，
+    最近一层项目代码在框架内部 library 目录下的不统计。
+    """
+
+    def __init__(self):
+        self._original_sleep = None
+        self.per_test = {}
+        self.per_location = {}
+
+    @property
+    def installed(self):
+        return self._original_sleep is not None
+
+    def install(self):
+        """替换 time.sleep"""
+        if self.installed:
+            return
+        self._original_sleep = time.sleep
+        time.sleep = self._sleep
+
+    def uninstall(self):
+        if not self.installed:
+            return
+        time.sleep = self._original_sleep
+        self._original_sleep = None
+
+    @staticmethod
+    def _find_project_frame(frame):
+        """跳过标准库、第三方包的栈帧，返回最近一层项目代码的 (文件名, 行号)"""
+        while frame is not None:
+            filename = os.path.abspath(frame.f_code.co_filename)
+            if _is_project_file(filename):
+                return filename, frame.f_lineno
+            frame = frame.f_back
+        return None, None
+
+    def _sleep(self, seconds):
+        frame = sys._getframe(1)
+        start = time.time()
+        try:
+            self._original_sleep(seconds)
+        finally:
+            filename, lineno = self._find_project_frame(frame)
+            del frame
+            if filename is not None and not filename.startswith(_LIBRARY_PATH + os.sep):
+                from library.core.TestLogger import TestLogger
+                end = time.time()
+                elapsed = end - start
+                test_id = common.get_test_id(TestLogger.current_test)
+                location = '{}:{}'.format(_relpath(filename), lineno)
+                TRACER.complete('time.sleep', 'sleep', start, end, TestLogger.current_device(),
+                                dict(location=location))
+                self.per_test[test_id] = self.per_test.get(test_id, 0) + elapsed
+                count, total = self.per_location.get(location, (0, 0))
+                self.per_location[location] = (count + 1, total + elapsed)
+
+    def drain(self):
+        """取出并清空统计结果（并行执行时由工作进程交给调度进程合并）"""
+        result = (self.per_test, self.per_location)
+        self.per_test = {}
+        self.per_location = {}
+        return result
+
+    def merge(self, drained):
+        per_test, per_location = drained
+        for test_id, seconds in per_test.items():
+            self.per_test[test_id] = self.per_test.get(test_id, 0) + seconds
+        for location, (count, seconds) in per_location.items():
+            total_count, total_seconds = self.per_location.get(location, (0, 0))
+            self.per_location[location] = (total_count + count, total_seconds + seconds)
+
+    def seconds_of(self, test):
+        """指定用例 sleep 的总秒数"""
+        return self.per_test.get(common.get_test_id(test), 0)
+
+    @property
+    def total(self):
+        return sum(self.per_test.values())
+
+    def report(self, top=20):
+        lines = ['time.sleep 总耗时：{:.1f}s'.format(self.total)]
+        lines.append('{:<80}{:>10}'.format('Test', 'Sleep(s)'))
+        for test_id, seconds in sorted(self.per_test.items(), key=lambda i: i[1], reverse=True)[:top]:
+            lines.append('{:<80}{:>10.1f}'.format(test_id[-80:], seconds))
+        lines.append('{:<80}{:>10}{:>10}'.format('Location', 'Count', 'Sleep(s)'))
+        for location, (count, seconds) in sorted(self.per_location.items(), key=lambda i: i[1][1],
+                                                 reverse=True)[:top]:
+            lines.append('{:<80}{:>10}{:>10.1f}'.format(location[-80:], count, seconds))
+        return '\n'.join(lines)
+
+
+SLEEP_ACCOUNTING = SleepAccounting()
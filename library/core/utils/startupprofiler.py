@@ -0,0 +1,113 @@
+import sys
+import time
+
+_perf_counter = time.perf_counter
+
+
+class _TimingLoader(object):
+    """记录 exec_module 耗时的 loader 包装，其它属性交给原来的 loader"""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler.begin()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.end(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(object):
+    """放在 sys.meta_path 最前面，用其它 finder 查找模块，并包装找到的 loader"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimingLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler(object):
+    """
+    启动耗时分析：
+        1、记录每个模块的导入耗时（自身耗时，以及包括其导入的其它模块的累计耗时）；
+        2、记录启动的各个阶段（解析参数、加载用例等）的耗时；
+        3、按顶层包汇总自身耗时，输出最耗时的模块。
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.phases = []
+        self._finder = None
+        self._stack = []
+        self._started_at = None
+        self._phase_started_at = None
+
+    def install(self):
+        if self._finder is not None:
+            return
+        self._started_at = self._phase_started_at = _perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder is None:
+            return
+        sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def begin(self):
+        # [开始时间, 子模块累计耗时]
+        self._stack.append([_perf_counter(), 0.0])
+
+    def end(self, name):
+        start, children = self._stack.pop()
+        cumulative = _perf_counter() - start
+        self.modules[name] = (cumulative - children, cumulative)
+        if self._stack:
+            self._stack[-1][1] += cumulative
+
+    def phase(self, name):
+        """结束一个启动阶段"""
+        now = _perf_counter()
+        self.phases.append((name, now - self._phase_started_at))
+        self._phase_started_at = now
+
+    def report(self, top=20):
+        total = _perf_counter() - self._started_at
+        import_total = sum(own for own, _ in self.modules.values())
+        lines = ['启动耗时：{:.3f}s，其中导入模块：{:.3f}s（{} 个模块）'.format(total, import_total, len(self.modules))]
+        for name, elapsed in self.phases:
+            lines.append('    {:<40}{:>10.3f}s'.format(name, elapsed))
+        packages = {}
+        for name, (own, _) in self.modules.items():
+            package = name.split('.')[0]
+            count, elapsed = packages.get(package, (0, 0.0))
+            packages[package] = (count + 1, elapsed + own)
+        lines.append('{:<48}{:>8}{:>12}'.format('Package', 'Modules', 'Self(s)'))
+        for package, (count, elapsed) in sorted(packages.items(), key=lambda i: i[1][1], reverse=True)[:top]:
+            lines.append('{:<48}{:>8}{:>12.3f}'.format(package, count, elapsed))
+        lines.append('{:<64}{:>12}{:>12}'.format('Module', 'Self(s)', 'Total(s)'))
+        for name, (own, cumulative) in sorted(self.modules.items(), key=lambda i: i[1][1], reverse=True)[:top]:
+            lines.append('{:<64}{:>12.3f}{:>12.3f}'.format(name[-64:], own, cumulative))
+        return '\n'.join(lines)
+
+
+STARTUP_PROFILER = StartupProfiler()
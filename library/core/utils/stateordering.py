@@ -0,0 +1,144 @@
+import ast
+import inspect
+import textwrap
+import unittest
+from collections import OrderedDict
+
+from library.core.utils.testloader import iter_tests
+
+# 前置条件中表示“进入某个页面/状态”的方法名
+_NAVIGATION_PREFIXES = ('enter_', 'make_already_in_', 'init_and_enter_')
+_NAVIGATION_KEYWORD = '_make_already_in_'
+
+_INFERRED_STATES = {}
+
+
+def precondition(state):
+    """
+    声明用例（setUp_[用例方法名]、default_setUp 或用例方法本身）需要的起始状态，
+    用例排序时把起始状态相同的用例排在一起，减少重置应用、登录、进入页面的次数：
+        @staticmethod
+        @precondition('群聊页面')
+        def setUp_test_msg_group_chat_0001():
+            Preconditions.enter_group_chat_page()
+    """
+
+    def decorator(func):
+        target = func.__func__ if isinstance(func, (staticmethod, classmethod)) else func
+        target.__precondition__ = state
+        return func
+
+    return decorator
+
+
+def _is_navigation(name):
+    return name.startswith(_NAVIGATION_PREFIXES) or _NAVIGATION_KEYWORD in name
+
+
+def infer_state(func):
+    """
+    没有 @precondition 时，从源码推断起始状态：setUp 中最后一个 Preconditions.enter_xxx /
+    make_already_in_xxx 调用的方法名；无法推断时返回 None
+    """
+    func = getattr(func, '__func__', func)
+    if func in _INFERRED_STATES:
+        return _INFERRED_STATES[func]
+    state = None
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        tree = None
+    if tree is not None:
+        calls = [node for node in ast.walk(tree) if isinstance(node, ast.Call)
+                 and isinstance(node.func, ast.Attribute) and _is_navigation(node.func.attr)]
+        if calls:
+            last = max(calls, key=lambda node: (node.lineno, node.col_offset))
+            state = last.func.attr
+    _INFERRED_STATES[func] = state
+    return state
+
+
+def get_required_state(test):
+    """用例需要的起始状态：优先使用 @precondition 声明，其次从 setUp 源码推断"""
+    method_name = getattr(test, '_testMethodName', None)
+    if method_name is None:
+        return None
+    candidates = [getattr(test, 'setUp_{}'.format(method_name), None),
+                  getattr(test, method_name, None)]
+    for func in candidates:
+        state = getattr(func, '__precondition__', None)
+        if state is not None:
+            return state
+    setup = candidates[0] or getattr(test, 'default_setUp', None)
+    state = getattr(setup, '__precondition__', None)
+    if state is None and setup is not None:
+        state = infer_state(setup)
+    return state
+
+
+def count_transitions(states):
+    """相邻用例起始状态不同（或者未知）的次数，即需要重新进入页面的次数"""
+    transitions = 0
+    previous = None
+    for state in states:
+        if state is None or state != previous:
+            transitions += 1
+        previous = state
+    return transitions
+
+
+def _order_class(tests, states, current):
+    """同一个类中起始状态相同的用例排在一起（按第一次出现的顺序），与当前状态相同的一组排在最前面"""
+    groups = OrderedDict()
+    for test in tests:
+        groups.setdefault(states[test], []).append(test)
+    keys = list(groups)
+    if current is not None and current in groups:
+        keys.remove(current)
+        keys.insert(0, current)
+    # 状态未知的用例放在最后，不打断已知状态的分组
+    if None in groups:
+        keys.remove(None)
+        keys.append(None)
+    return [test for key in keys for test in groups[key]]
+
+
+def order_by_state(suite):
+    """
+    按起始状态对用例排序：
+        1、模块的顺序不变，同一个类的用例仍然连续执行（setUpClass/tearDownClass 只执行一次）；
+        2、类中起始状态相同的用例排在一起；
+        3、同一个模块中，优先执行包含上一个用例结束状态的类。
+    :return: (排序后的 unittest.TestSuite, 排序前的状态切换次数, 排序后的状态切换次数)
+    """
+    tests = list(iter_tests(suite))
+    states = {test: get_required_state(test) for test in tests}
+    modules = OrderedDict()
+    for test in tests:
+        cls = test.__class__
+        modules.setdefault(cls.__module__, OrderedDict()).setdefault(cls, []).append(test)
+
+    ordered = []
+    current = None
+    for classes in modules.values():
+        remaining = list(classes)
+        while remaining:
+            cls = next((c for c in remaining if current is not None
+                        and any(states[t] == current for t in classes[c])), remaining[0])
+            remaining.remove(cls)
+            class_tests = _order_class(classes[cls], states, current)
+            ordered.extend(class_tests)
+            current = states[class_tests[-1]]
+
+    before = count_transitions(states[test] for test in tests)
+    after = count_transitions(states[test] for test in ordered)
+    return unittest.TestSuite(ordered), before, after
+
+
+def report(before, after, cost):
+    """
+    :param cost: 每次进入起始状态的预计耗时（秒）
+    """
+    saved = before - after
+    return '按前置条件排序：状态切换 {} 次 -> {} 次，预计减少 {} 次导航（约 {:.0f} 秒）'.format(
+        before, after, saved, saved * cost)
@@ -0,0 +1,226 @@
+import ast
+import fnmatch
+import importlib
+import json
+import os
+import sys
+import unittest
+
+# 缓存格式版本，解析逻辑变化时修改
+_CACHE_VERSION = 1
+
+
+def _get_name(node):
+    """ast 节点对应的名称：Name -> id，Attribute -> attr"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _get_tags(decorators):
+    """
+    解析 @tags(...) 装饰器
+    :return: 没有 @tags 时返回 None；参数都是常量时返回大写的标签列表；否则返回 True（需要导入后才能判断）
+    """
+    for decorator in decorators:
+        if isinstance(decorator, ast.Call) and _get_name(decorator.func) == 'tags':
+            if decorator.keywords or not all(isinstance(arg, ast.Constant) for arg in decorator.args):
+                return True
+            return sorted({str(arg.value).upper() for arg in decorator.args})
+    return None
+
+
+def parse_test_file(path):
+    """
+    不导入模块，解析用例文件中定义的类、test 开头的方法以及 @tags 参数
+    :return: [{'name': 类名, 'bases': [基类名], 'tags': 类的标签, 'tests': [{'name': 方法名, 'tags': 标签}]}]
+    """
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    classes = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        tests = []
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) \
+                    and item.name.startswith(unittest.TestLoader.testMethodPrefix):
+                tests.append(dict(name=item.name, tags=_get_tags(item.decorator_list)))
+        classes.append(dict(name=node.name, bases=[_get_name(base) for base in node.bases],
+                            tags=_get_tags(node.decorator_list), tests=tests))
+    return classes
+
+
+def _is_selected(tags, include):
+    if not include or tags is None or tags is True:
+        return True
+    return set(tags).issuperset(include)
+
+
+class TestIndex(object):
+    """
+    基于 ast 的用例索引：
+        1、解析目录下的 *.py，得到用例类、用例方法与 @tags 标签，不导入任何用例模块；
+        2、解析结果按文件的修改时间与大小缓存到 cache_path；
+        3、只导入包含被选中用例的模块，按 unittest 的顺序（模块、类、方法名）构建套件，
+           用例 id 与 unittest.defaultTestLoader.discover 一致。
+    只会加载模块中定义的类（discover 还会加载 import 进来的 TestCase 子类，导致用例重复执行）。
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self._cache = self._load_cache()
+        self._dirty = False
+
+    def _load_cache(self):
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='UTF-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get('version') != _CACHE_VERSION:
+            return {}
+        return cache.get('files', {})
+
+    def save(self):
+        if not self.cache_path or not self._dirty:
+            return
+        dir_name = os.path.dirname(self.cache_path)
+        if dir_name and not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+        with open(self.cache_path, 'w', encoding='UTF-8') as f:
+            json.dump(dict(version=_CACHE_VERSION, files=self._cache), f, ensure_ascii=False)
+        self._dirty = False
+
+    def get_classes(self, path):
+        """文件中定义的类（优先使用缓存），文件有语法错误时返回 None"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = [stat.st_mtime, stat.st_size]
+        entry = self._cache.get(path)
+        if entry is None or entry['key'] != key:
+            try:
+                classes = parse_test_file(path)
+            except (SyntaxError, ValueError):
+                classes = None
+            entry = dict(key=key, classes=classes)
+            self._cache[path] = entry
+            self._dirty = True
+        return entry['classes']
+
+    def find_tests(self, start_dir, pattern='*.py', include=None):
+        """
+        查找被选中的用例
+        :param start_dir: 用例目录（同时作为模块名的根目录，与 discover 一致）
+        :param pattern: 文件名匹配模式
+        :param include: 需要包含的标签（大写），为空时选中全部用例
+        :return: [(模块名, 类名, [方法名])]，无法解析的模块类名与方法名为 None（导入整个模块）
+        """
+        start_dir = os.path.abspath(start_dir)
+        include = set(include or [])
+        files = []
+        for dir_path, dir_names, file_names in os.walk(start_dir):
+            # 与 discover 一致：只进入包目录
+            dir_names[:] = sorted(d for d in dir_names
+                                  if os.path.isfile(os.path.join(dir_path, d, '__init__.py')))
+            for file_name in sorted(file_names):
+                if fnmatch.fnmatch(file_name, pattern) and file_name != '__init__.py':
+                    files.append(os.path.join(dir_path, file_name))
+
+        index = {}
+        for path in files:
+            module = os.path.splitext(os.path.relpath(path, start_dir))[0].replace(os.sep, '.')
+            index[module] = self.get_classes(path)
+        self.save()
+
+        # 每个模块中的 TestCase 子类（基类为 TestCase，或者是已知的用例类）
+        case_classes = {'TestCase'}
+        changed = True
+        while changed:
+            changed = False
+            for classes in index.values():
+                for cls in classes or []:
+                    if cls['name'] not in case_classes and case_classes.intersection(cls['bases']):
+                        case_classes.add(cls['name'])
+                        changed = True
+        by_name = {}
+        for classes in index.values():
+            for cls in classes or []:
+                by_name.setdefault(cls['name'], cls)
+
+        selected = []
+        for module in sorted(index):
+            if index[module] is None:
+                selected.append((module, None, None))
+                continue
+            # 与 loadTestsFromModule 一致：按类名排序
+            for cls in sorted(index[module], key=lambda c: c['name']):
+                if cls['name'] not in case_classes or cls['name'] == 'TestCase':
+                    continue
+                if not _is_selected(cls['tags'], include):
+                    continue
+                tests = {}
+                for test in self._inherited_tests(cls, by_name, case_classes):
+                    tests.setdefault(test['name'], test)
+                names = sorted(name for name, test in tests.items() if _is_selected(test['tags'], include))
+                if names:
+                    selected.append((module, cls['name'], names))
+        return selected
+
+    def _inherited_tests(self, cls, by_name, case_classes, seen=None):
+        """类自己定义的用例在前，继承的用例在后（同名方法以子类为准）"""
+        seen = seen or set()
+        seen.add(cls['name'])
+        yield from cls['tests']
+        for base in cls['bases']:
+            if base in case_classes and base in by_name and base not in seen:
+                yield from self._inherited_tests(by_name[base], by_name, case_classes, seen)
+
+    def load_tests(self, start_dir, pattern='*.py', include=None):
+        """只导入包含被选中用例的模块并构建套件"""
+        start_dir = os.path.abspath(start_dir)
+        if start_dir not in sys.path:
+            sys.path.insert(0, start_dir)
+        suite = unittest.TestSuite()
+        module_suites = {}
+        for module_name, class_name, names in self.find_tests(start_dir, pattern, include):
+            if class_name is None:
+                # 无法解析的模块交给 unittest 加载（导入失败时作为一个失败的用例）
+                suite.addTest(unittest.defaultTestLoader.loadTestsFromName(module_name))
+                continue
+            try:
+                module = importlib.import_module(module_name)
+            except Exception:
+                # 与 discover 一致：导入失败的模块作为一个失败的用例
+                if module_name not in module_suites:
+                    module_suites[module_name] = unittest.defaultTestLoader.loadTestsFromName(module_name)
+                    suite.addTest(module_suites[module_name])
+                continue
+            if module_name not in module_suites:
+                module_suites[module_name] = unittest.TestSuite()
+                suite.addTest(module_suites[module_name])
+            cls = getattr(module, class_name)
+            module_suites[module_name].addTest(unittest.TestSuite(cls(name) for name in names))
+        return suite
+
+
+def summary(start_dir, include=None, pattern='*.py'):
+    """被选中的用例数、用例类数、需要导入的模块数与解析的模块总数"""
+    index = TestIndex()
+    selected = index.find_tests(start_dir, pattern, include)
+    return dict(tests=sum(len(names) for _, _, names in selected if names is not None),
+                classes=sum(1 for _, class_name, _ in selected if class_name is not None),
+                modules=len({module for module, _, _ in selected}),
+                total_modules=len(index._cache))
+
+
+if __name__ == '__main__':
+    # python -m library.core.utils.testindex [标签 ...]
+    import settings
+
+    print('{tests} tests in {classes} classes, {modules} of {total_modules} modules imported'.format(
+        **summary(settings.TEST_CASE_ROOT, [tag.upper() for tag in sys.argv[1:]])))
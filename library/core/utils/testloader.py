@@ -0,0 +1,63 @@
+import json
+import os
+import unittest
+
+from library.core.utils import ConfigManager
+from library.core.utils.testcasefilter import TEST_CASE_TAG_ENVIRON
+from library.core.utils.testindex import TestIndex
+
+
+def get_included_tags():
+    """命令行 --include 指定的标签（大写）"""
+    try:
+        include = json.loads(os.environ.get(TEST_CASE_TAG_ENVIRON) or '[]')
+    except ValueError:
+        return []
+    return include if isinstance(include, list) else []
+
+
+def load_suite(paths=None, discovery=None):
+    """
+    加载测试套件
+    :param paths: 测试套件路径（目录或文件）列表，为空时加载全部用例
+    :param discovery: ast（解析用例文件，只导入包含被选中用例的模块）或 import（unittest discover），
+        默认使用配置 TEST_DISCOVERY
+    :return: unittest.TestSuite
+    """
+    discovery = discovery or ConfigManager.get_test_discovery()
+    if discovery == 'ast':
+        index = TestIndex(ConfigManager.get_test_index_cache_path())
+        include = get_included_tags()
+
+        def discover(start_dir, pattern):
+            return index.load_tests(start_dir, pattern, include)
+    elif discovery == 'import':
+        discover = unittest.defaultTestLoader.discover
+    else:
+        raise ValueError('不支持的用例加载方式：{}'.format(discovery))
+
+    if not paths:
+        return discover(ConfigManager.get_test_case_root(), '*.py')
+    suite = None
+    for p in paths:
+        if os.path.isdir(p):
+            s = discover(os.path.abspath(p), '*.py')
+        elif os.path.isfile(p):
+            path, file = os.path.split(os.path.abspath(p))
+            s = discover(path, file)
+        else:
+            raise ValueError('Path "{}" is not an valid file path!'.format(p))
+        if suite is None:
+            suite = s
+        else:
+            suite.addTest(s)
+    return suite
+
+
+def iter_tests(suite):
+    """按执行顺序遍历套件中的每一个用例"""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import time
+
+
+class TimingStore(object):
+    """
+    用例历史耗时（SQLite）：
+        1、每次执行后记录每个用例的耗时；
+        2、用例的预计耗时为最近 history_size 次耗时的中位数；
+        3、没有历史记录的用例按用例文件大小估算：文件大小平均分给文件中的用例，
+           再按有记录的用例的“秒/字节”换算，没有任何记录时使用 DEFAULT_SECONDS_PER_BYTE。
+    """
+
+    DEFAULT_SECONDS_PER_BYTE = 0.01
+    HISTORY_SIZE = 5
+
+    def __init__(self, path, history_size=HISTORY_SIZE):
+        self.path = path
+        self.history_size = history_size
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            dir_name = os.path.dirname(self.path)
+            if dir_name and not os.path.isdir(dir_name):
+                os.makedirs(dir_name)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS test_duration ('
+                'test_id TEXT NOT NULL, duration REAL NOT NULL, device TEXT, recorded_at REAL NOT NULL)')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS test_duration_test_id ON test_duration (test_id, recorded_at)')
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record(self, durations):
+        """
+        记录一次执行的耗时
+        :param durations: [(用例 id, 耗时（秒）, 手机别名)]
+        """
+        if not durations:
+            return
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO test_duration (test_id, duration, device, recorded_at) VALUES (?, ?, ?, ?)',
+                [(test_id, duration, device, now) for test_id, duration, device in durations])
+
+    def history(self):
+        """{用例 id: [最近的耗时, ...]}"""
+        history = {}
+        for test_id, duration in self.connection.execute(
+                'SELECT test_id, duration FROM test_duration ORDER BY recorded_at DESC'):
+            durations = history.setdefault(test_id, [])
+            if len(durations) < self.history_size:
+                durations.append(duration)
+        return history
+
+    def estimate(self, tests):
+        """
+        预计每个用例的耗时
+        :param tests: [(用例 id, 用例文件路径)]
+        :return: {用例 id: 预计耗时（秒）}
+        """
+        history = self.history()
+        tests_per_file = {}
+        for test_id, path in tests:
+            tests_per_file[path] = tests_per_file.get(path, 0) + 1
+        file_sizes = {path: os.path.getsize(path) if path and os.path.isfile(path) else 0 for path in tests_per_file}
+
+        def share_of(path):
+            return file_sizes[path] / tests_per_file[path]
+
+        estimates = {}
+        known_seconds = known_bytes = 0
+        for test_id, path in tests:
+            durations = history.get(test_id)
+            if durations:
+                estimates[test_id] = sorted(durations)[len(durations) // 2]
+                known_seconds += estimates[test_id]
+                known_bytes += share_of(path)
+        seconds_per_byte = known_seconds / known_bytes if known_bytes else self.DEFAULT_SECONDS_PER_BYTE
+        for test_id, path in tests:
+            if test_id not in estimates:
+                estimates[test_id] = share_of(path) * seconds_per_byte
+        return estimates
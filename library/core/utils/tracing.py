@@ -0,0 +1,117 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import settings
+
+_time = time.time
+# 命令行 --trace 开启 trace（通过环境变量传递给并行执行的工作进程）
+TRACE_ENABLED_ENVIRON = 'TRACE_ENABLED'
+
+
+class Tracer(object):
+    """
+    记录带起止时间的调用区间（span），导出为 Chrome trace-event JSON（chrome://tracing、Perfetto、speedscope 可以直接打开）：
+        1、每个区间保存为一个 complete 事件（ph=X），嵌套关系由同一线程内的时间包含关系体现；
+        2、每台手机（别名）对应 trace 中的一个进程，没有手机的区间归入 "runner"；
+        3、类别（cat）：test、precondition、page、mobile、command、wait、sleep；
+        4、最多保留 max_events 个区间，超出后丢弃最早的区间（dropped 记录丢弃的个数）。
+    """
+
+    DEFAULT_MAX_EVENTS = 200000
+
+    def __init__(self, enabled=False, max_events=DEFAULT_MAX_EVENTS):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.dropped = 0
+        self._events = deque(maxlen=max_events)
+
+    def complete(self, name, category, start, end=None, device=None, args=None):
+        """
+        记录一个已经结束的区间
+        :param name: 区间名称
+        :param category: 类别
+        :param start: 开始时间（time.time()）
+        :param end: 结束时间，默认为当前时间
+        :param device: 手机别名
+        :param args: 附加信息
+        """
+        if not self.enabled:
+            return
+        if end is None:
+            end = _time()
+        if len(self._events) == self.max_events:
+            self.dropped += 1
+        self._events.append((name, category, start, end, device, threading.get_ident(), args))
+
+    def install(self, driver, device=None):
+        """记录 driver 执行的每一个 WebDriver 命令"""
+        execute = driver.execute
+        this = self
+
+        @functools.wraps(execute)
+        def wrapper(driver_command, params=None):
+            if not this.enabled:
+                return execute(driver_command, params)
+            start = _time()
+            try:
+                return execute(driver_command, params)
+            finally:
+                this.complete(driver_command, 'command', start, device=device)
+
+        driver.execute = wrapper
+
+    def clear(self):
+        self._events.clear()
+        self.dropped = 0
+
+    def drain(self):
+        """取出并清空已记录的区间与丢弃个数（并行执行时由工作进程交给调度进程合并）"""
+        result = (list(self._events), self.dropped)
+        self.clear()
+        return result
+
+    def merge(self, drained):
+        events, dropped = drained
+        self.dropped += dropped + max(len(self._events) + len(events) - self.max_events, 0)
+        self._events.extend(events)
+
+    def __len__(self):
+        return len(self._events)
+
+    def to_trace_events(self):
+        pid = os.getpid()
+        processes = {}
+        threads = {}
+        trace_events = []
+        for name, category, start, end, device, thread_id, args in list(self._events):
+            process_name = device or 'runner'
+            if process_name not in processes:
+                processes[process_name] = len(processes) + 1
+                trace_events.append(dict(name='process_name', ph='M', pid=processes[process_name], tid=0,
+                                         args=dict(name=process_name)))
+            if thread_id not in threads:
+                threads[thread_id] = len(threads) + 1
+            event = dict(name=name, cat=category, ph='X', ts=int(start * 1000000),
+                         dur=max(int((end - start) * 1000000), 0), pid=processes[process_name],
+                         tid=threads[thread_id])
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return dict(traceEvents=trace_events, displayTimeUnit='ms', otherData=dict(pid=pid, dropped=self.dropped))
+
+    def save(self, path):
+        if not self._events:
+            return
+        dir_name = os.path.dirname(path)
+        if dir_name and not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+        with open(path, 'w', encoding='UTF-8') as f:
+            json.dump(self.to_trace_events(), f, ensure_ascii=False)
+
+
+TRACER = Tracer(getattr(settings, 'TRACE_ENABLED', False) or bool(os.environ.get(TRACE_ENABLED_ENVIRON)),
+                getattr(settings, 'TRACE_MAX_EVENTS', Tracer.DEFAULT_MAX_EVENTS))
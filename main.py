@@ -1,11 +1,15 @@
 import os
+import sys
 import traceback
 import unittest
 
-from pip._internal import main as install_requirements
+# 启动耗时分析需要在导入其它模块之前安装
+if '--profile-startup' in sys.argv:
+    from library.core.utils.startupprofiler import STARTUP_PROFILER
 
-# 自动安装依赖
-install_requirements(['install', '-r', 'requirements.txt'])
+    STARTUP_PROFILER.install()
+else:
+    STARTUP_PROFILER = None
 
 if __name__ == '__main__':
     os.environ.setdefault('AVAILABLE_DEVICES_SETTING', 'AVAILABLE_DEVICES')
@@ -14,35 +18,70 @@ if __name__ == '__main__':
     cli_commands = CommandLineTool.parse_and_store_command_line_params()
     if cli_commands.deviceConfig:
         os.environ['AVAILABLE_DEVICES_SETTING'] = cli_commands.deviceConfig
+    if STARTUP_PROFILER:
+        STARTUP_PROFILER.phase('解析命令行参数')
 
-    from library.core.utils import ConfigManager, common
+    # 检查依赖：requirements.txt 与已安装版本没有变化时跳过，只有依赖不满足时才安装
+    from library.core.utils import ConfigManager
+    from library.core.utils.requirementscheck import RequirementsChecker
 
+    RequirementsChecker(ConfigManager.get_requirements_file_path(),
+                        ConfigManager.get_requirements_stamp_path()).check(
+        install=ConfigManager.get_install_requirements() and not cli_commands.skipInstallRequirements)
+    if STARTUP_PROFILER:
+        STARTUP_PROFILER.phase('检查依赖')
+
+    from library.core.utils import common
+    from library.core.utils.testloader import load_suite
+    from library.core.utils.sleepaccounting import SLEEP_ACCOUNTING
+
+    SLEEP_ACCOUNTING.install()
+
+    # 并行执行：选择手机，当前进程只负责加载、分配用例与生成报告
+    devices = None
+    if cli_commands.parallel or cli_commands.devices:
+        from library.core.utils.mobilemanager import PARALLEL_COORDINATOR_ENVIRON, get_devices_setting
+
+        available = list(get_devices_setting().keys())
+        devices = available if cli_commands.devices in (None, ['all']) else cli_commands.devices
+        for device in devices:
+            if device not in available:
+                raise ValueError('Device "{}" is not in the available devices setting!'.format(device))
+        if cli_commands.parallel:
+            devices = devices[:cli_commands.parallel]
+        os.environ[PARALLEL_COORDINATOR_ENVIRON] = '1'
+
+    from library.core.utils.timingstore import TimingStore
+
+    timing_store = TimingStore(ConfigManager.get_timing_store_path())
     report_path = ConfigManager.get_html_report_path()
-    s = cli_commands.suite
-    if cli_commands.suite:
-        suite = None
-        for p in cli_commands.suite:
-            if os.path.isdir(p):
-                s = unittest.defaultTestLoader.discover(os.path.abspath(p), '*.py')
-            elif os.path.isfile(p):
-                path, file = os.path.split(os.path.abspath(p))
-                s = unittest.defaultTestLoader.discover(path, file)
-            else:
-                raise ValueError('Path "{}" is not an valid file path!'.format(p))
-            if suite is None:
-                suite = s
-            else:
-                suite.addTest(s)
-    else:
-        case_path = ConfigManager.get_test_case_root()
-        suite = unittest.defaultTestLoader.discover(case_path, '*.py')
+    if STARTUP_PROFILER:
+        STARTUP_PROFILER.phase('加载配置与工具模块')
+    suite = load_suite(cli_commands.suite, cli_commands.discovery)
+    if STARTUP_PROFILER:
+        STARTUP_PROFILER.phase('加载用例')
+        STARTUP_PROFILER.uninstall()
+        print(STARTUP_PROFILER.report())
+    if (cli_commands.order or ConfigManager.get_test_order()) == 'precondition':
+        from library.core.utils import stateordering
+
+        suite, before, after = stateordering.order_by_state(suite)
+        print(stateordering.report(before, after, ConfigManager.get_precondition_navigation_cost()))
     # RunTest
     from library.HTMLTestRunner import HTMLTestRunner
 
     with common.open_or_create(report_path, 'wb') as output:
-        runner = HTMLTestRunner(
-            stream=output, title='Test Report', verbosity=2)
+        if devices:
+            from library.core.parallelrunner import ParallelHTMLTestRunner
+
+            runner = ParallelHTMLTestRunner(devices, cli_commands.suite, stream=output, title='Test Report',
+                                            verbosity=2, timing_store=timing_store,
+                                            discovery=cli_commands.discovery)
+        else:
+            runner = HTMLTestRunner(
+                stream=output, title='Test Report', verbosity=2)
         result = runner.run(suite)
+        timing_store.record(result.durations)
 
         # 成功、失败、错误、总计、通过率
         try:
@@ -63,3 +102,26 @@ if __name__ == '__main__':
             msg = traceback.format_exc()
             print(msg)
             print("报告Email发送失败")
+
+    # 打印每台手机的 WebDriver 命令耗时统计、权限弹窗统计（并行执行时由工作进程汇总到调度进程）
+    if devices:
+        print(runner.device_report())
+    else:
+        from library.core.utils.applicationcache import MOBILE_DRIVER_CACHE
+
+        for mobile in MOBILE_DRIVER_CACHE:
+            if mobile.command_latency is not None:
+                print(mobile.command_latency.report(mobile.alis))
+            print(mobile.permission_watcher.report())
+
+    # 保存并打印最耗时的等待
+    from library.core.mobile.waiting import WAIT_TELEMETRY
+
+    WAIT_TELEMETRY.save(ConfigManager.get_wait_telemetry_path())
+    print(WAIT_TELEMETRY.report())
+    print(SLEEP_ACCOUNTING.report())
+
+    # 导出 trace
+    from library.core.utils.tracing import TRACER
+
+    TRACER.save(ConfigManager.get_trace_path())
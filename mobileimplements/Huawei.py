@@ -19,13 +19,8 @@ class HuaweiP20(MobileDriver):
     def total_card_slot(self):
         return 2
 
-    @TestLogger.log('获取手机型号')
-    def get_mobile_model_info(self):
-        try:
-            result = self.execute_shell_command('getprop', 'ro.config.marketing_name')
-        except:
-            result = "暂无信息"
-        return result.strip()
+    def _mobile_model_info_command(self):
+        return ['getprop', 'ro.config.marketing_name']
 
     @TestLogger.log('开启飞行模式')
     def turn_on_airplane_mode(self):
@@ -40,8 +35,7 @@ class HuaweiP20(MobileDriver):
         """
         params = 'settings put global airplane_mode_on 1'.split(' ')
         params1 = 'am broadcast -a android.intent.action.AIRPLANE_MODE'.split(' ')
-        self.execute_shell_command(*params)
-        self.execute_shell_command(*params1)
+        self.execute_shell_batch([params, params1])
         return True
 
     @TestLogger.log('关闭飞行模式')
@@ -59,8 +53,7 @@ class HuaweiP20(MobileDriver):
 
         params = 'settings put global airplane_mode_on 0'.split(' ')
         params1 = 'am broadcast -a android.intent.action.AIRPLANE_MODE'.split(' ')
-        self.execute_shell_command(*params)
-        self.execute_shell_command(*params1)
+        self.execute_shell_batch([params, params1])
         return True
 
     @TestLogger.log('开启WIFI')
@@ -1,6 +1,6 @@
-from library.core.TestLogger import TestLogger
 from library.core.common.simcardtype import CardType
 from library.core.mobile.mobiledriver import MobileDriver
+from library.core.mobile.permissionwatcher import ANDROID_PERMISSION_DIALOG, MIUI_PERMISSION_DIALOG
 
 
 class MI6(MobileDriver):
@@ -16,10 +16,8 @@ class MI6(MobileDriver):
     def total_card_slot(self):
         return 2
 
-    @TestLogger.log('获取手机型号')
-    def get_mobile_model_info(self):
-        try:
-            result = self.execute_shell_command('getprop', 'ro.product.model')
-        except:
-            result = "暂无信息"
-        return result.strip()
+    def permission_dialog_signatures(self):
+        return [ANDROID_PERMISSION_DIALOG, MIUI_PERMISSION_DIALOG]
+
+    def _mobile_model_info_command(self):
+        return ['getprop', 'ro.product.model']
@@ -2,9 +2,9 @@ import re
 
 from appium.webdriver.common.mobileby import MobileBy
 
-from library.core.TestLogger import TestLogger
 from library.core.common.simcardtype import CardType
 from library.core.mobile.mobiledriver import MobileDriver
+from library.core.mobile.permissionwatcher import ANDROID_PERMISSION_DIALOG, MIUI_PERMISSION_DIALOG
 
 
 class RedmiNote4X(MobileDriver):
@@ -20,6 +20,9 @@ class RedmiNote4X(MobileDriver):
     def total_card_slot(self):
         return 2
 
+    def permission_dialog_signatures(self):
+        return [ANDROID_PERMISSION_DIALOG, MIUI_PERMISSION_DIALOG]
+
     def _actions_before_send_get_code_request(self):
         """打开通知栏并清空消息"""
         self.open_notifications()
@@ -40,10 +43,5 @@ class RedmiNote4X(MobileDriver):
             return code[0]
         raise Exception("等待{}秒仍未获取到验证码".format(max_wait_time))
 
-    @TestLogger.log('获取手机型号')
-    def get_mobile_model_info(self):
-        try:
-            result = self.execute_shell_command('getprop', 'ro.product.model')
-        except:
-            result = "暂无信息"
-        return result.strip()
+    def _mobile_model_info_command(self):
+        return ['getprop', 'ro.product.model']
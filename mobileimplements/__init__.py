@@ -4,7 +4,24 @@ __all__ = [
     'RedmiNote4X',
     'HuaweiP20',
 ]
-from .MI6 import MI6
-from .MXPro6Plus import MXPro6Plus
-from .RedmiNote4X import RedmiNote4X
-from .Huawei import HuaweiP20
+
+from library.core.utils.lazyimport import lazy_imports, resolve
+
+_IMPLEMENTATIONS = {
+    'MI6': '.MI6',
+    'MXPro6Plus': '.MXPro6Plus',
+    'RedmiNote4X': '.RedmiNote4X',
+    'HuaweiP20': '.Huawei',
+}
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, _IMPLEMENTATIONS)
+
+
+def get_implementation(name):
+    """
+    按类名获取手机实现类
+    MI6 等类与所在的子模块同名，import mobileimplements.MI6 之后 mobileimplements.MI6 是模块而不是类，
+    创建手机时应该使用该方法
+    """
+    return resolve(__name__, _IMPLEMENTATIONS, name)
@@ -165,35 +165,19 @@ class SelectLocalContactsPage(BasePage):
         self.swipe_by_direction(self.__class__.__locators['容器列表'], 'up')
 
     def swipe_to_top(self, times=100):
-        """滑动到顶部"""
-        while times > 0:
-            self.swipe_by_direction(self.__class__.__locators['容器列表'], 'down')
-            flag = self.is_text_present("选择和通讯录联系人")
-            if flag:
-                break
-            times = times - 1
+        """滑动到顶部（出现“选择和通讯录联系人”或者列表不再变化时停止）"""
+        self.scroll_and_collect(self.__class__.__locators['容器列表'],
+                                (MobileBy.XPATH, '//*[@text="选择和通讯录联系人"]'),
+                                until=lambda item: True, direction='down', max_swipes=times)
 
     @TestLogger.log()
     def get_all_contacts_name(self):
         """获取所有联系人名"""
-        els = self.get_elements(self.__class__.__locators["联系人名"])
-        contacts_name = []
-        if els:
-            for el in els:
-                contacts_name.append(el.text)
-        else:
+        items = self.scroll_and_collect(self.__class__.__locators['容器列表'],
+                                        self.__class__.__locators["联系人名"])
+        if not items:
             raise AssertionError("No m005_contacts, please add m005_contacts in address book.")
-        flag = True
-        while flag:
-            self.page_up()
-            els = self.get_elements(self.__class__.__locators["联系人名"])
-            for el in els:
-                if el.text not in contacts_name:
-                    contacts_name.append(el.text)
-                    flag = True
-                else:
-                    flag = False
-        return contacts_name
+        return [item['text'] for item in items]
 
     @TestLogger.log()
     def swipe_select_one_member_by_name(self, name, times=15):
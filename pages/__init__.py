@@ -77,79 +77,84 @@ __all__ = [
     'CreateTeamPage',
 ]
 
-from .ChatFile import ChatFilePage
-from .SingleChatSet import SingleChatSetPage
-from .FindChatRecord import FindChatRecordPage
-from .CreateGroupName import CreateGroupNamePage
-from .GroupChat import GroupChatPage
-from .LabelGrouping import LabelGroupingPage
-from .LabelGroupingChat import LabelGroupingChatPage
-from .LableGroupDetail import LableGroupDetailPage
-from .SelectContacts import SelectContactsPage
-from .SelectLocalContacts import SelectLocalContactsPage
-from .SelectOneGroup import SelectOneGroupPage
-from .SelectHeContacts import SelectHeContactsPage
-from .SelectHeContactsDetail import SelectHeContactsDetailPage
-from .SingleChat import SingleChatPage
-from .chat import ChatAudioPage
-from .chat import ChatGIFPage
-from .chat import ChatLocationPage
-from .chat import ChatMorePage
-from .chat import ChatPhotoPage
-from .chat import ChatPicEditPage
-from .chat import ChatPicPage
-from .chat import ChatPicPreviewPage
-from .chat import ChatProfilePage
-from .chat import ChatSelectFilePage
-from .chat import ChatSelectLocalFilePage
-from .chat import PicVideoPage
-from .contacts import ContactDetailsPage
-from .contacts import ContactListSearchPage
-from .contacts import ContactsPage
-from .contacts import CreateContactPage
-from .contacts import GroupListPage
-from .contacts import GroupListSearchPage
-from .groupset import GroupChatSetFindChatContentPage
-from .groupset import GroupChatSetManagerPage
-from .groupset import GroupChatSetModifyMyCardPage
-from .groupset import GroupChatSetPage
-from .groupset import GroupChatSetSeeMembersPage
-from .groupset import GroupChatSetSeeQRCodePage
-from .groupset import GroupNamePage
-from .guide import GuidePage
-from .guide import PermissionListPage
-from .login import AgreementDetailPage
-from .login import AgreementPage
-from .login import OneKeyLoginPage
-from .login import SmsLoginPage
-from .me import MeCollectionPage
-from .me import MePage
-from .me import MeSetCallPage
-from .me import MeSetContactsManagerPage
-from .me import MeSetDialPage
-from .me import MeSetDialWayPage
-from .me import MeSetFontSizePage
-from .me import MeSetFuHaoPage
-from .me import MeSetImprovePlanPage
-from .me import MeSetMultiLanguagePage
-from .me import MeSetUpPage
-from .me import MessageNoticeSettingPage
-from .me import SettingPage
-from .me import SmsSettingPage
-from .message import ChatWindowPage
-from .message import EmailAssistantPage
-from .message import EmailDetailPage
-from .message import EmailListPage
-from .message import MessagePage
-from .others import BuildGroupChatPage
-from .others import MyQRCodePage
-from .others import Scan1Page
-from .others import ScanPage
-from .others import SelectContactPage
-from .search import GlobalSearchContactPage
-from .search import GlobalSearchGroupPage
-from .search import GlobalSearchMessagePage
-from .search import MessageSearchPage
-from .search import SearchPage
-from .workbench import WorkbenchPage
-from .workbench.create_team import CreateTeamPage
\ No newline at end of file
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'ChatFilePage': '.ChatFile',
+    'SingleChatSetPage': '.SingleChatSet',
+    'FindChatRecordPage': '.FindChatRecord',
+    'CreateGroupNamePage': '.CreateGroupName',
+    'GroupChatPage': '.GroupChat',
+    'LabelGroupingPage': '.LabelGrouping',
+    'LabelGroupingChatPage': '.LabelGroupingChat',
+    'LableGroupDetailPage': '.LableGroupDetail',
+    'SelectContactsPage': '.SelectContacts',
+    'SelectLocalContactsPage': '.SelectLocalContacts',
+    'SelectOneGroupPage': '.SelectOneGroup',
+    'SelectHeContactsPage': '.SelectHeContacts',
+    'SelectHeContactsDetailPage': '.SelectHeContactsDetail',
+    'SingleChatPage': '.SingleChat',
+    'ChatAudioPage': '.chat',
+    'ChatGIFPage': '.chat',
+    'ChatLocationPage': '.chat',
+    'ChatMorePage': '.chat',
+    'ChatPhotoPage': '.chat',
+    'ChatPicEditPage': '.chat',
+    'ChatPicPage': '.chat',
+    'ChatPicPreviewPage': '.chat',
+    'ChatProfilePage': '.chat',
+    'ChatSelectFilePage': '.chat',
+    'ChatSelectLocalFilePage': '.chat',
+    'PicVideoPage': '.chat',
+    'ContactDetailsPage': '.contacts',
+    'ContactListSearchPage': '.contacts',
+    'ContactsPage': '.contacts',
+    'CreateContactPage': '.contacts',
+    'GroupListPage': '.contacts',
+    'GroupListSearchPage': '.contacts',
+    'GroupChatSetFindChatContentPage': '.groupset',
+    'GroupChatSetManagerPage': '.groupset',
+    'GroupChatSetModifyMyCardPage': '.groupset',
+    'GroupChatSetPage': '.groupset',
+    'GroupChatSetSeeMembersPage': '.groupset',
+    'GroupChatSetSeeQRCodePage': '.groupset',
+    'GroupNamePage': '.groupset',
+    'GuidePage': '.guide',
+    'PermissionListPage': '.guide',
+    'AgreementDetailPage': '.login',
+    'AgreementPage': '.login',
+    'OneKeyLoginPage': '.login',
+    'SmsLoginPage': '.login',
+    'MeCollectionPage': '.me',
+    'MePage': '.me',
+    'MeSetCallPage': '.me',
+    'MeSetContactsManagerPage': '.me',
+    'MeSetDialPage': '.me',
+    'MeSetDialWayPage': '.me',
+    'MeSetFontSizePage': '.me',
+    'MeSetFuHaoPage': '.me',
+    'MeSetImprovePlanPage': '.me',
+    'MeSetMultiLanguagePage': '.me',
+    'MeSetUpPage': '.me',
+    'MessageNoticeSettingPage': '.me',
+    'SettingPage': '.me',
+    'SmsSettingPage': '.me',
+    'ChatWindowPage': '.message',
+    'EmailAssistantPage': '.message',
+    'EmailDetailPage': '.message',
+    'EmailListPage': '.message',
+    'MessagePage': '.message',
+    'BuildGroupChatPage': '.others',
+    'MyQRCodePage': '.others',
+    'Scan1Page': '.others',
+    'ScanPage': '.others',
+    'SelectContactPage': '.others',
+    'GlobalSearchContactPage': '.search',
+    'GlobalSearchGroupPage': '.search',
+    'GlobalSearchMessagePage': '.search',
+    'MessageSearchPage': '.search',
+    'SearchPage': '.search',
+    'WorkbenchPage': '.workbench',
+    'CreateTeamPage': '.workbench.create_team',
+})
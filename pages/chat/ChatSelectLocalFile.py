@@ -94,36 +94,6 @@ class ChatSelectLocalFilePage(BasePage):
         """向下滑动"""
         self.swipe_by_percent_on_screen(50, 30, 50, 70, 800)
 
-    def find_file_by_type(self, locator, file_type, times=10):
-        """根据文件类型查找文件"""
-        if self._is_element_present(locator):
-            els = self.get_elements(locator)
-            if els:
-                for el in els:
-                    if el.text.endswith(file_type):
-                        return el
-        c = 0
-        while c < times:
-            self.page_up()
-            if self._is_element_present(locator):
-                els = self.get_elements(locator)
-                if els:
-                    for el in els:
-                        if el.text.endswith(file_type):
-                            return el
-            c += 1
-        c = 0
-        while c < times:
-            self.page_down()
-            if self._is_element_present(locator):
-                els = self.get_elements(locator)
-                if els:
-                    for el in els:
-                        if el.text.endswith(file_type):
-                            return el
-            c += 1
-        return None
-
     @TestLogger.log()
     def get_file_size(self):
         """获取选择的文件大小"""
@@ -13,15 +13,20 @@ __all__ = [
     "PicVideoPage",
 ]
 
-from .ChatAudio import ChatAudioPage
-from .ChatGIF import ChatGIFPage
-from .ChatMore import ChatMorePage
-from .ChatPhoto import ChatPhotoPage
-from .ChatPic import ChatPicPage
-from .ChatPicEdit import ChatPicEditPage
-from .ChatPicPreview import ChatPicPreviewPage
-from .ChatProfile import ChatProfilePage
-from .ChatSelectFile import ChatSelectFilePage
-from .ChatSelectLocalFile import ChatSelectLocalFilePage
-from .ChatLocation import ChatLocationPage
-from .PicVideo import PicVideoPage
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'ChatAudioPage': '.ChatAudio',
+    'ChatGIFPage': '.ChatGIF',
+    'ChatMorePage': '.ChatMore',
+    'ChatPhotoPage': '.ChatPhoto',
+    'ChatPicPage': '.ChatPic',
+    'ChatPicEditPage': '.ChatPicEdit',
+    'ChatPicPreviewPage': '.ChatPicPreview',
+    'ChatProfilePage': '.ChatProfile',
+    'ChatSelectFilePage': '.ChatSelectFile',
+    'ChatSelectLocalFilePage': '.ChatSelectLocalFile',
+    'ChatLocationPage': '.ChatLocation',
+    'PicVideoPage': '.PicVideo',
+})
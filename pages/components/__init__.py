@@ -7,10 +7,16 @@ __all__ = [
     'SearchBar',
     'ContactsSelector',
 ]
-from .BaseChat import BaseChatPage
-from .Footer import FooterPage
-from .dialogs import ChatNoticeDialog
-from .dialogs import DeleteConfirmDialog
-from .menus import LabelSettingMenu
-from .search_bar import SearchBar
-from .selectors import ContactsSelector
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'BaseChatPage': '.BaseChat',
+    'FooterPage': '.Footer',
+    'ChatNoticeDialog': '.dialogs',
+    'DeleteConfirmDialog': '.dialogs',
+    'LabelSettingMenu': '.menus',
+    'SearchBar': '.search_bar',
+    'ContactsSelector': '.selectors',
+})
@@ -145,24 +145,11 @@ class ContactsPage(FooterPage):
     @TestLogger.log()
     def get_all_contacts_name(self):
         """获取所有联系人名"""
-        els = self.get_elements(self.__class__.__locators["联系人名"])
-        contacts_name = []
-        if els:
-            for el in els:
-                contacts_name.append(el.text)
-        else:
+        items = self.scroll_and_collect(self.__class__.__locators['通讯录列表'],
+                                        self.__class__.__locators["联系人名"])
+        if not items:
             raise AssertionError("No m005_contacts, please add m005_contacts in address book.")
-        flag = True
-        while flag:
-            self.swipe_half_page_up()
-            els = self.get_elements(self.__class__.__locators["联系人名"])
-            for el in els:
-                if el.text not in contacts_name:
-                    contacts_name.append(el.text)
-                    flag = True
-                else:
-                    flag = False
-        return contacts_name
+        return [item['text'] for item in items]
 
     @TestLogger.log()
     def click_label_grouping(self):
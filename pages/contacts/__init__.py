@@ -11,12 +11,18 @@ __all__ = [
     'EditContactPage'
     'HeContacts'
 ]
-from .ContactDetails import ContactDetailsPage
-from .ContactListSearch import ContactListSearchPage
-from .Contacts import ContactsPage
-from .CreateContact import CreateContactPage
-from .GroupList import GroupListPage
-from .GroupListSearch import GroupListSearchPage
-from .official_account import OfficialAccountPage
-from .official_account_detail import OfficialAccountDetailPage
-from .search_official_account import SearchOfficialAccountPage
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'ContactDetailsPage': '.ContactDetails',
+    'ContactListSearchPage': '.ContactListSearch',
+    'ContactsPage': '.Contacts',
+    'CreateContactPage': '.CreateContact',
+    'GroupListPage': '.GroupList',
+    'GroupListSearchPage': '.GroupListSearch',
+    'OfficialAccountPage': '.official_account',
+    'OfficialAccountDetailPage': '.official_account_detail',
+    'SearchOfficialAccountPage': '.search_official_account',
+})
@@ -7,10 +7,16 @@ __all__ = [
     'GroupNamePage',
     'GroupChatSetFindChatContentPage',
 ]
-from .GroupChatSet import GroupChatSetPage
-from .GroupChatSetManager import GroupChatSetManagerPage
-from .GroupChatSetModifyMyCard import GroupChatSetModifyMyCardPage
-from .GroupChatSetSeeMembers import GroupChatSetSeeMembersPage
-from .GroupChatSetSeeQRCode import GroupChatSetSeeQRCodePage
-from .GroupName import GroupNamePage
-from .GroupChatSetFindChatContent import GroupChatSetFindChatContentPage
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'GroupChatSetPage': '.GroupChatSet',
+    'GroupChatSetManagerPage': '.GroupChatSetManager',
+    'GroupChatSetModifyMyCardPage': '.GroupChatSetModifyMyCard',
+    'GroupChatSetSeeMembersPage': '.GroupChatSetSeeMembers',
+    'GroupChatSetSeeQRCodePage': '.GroupChatSetSeeQRCode',
+    'GroupNamePage': '.GroupName',
+    'GroupChatSetFindChatContentPage': '.GroupChatSetFindChatContent',
+})
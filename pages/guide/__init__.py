@@ -2,5 +2,11 @@ __all__ = [
     'GuidePage',
     'PermissionListPage',
 ]
-from .Guide import GuidePage
-from .PermissionList import PermissionListPage
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'GuidePage': '.Guide',
+    'PermissionListPage': '.PermissionList',
+})
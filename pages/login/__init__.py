@@ -4,7 +4,13 @@ __all__ = [
     'OneKeyLoginPage',
     'SmsLoginPage',
 ]
-from .Agreement import AgreementPage
-from .AgreementDetail import AgreementDetailPage
-from .OneKeyLogin import OneKeyLoginPage
-from .SmsLogin import SmsLoginPage
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'AgreementPage': '.Agreement',
+    'AgreementDetailPage': '.AgreementDetail',
+    'OneKeyLoginPage': '.OneKeyLogin',
+    'SmsLoginPage': '.SmsLogin',
+})
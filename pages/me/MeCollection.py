@@ -84,24 +84,10 @@ class MeCollectionPage(BasePage):
 
     def get_all_file_names(self):
         """获取所有收藏的文件名"""
-        els = self.get_elements(self.__class__.__locators["文件名"])
-        file_names = []
-        if els:
-            for el in els:
-                file_names.append(el.text)
-        else:
+        items = self.scroll_and_collect(None, self.__class__.__locators["文件名"])
+        if not items:
             return None
-        flag = True
-        while flag:
-            self.page_up()
-            els = self.get_elements(self.__class__.__locators["文件名"])
-            for el in els:
-                if el.text not in file_names:
-                    file_names.append(el.text)
-                    flag = True
-                else:
-                    flag = False
-        return file_names
+        return [item['text'] for item in items]
 
     @TestLogger.log()
     def get_file_types(self):
@@ -118,36 +104,6 @@ class MeCollectionPage(BasePage):
                     file_types.append(type)
         return file_types
 
-    def find_file_by_type(self, locator, file_type, times=10):
-        """根据文件类型查找文件"""
-        if self._is_element_present(locator):
-            els = self.get_elements(locator)
-            if els:
-                for el in els:
-                    if el.text.endswith(file_type):
-                        return el
-        c = 0
-        while c < times:
-            self.page_up()
-            if self._is_element_present(locator):
-                els = self.get_elements(locator)
-                if els:
-                    for el in els:
-                        if el.text.endswith(file_type):
-                            return el
-            c += 1
-        c = 0
-        while c < times:
-            self.page_down()
-            if self._is_element_present(locator):
-                els = self.get_elements(locator)
-                if els:
-                    for el in els:
-                        if el.text.endswith(file_type):
-                            return el
-            c += 1
-        return None
-
     @TestLogger.log()
     def open_file(self, file_type):
         """打开文件"""
@@ -15,17 +15,22 @@ __all__ = [
     'MeCollectionPage',
 ]
 
-from .MeCollection import MeCollectionPage
-from .Me import MePage
-from .MeSetCall import MeSetCallPage
-from .MeSetContactsManager import MeSetContactsManagerPage
-from .MeSetDial import MeSetDialPage
-from .MeSetDialWay import MeSetDialWayPage
-from .MeSetFontSize import MeSetFontSizePage
-from .MeSetFuHao import MeSetFuHaoPage
-from .MeSetImprovePlan import MeSetImprovePlanPage
-from .MeSetMultiLanguage import MeSetMultiLanguagePage
-from .MeSetUp import MeSetUpPage
-from .MessageNoticeSetting import MessageNoticeSettingPage
-from .Setting import SettingPage
-from .SmsSetting import SmsSettingPage
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'MeCollectionPage': '.MeCollection',
+    'MePage': '.Me',
+    'MeSetCallPage': '.MeSetCall',
+    'MeSetContactsManagerPage': '.MeSetContactsManager',
+    'MeSetDialPage': '.MeSetDial',
+    'MeSetDialWayPage': '.MeSetDialWay',
+    'MeSetFontSizePage': '.MeSetFontSize',
+    'MeSetFuHaoPage': '.MeSetFuHao',
+    'MeSetImprovePlanPage': '.MeSetImprovePlan',
+    'MeSetMultiLanguagePage': '.MeSetMultiLanguage',
+    'MeSetUpPage': '.MeSetUp',
+    'MessageNoticeSettingPage': '.MessageNoticeSetting',
+    'SettingPage': '.Setting',
+    'SmsSettingPage': '.SmsSetting',
+})
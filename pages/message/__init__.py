@@ -5,8 +5,14 @@ __all__ = [
     'EmailListPage',
     'MessagePage',
 ]
-from .ChatWindow import ChatWindowPage
-from .EmailAssistant import EmailAssistantPage
-from .EmailDetail import EmailDetailPage
-from .EmailList import EmailListPage
-from .Message import MessagePage
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'ChatWindowPage': '.ChatWindow',
+    'EmailAssistantPage': '.EmailAssistant',
+    'EmailDetailPage': '.EmailDetail',
+    'EmailListPage': '.EmailList',
+    'MessagePage': '.Message',
+})
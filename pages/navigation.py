@@ -0,0 +1,63 @@
+"""
+和飞信页面导航图：
+    from pages.navigation import NAVIGATION
+    message = NAVIGATION.navigate_to(MessagePage)
+"""
+from appium.webdriver.common.mobileby import MobileBy
+
+from library.core.navigation import NavigationGraph
+from pages.contacts.ContactDetails import ContactDetailsPage
+from pages.contacts.Contacts import ContactsPage
+from pages.me.Me import MePage
+from pages.message.Message import MessagePage
+from pages.SingleChat import SingleChatPage
+from pages.workbench.Workbench import WorkbenchPage
+from pages.workbench.create_team.CreateTeam import CreateTeamPage
+
+NAVIGATION = NavigationGraph()
+
+# 页面（marker 只检查当前界面，不等待；is_on_this_page 会等待 8 秒的页面必须指定 marker）
+NAVIGATION.add_page(MessagePage, (MobileBy.ID, 'com.chinasofti.rcs:id/rv_conv_list'))
+NAVIGATION.add_page(ContactsPage, (MobileBy.ID, 'com.chinasofti.rcs:id/contact_list'))
+NAVIGATION.add_page(WorkbenchPage,
+                    lambda page: page.is_on_this_page() or page.is_text_present('欢迎创建团队'))
+NAVIGATION.add_page(MePage, (MobileBy.ID, 'com.chinasofti.rcs:id/check_user_profile'))
+NAVIGATION.add_page(ContactDetailsPage, (MobileBy.ID, 'com.chinasofti.rcs:id/tv_normal_message'))
+NAVIGATION.add_page(SingleChatPage)
+NAVIGATION.add_page(CreateTeamPage, (MobileBy.XPATH, '//*[@content-desc="立即创建团队"]'))
+
+# 底部标签栏：主页的四个标签页之间可以直接切换
+_TABS = [
+    (MessagePage, 'open_message_page'),
+    (ContactsPage, 'open_contacts_page'),
+    (WorkbenchPage, 'open_workbench_page'),
+    (MePage, 'open_me_page'),
+]
+for _source, _ in _TABS:
+    for _target, _action in _TABS:
+        if _source is not _target:
+            NAVIGATION.add_edge(_source, _target, _action)
+
+
+def _open_single_chat(details):
+    details.click_message_icon()
+    # 如果弹框用户须知则点击处理
+    chat = SingleChatPage()
+    if chat.is_exist_dialog():
+        chat.click_i_have_read()
+
+
+def _create_team(workbench):
+    if workbench.is_on_welcome_page():
+        workbench.click_now_create_team()
+    else:
+        workbench.click_create_team()
+
+
+# 联系人详情 <-> 单聊（通讯录 -> 联系人详情取决于选择的联系人，不作为导航的边）
+NAVIGATION.add_edge(ContactDetailsPage, SingleChatPage, _open_single_chat)
+NAVIGATION.add_edge(ContactDetailsPage, ContactsPage, 'click_back_icon')
+NAVIGATION.add_edge(SingleChatPage, ContactDetailsPage, 'click_back')
+# 消息 -> 工作台 -> 创建团队
+NAVIGATION.add_edge(WorkbenchPage, CreateTeamPage, _create_team)
+NAVIGATION.add_edge(CreateTeamPage, WorkbenchPage, 'click_back')
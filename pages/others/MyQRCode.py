@@ -37,15 +37,9 @@ class MyQRCodePage(BasePage):
         )
 
     def decode_qr_code(self):
-        from pyzbar import pyzbar
-        import io
-        from PIL import Image
-
-        screen_shot = self.mobile.get_element(self.__locators['二维码']).screenshot_as_png
-        fp = io.BytesIO(screen_shot)
-        qr = pyzbar.decode(Image.open(fp))
+        qr = self.scan_codes(self.__locators['二维码'])
         if qr:
-            return qr[0].data.decode()
+            return qr[0].data
         raise AssertionError('不是有效的二维码')
 
     @TestLogger.log('返回')
@@ -6,13 +6,18 @@ __all__ = [
     'SelectContactPage',
 ]
 
-# 创建群聊
-from .BuildGroupChat import BuildGroupChatPage
-# 我的二维码
-from .MyQRCode import MyQRCodePage
-# 扫一扫
-from .Scan import ScanPage
-# 扫一扫（网络异常）
-from .Scan1 import Scan1Page
-# 选择联系人
-from .SelectContact import SelectContactPage
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    # 创建群聊
+    'BuildGroupChatPage': '.BuildGroupChat',
+    # 我的二维码
+    'MyQRCodePage': '.MyQRCode',
+    # 扫一扫
+    'ScanPage': '.Scan',
+    # 扫一扫（网络异常）
+    'Scan1Page': '.Scan1',
+    # 选择联系人
+    'SelectContactPage': '.SelectContact',
+})
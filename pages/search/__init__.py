@@ -5,8 +5,14 @@ __all__ = [
     'MessageSearchPage',
     'SearchPage',
 ]
-from .GlobalSearchContact import GlobalSearchContactPage
-from .GlobalSearchGroup import GlobalSearchGroupPage
-from .GlobalSearchMessage import GlobalSearchMessagePage
-from .MessageSearch import MessageSearchPage
-from .Search import SearchPage
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'GlobalSearchContactPage': '.GlobalSearchContact',
+    'GlobalSearchGroupPage': '.GlobalSearchGroup',
+    'GlobalSearchMessagePage': '.GlobalSearchMessage',
+    'MessageSearchPage': '.MessageSearch',
+    'SearchPage': '.Search',
+})
@@ -3,4 +3,9 @@ __all__ = [
 
 ]
 
-from .Workbench import WorkbenchPage
\ No newline at end of file
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'WorkbenchPage': '.Workbench',
+})
@@ -3,4 +3,10 @@
 __all__ = [
     'CreateTeamPage',
 ]
-from .CreateTeam import CreateTeamPage
+
+from library.core.utils.lazyimport import lazy_imports
+
+# 第一次使用时才导入对应的模块
+__getattr__, __dir__ = lazy_imports(__name__, {
+    'CreateTeamPage': '.CreateTeam',
+})
@@ -1,5 +1,10 @@
 import time
-from pages import *
+from pages import (
+    AgreementDetailPage, ContactDetailsPage, ContactsPage, CreateContactPage, CreateTeamPage, GuidePage, MessagePage,
+    OneKeyLoginPage, PermissionListPage, SingleChatPage, WorkbenchPage,
+)
+from pages.navigation import NAVIGATION
+from library.core.utils import ConfigManager
 from library.core.utils.applicationcache import current_mobile, switch_to_mobile
 import random
 from library.core.common.simcardtype import CardType
@@ -26,7 +31,9 @@ class LoginPreconditions(object):
         client = switch_to_mobile(REQUIRED_MOBILES[category])
         client.connect_mobile()
         if reset:
-            current_mobile().reset_app()
+            # 优先恢复已登录状态的应用数据快照，没有快照时重置应用
+            if not (ConfigManager.get_app_state_enabled() and current_mobile().restore_app_state()):
+                current_mobile().reset_app()
         return client
 
     @staticmethod
@@ -81,15 +88,28 @@ class LoginPreconditions(object):
         """确保应用在消息页面"""
         LoginPreconditions.select_mobile('Android-移动', reset)
         current_mobile().hide_keyboard_if_display()
-        time.sleep(1)
-        # 如果在消息页，不做任何操作
-        mess = MessagePage()
-        if mess.is_on_this_page():
+        current_mobile().wait_for_ui_idle(timeout=1)
+        # 如果在消息页，不做任何操作；在其它已登录的页面时点击返回消息页，不需要重新登录
+        # （重置时如果恢复了已登录状态的快照，也会直接在消息页）
+        # 应用可能还在启动（恢复快照后是冷启动），等待出现已知页面；不在已登录的页面时走登录流程，不重新启动应用
+        if NAVIGATION.navigate_to(MessagePage, relaunch=False, timeout=30 if reset else 8):
             return
         # 进入一键登录页
         LoginPreconditions.make_already_in_one_key_login_page()
         #  从一键登录页面登录
         LoginPreconditions.login_by_one_key_login()
+        # 保存已登录状态的快照，之后重置应用时直接恢复
+        LoginPreconditions.save_logged_in_state()
+
+    @staticmethod
+    def save_logged_in_state():
+        """当前应用版本还没有已登录状态的快照时保存快照（保存时会结束应用，保存后重新启动并回到消息页）"""
+        if not ConfigManager.get_app_state_enabled() or current_mobile().has_app_state():
+            return
+        if current_mobile().save_app_state() is None:
+            return
+        current_mobile().activate_app()
+        MessagePage().wait_for_page_load(30)
 
     @staticmethod
     def enter_private_chat_page(reset=False):
@@ -131,17 +151,9 @@ class WorkbenchPreconditions(LoginPreconditions):
         """从消息进入创建团队页面"""
         # 登录进入消息页面
         LoginPreconditions.make_already_in_message_page(reset)
-        mess = MessagePage()
         # 从消息进入创建团队页面
-        mess.open_workbench_page()
-        workbench = WorkbenchPage()
-        if workbench.is_on_welcome_page():
-            workbench.click_now_create_team()
-        else:
-            workbench.wait_for_page_load()
-            workbench.click_create_team()
-        team = CreateTeamPage()
-        team.wait_for_page_load()
+        if NAVIGATION.navigate_to(CreateTeamPage, relaunch=False) is None:
+            raise AssertionError('无法从当前页面进入创建团队页面')
 
     @staticmethod
     def get_team_name():
@@ -3,7 +3,7 @@
 from selenium.common.exceptions import TimeoutException
 
 from library.core.utils.applicationcache import current_mobile, current_driver, switch_to_mobile
-from pages import *
+from pages import AgreementDetailPage, GuidePage, MePage, MessagePage, OneKeyLoginPage, PermissionListPage, SettingPage
 
 
 def connect_mobile(category):
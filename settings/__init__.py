@@ -18,8 +18,53 @@ SCREEN_SHOT_PATH = os.path.join(REPORT_PATH, 'screen-shot', NOW.date().strftime(
 # LOG_FILE_PATH = os.path.join(REPORT_PATH, 'log')
 LOG_FILE_PATH = os.path.join(REPORT_PATH, 'log', NOW.date().strftime('%Y-%m-%d'),
                              NOW.strftime("%Y-%m-%dT%H-%M-%S-%f") + '.log')
+# 方法调用日志输出的嵌套层数：0 不输出，1 只输出最外层调用，2 及以上同时输出嵌套的调用
+LOG_VERBOSITY = 1
+# 保留最近多少条方法调用记录，用例失败或出错时输出该用例的记录（没有输出的嵌套调用只在开启 trace 时记录）
+LOG_RING_SIZE = 200
+# 用例输出缓冲的字符数，达到后才写入日志（0 表示每行写入一次）
+LOG_BUFFER_SIZE = 8 * 1024
+# 日志文件后台写入：队列长度、缓冲达到多少字节或多少秒写入一次文件
+LOG_QUEUE_SIZE = 10000
+LOG_FLUSH_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 1.0
+# 日志文件超过多少字节时轮转（0 表示不轮转），以及保留的轮转文件个数（发送报告邮件时所有分段打包成一个附件）
+LOG_MAX_BYTES = 0
+LOG_BACKUP_COUNT = 5
+# 是否记录 trace（用例、预置条件、页面方法、WebDriver 命令、等待、sleep 的耗时区间），命令行参数 --trace 同样可以开启
+TRACE_ENABLED = False
+# trace 最多保留的区间个数，超出后丢弃最早的区间
+TRACE_MAX_EVENTS = 200000
+# trace 文件（Chrome trace-event 格式，可以用 chrome://tracing 或 https://ui.perfetto.dev 打开）
+TRACE_PATH = os.path.join(REPORT_PATH, 'trace.json')
+# 等待轮询策略：fixed（固定0.5秒）、backoff（快速开始后指数退避）、learned（按历史耗时轮询）
+WAIT_POLLING_STRATEGY = 'backoff'
+# 等待耗时记录（learned 策略会读取上一次运行的记录）
+WAIT_TELEMETRY_PATH = os.path.join(REPORT_PATH, 'wait_telemetry.json')
+# 用例加载方式：ast（解析用例文件，只导入包含被选中用例的模块）、import（unittest discover，导入全部用例模块）
+TEST_DISCOVERY = 'ast'
+# ast 方式的用例索引缓存
+TEST_INDEX_CACHE_PATH = os.path.join(REPORT_PATH, 'test_index.json')
+# 用例执行顺序：name（unittest 默认，按名称）、precondition（起始状态相同的用例排在一起）
+TEST_ORDER = 'name'
+# 每次进入用例起始状态（重置应用、登录、进入页面）的预计耗时（秒），用于估算排序节省的时间
+PRECONDITION_NAVIGATION_COST = 15
+# 用例历史耗时（并行执行时按耗时分配用例）
+TIMING_STORE_PATH = os.path.join(REPORT_PATH, 'timings.sqlite3')
+# 依赖文件
+REQUIREMENTS_FILE_PATH = os.path.join(PROJECT_PATH, 'requirements.txt')
+# 依赖检查记录（requirements 文件与已安装版本没有变化时不再执行 pip install）
+REQUIREMENTS_STAMP_PATH = os.path.join(REPORT_PATH, 'requirements.stamp.json')
+# 依赖不满足时是否自动执行 pip install（也可以用命令行参数 --skipInstallRequirements 关闭）
+INSTALL_REQUIREMENTS = True
+# 重置应用时是否优先恢复已登录状态的应用数据快照（需要 debuggable 安装包或者 root 权限）
+APP_STATE_ENABLED = True
+# 应用数据快照存放目录
+APP_STATE_PATH = os.path.join(REPORT_PATH, 'app_state')
 # 预置文件存放目录
 RESOURCE_FILE_PATH = os.path.join(PROJECT_PATH, 'resource')
+# 本地预置文件清单缓存（大小、修改时间不变的文件不再重新计算 md5）
+RESOURCE_MANIFEST_PATH = os.path.join(REPORT_PATH, 'resource_manifest.json')
 
 STATIC_FILE_PATH = os.path.join(PROJECT_PATH, 'Resources')
 EMAIL_REPORT_HTML_TPL = os.path.join(STATIC_FILE_PATH, 'email_report_tpl', 'ci_report.html')
@@ -11,6 +11,12 @@ TARGET_APP = dict(
     INSTALL_BEFORE_RUN=False
 )
 
+# 手机配置可选项：
+#   KEEP_ALIVE: 是否复用与 appium server 的 HTTP 连接（默认 True，同一 hub 上的手机共享连接池）
+#   POOL_SIZE: 每个 hub 保持的最大连接数（默认 4）
+#   MAX_RETRIES: 连接失败、幂等命令读取失败时的重试次数（默认 2）
+#   PERMISSION_CHECK_INTERVAL: 等待期间检查系统权限弹窗的最小间隔秒数（默认 2）
+
 # ======================= 移动CI环境手机配置 =======================
 AVAILABLE_DEVICES = {
     'M960BDQN229CH': {
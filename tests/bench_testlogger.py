@@ -0,0 +1,67 @@
+"""
+TestLogger.log 装饰器耗时的微基准（不需要连接手机）
+
+    python -m tests.bench_testlogger [次数]
+
+输出每次调用的平均耗时（微秒）：未装饰的方法、最外层（输出日志的）调用、不输出的嵌套调用（关闭、开启 trace）
+"""
+import contextlib
+import io
+import sys
+import timeit
+
+from library.core.TestLogger import TestLogger, _call_state
+from library.core.utils.tracing import TRACER
+
+
+class _StubApplicationCache(object):
+    """没有连接手机的 applicationcache"""
+
+    @staticmethod
+    def current_mobile():
+        return None
+
+
+class _Page(object):
+
+    def plain(self, value):
+        return value
+
+    @TestLogger.log('嵌套调用')
+    def nested(self, value):
+        return value
+
+    @TestLogger.log('最外层调用')
+    def outermost(self, value):
+        return value
+
+
+def _per_call(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1000000
+
+
+def main(number=100000):
+    TestLogger._applicationcache = _StubApplicationCache
+    TestLogger.set_verbosity(1)
+    page = _Page()
+    trace_enabled = TRACER.enabled
+    results = []
+    try:
+        results.append(('未装饰的方法', _per_call(lambda: page.plain(1), number)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append(('最外层调用（输出日志）', _per_call(lambda: page.outermost(1), number // 10)))
+        _call_state.depth = 1
+        TRACER.enabled = False
+        results.append(('嵌套调用（不输出，关闭 trace）', _per_call(lambda: page.nested(1), number)))
+        TRACER.enabled = True
+        results.append(('嵌套调用（不输出，开启 trace）', _per_call(lambda: page.nested(1), number)))
+    finally:
+        _call_state.depth = 0
+        TRACER.enabled = trace_enabled
+        TRACER.clear()
+    for name, micros in results:
+        print('{:<30}{:>10.2f}us'.format(name, micros))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
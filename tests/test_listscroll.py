@@ -0,0 +1,44 @@
+import unittest
+
+from library.core.mobile.listscroll import ListItemTracker, measure_scroll
+
+THUMBNAIL = ('com.chinasofti.rcs:id/rl_img', ())
+
+
+def grid(tops, columns=3, size=300):
+    """没有文本的图片缩略图网格（PictureSelector 相册）"""
+    return [(THUMBNAIL, (column * size, top, column * size + size, top + size))
+            for top in tops for column in range(columns)]
+
+
+class ListItemTrackerTest(unittest.TestCase):
+
+    def test_grid_thumbnails_in_same_row(self):
+        tracker = ListItemTracker(bottom=1500, swipe_distance=900)
+        first = grid([0, 300, 600, 900, 1200])
+        self.assertEqual(tracker.new_items(first), list(range(15)))
+        # 实际滑动了 880 像素：前两行已经返回过，后三行是新的
+        second = grid([20, 320, 620, 920, 1220])
+        self.assertEqual(tracker.new_items(second), list(range(6, 15)))
+        self.assertFalse(tracker.at_end)
+        self.assertEqual(tracker.new_items(second), [])
+        self.assertTrue(tracker.at_end)
+
+    def test_truncated_item_returned_after_scroll(self):
+        tracker = ListItemTracker(bottom=1000, swipe_distance=600)
+        first = [(('id', ('a',)), (0, 0, 100, 400)), (('id', ('b',)), (0, 400, 100, 800)),
+                 (('id', ('c',)), (0, 850, 100, 1000))]
+        self.assertEqual(tracker.new_items(first), [0, 1])
+        second = [(('id', ('b',)), (0, -200, 100, 200)), (('id', ('c',)), (0, 250, 100, 650)),
+                  (('id', ('d',)), (0, 650, 100, 1000))]
+        self.assertEqual(tracker.new_items(second), [1, 2])
+
+    def test_measure_scroll(self):
+        self.assertEqual(measure_scroll(grid([0, 300, 600, 900, 1200]), grid([120, 420, 720, 1020, 1320]), 900), 780)
+        unique = [(('id', ('a',)), (0, 100, 1, 200)), (('id', ('b',)), (0, 200, 1, 300))]
+        self.assertEqual(measure_scroll(unique, [(('id', ('b',)), (0, 50, 1, 150))], 900), 150)
+        self.assertEqual(measure_scroll(unique, [(('id', ('z',)), (0, 0, 1, 1))], 900), 900)
+
+
+if __name__ == '__main__':
+    unittest.main()
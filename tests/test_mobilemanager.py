@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+
+from library.core.common.simcardtype import CardType
+
+try:
+    from library.core.utils import mobilemanager
+    from library.core.utils.mobilemanager import DeviceMismatchError, MobileManager, MultiDeviceError
+except ImportError as e:
+    # library.core.utils.normalizing 使用 collections.MutableMapping（Python 3.10 开始不存在）
+    raise unittest.SkipTest(e)
+
+DEVICES = {
+    'single_mobile': {'CARDS': [{'TYPE': CardType.CHINA_MOBILE}]},
+    'M960BDQN229CH': {'CARDS': [{'TYPE': CardType.CHINA_MOBILE}]},
+    'single_telecom': {'CARDS': [{'TYPE': CardType.CHINA_TELECOM}]},
+}
+
+
+class BoundMobileManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(mobilemanager, 'get_devices_setting', return_value=DEVICES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # 不连接手机：只注册绑定的手机
+        self.manager = MobileManager.__new__(MobileManager)
+        super(MobileManager, self.manager).__init__()
+        self.manager.bound_device = 'single_mobile'
+        self.manager.register('mobile', 'single_mobile')
+        self.manager.begin_unit()
+
+    def test_same_card_types_substituted(self):
+        self.assertEqual(self.manager.switch('M960BDQN229CH'), 'mobile')
+        self.assertEqual(self.manager.switch('M960BDQN229CH'), 'mobile')
+        self.assertIsNone(self.manager.requested_device)
+
+    def test_different_card_types_flagged(self):
+        with self.assertRaises(DeviceMismatchError):
+            self.manager.switch('single_telecom')
+        self.assertEqual(self.manager.requested_device, 'single_telecom')
+        self.manager.begin_unit()
+        self.assertIsNone(self.manager.requested_device)
+
+    def test_second_device_flagged(self):
+        self.manager.switch('M960BDQN229CH')
+        with self.assertRaises(MultiDeviceError):
+            self.manager.switch('single_mobile')
+        self.assertTrue(self.manager.multi_device_requested)
+
+    def test_unknown_alias_not_substituted(self):
+        with self.assertRaises(RuntimeError):
+            self.manager.switch('')
+        self.assertIsNone(self.manager.requested_device)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from library.core.mobile.resourcesync import ResourceSync, _is_same
+from library.core.mobile.shellbatch import normalize_shell_commands, parse_shell_batch_output
+
+MARKER = '__SHELL_BATCH_test__'
+MD5 = 'd41d8cd98f00b204e9800998ecf8427e'
+
+
+class FakeMobile(object):
+    """模拟一次 mobile:shell 请求：按命令返回输出，拼接 marker 后像 appium 一样 trim"""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+
+    def execute_shell_batch(self, commands):
+        lines = normalize_shell_commands(commands)
+        output = ''
+        for index, line in enumerate(lines):
+            stdout = next(v for k, v in self.outputs.items() if line.endswith(k))
+            output += stdout + '\n{}:{}:0\n'.format(MARKER, index)
+        return parse_shell_batch_output(output.strip(), lines, MARKER)
+
+
+class RemoteManifestTest(unittest.TestCase):
+
+    def test_sizes_from_last_command(self):
+        mobile = FakeMobile({
+            'md5sum {} +': '{}  ./res/a.png\n{}  ./res/b.png\n'.format(MD5, MD5),
+            '"%s %n" {} +': '0 ./res/a.png\n12 ./res/b.png\n',
+        })
+        manifest = ResourceSync(mobile).get_remote_manifest('/sdcard', 'res')
+        self.assertEqual(manifest, {'res/a.png': (0, MD5), 'res/b.png': (12, MD5)})
+        self.assertTrue(_is_same(manifest['res/a.png'], 0, MD5))
+        self.assertFalse(_is_same(manifest['res/b.png'], 0, MD5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from library.core.mobile.shellbatch import ShellResult, build_shell_batch_script, parse_shell_batch_output
+
+MARKER = '__SHELL_BATCH_test__'
+
+
+def fake_shell(outputs):
+    """模拟 appium 的 mobile:shell：拼接每条命令的输出与 marker 后 trim"""
+    output = ''
+    for index, (stdout, code) in enumerate(outputs):
+        output += stdout + '\n{}:{}:{}\n'.format(MARKER, index, code)
+    return output.strip()
+
+
+class ShellBatchParserTest(unittest.TestCase):
+
+    def test_last_command_result_survives_trim(self):
+        lines = ['getprop ro.product.name', 'ifconfig']
+        output = fake_shell([('MI6\n', 0), ('wlan0 inet addr:10.0.0.2\n', 0)])
+        self.assertEqual(parse_shell_batch_output(output, lines, MARKER), [
+            ShellResult('getprop ro.product.name', 'MI6\n', 0),
+            ShellResult('ifconfig', 'wlan0 inet addr:10.0.0.2\n', 0),
+        ])
+
+    def test_first_command_without_output(self):
+        lines = ['settings put global airplane_mode_on 1', 'am broadcast -a android.intent.action.AIRPLANE_MODE',
+                 'su -c id']
+        output = fake_shell([('', 0), ('Broadcast completed: result=0\n', 0), ('', 1)])
+        self.assertEqual(parse_shell_batch_output(output, lines, MARKER), [
+            ShellResult(lines[0], '', 0),
+            ShellResult(lines[1], 'Broadcast completed: result=0\n', 0),
+            ShellResult(lines[2], '', 1),
+        ])
+
+    def test_windows_line_endings(self):
+        output = fake_shell([('a', 0), ('b', 2)]).replace('\n', '\r\n')
+        results = parse_shell_batch_output(output, ['x', 'y'], MARKER)
+        self.assertEqual([r.exit_code for r in results], [0, 2])
+
+    def test_unfinished_commands(self):
+        output = 'partial output'
+        self.assertEqual(parse_shell_batch_output(output, ['x', 'y'], MARKER),
+                         [ShellResult('x', None, None), ShellResult('y', None, None)])
+        self.assertEqual(parse_shell_batch_output(None, ['x'], MARKER), [ShellResult('x', None, None)])
+
+    def test_script_prints_marker_after_each_command(self):
+        script = build_shell_batch_script(['id', 'ls'], MARKER)
+        self.assertEqual(script, "id ; printf '\\n%s:%s:%s\\n' {0} 0 $? ; "
+                                 "ls ; printf '\\n%s:%s:%s\\n' {0} 1 $?".format(MARKER))
+
+
+if __name__ == '__main__':
+    unittest.main()